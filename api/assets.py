@@ -0,0 +1,183 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+
+from starlette.responses import Response
+
+from api.cache import etag_matches
+
+try:
+    import brotli
+except ImportError: # Optional: gzip variants are always built, brotli only when installed
+    brotli = None
+
+ALLOWED_EXTENSIONS = {'.html', '.css', '.js', '.json', '.png', '.jpg', '.jpeg', '.svg', '.ico', '.map'}
+# Already-compressed formats gain nothing from gzip/brotli
+COMPRESSIBLE_EXTENSIONS = {'.html', '.css', '.js', '.json', '.svg', '.map'}
+
+IMMUTABLE_POLICY = "public, max-age=31536000, immutable"
+REVALIDATE_POLICY = "no-cache"
+
+# src="main.js" / href="style.css": same-directory references to rewrite to hashed names
+_REFERENCE = re.compile(r'(\b(?:src|href)=")([^"/:?#]+)(")')
+
+
+class Asset:
+    """
+    One servable file: its identity body plus precompressed variants and response headers.
+
+    Each representation has its own strong ETag (the identity tag with an -gzip/-br
+    suffix for variants), since their bytes differ.
+    """
+    __slots__ = ("body", "variants", "etags", "media_type", "cache_control")
+
+    def __init__(self, body, media_type, cache_control, compress):
+        self.body = body
+        self.media_type = media_type
+        self.cache_control = cache_control
+        # Only keep variants that are actually smaller
+        self.variants = {}
+        if compress:
+            if brotli is not None:
+                encoded = brotli.compress(body, quality=11)
+                if len(encoded) < len(body):
+                    self.variants["br"] = encoded
+            encoded = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(encoded) < len(body):
+                self.variants["gzip"] = encoded
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.etags = {None: '"%s"' % digest}
+        for encoding in self.variants:
+            self.etags[encoding] = '"%s-%s"' % (digest, encoding)
+
+
+def content_hash(body):
+    return hashlib.sha256(body).hexdigest()[:10]
+
+
+def hashed_name(filename, body):
+    """main.js -> main.<content hash>.js"""
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}.{content_hash(body)}{ext}"
+
+
+class AssetIndex:
+    """
+    In-memory index of the files in a static directory, built once at startup.
+
+    Every file is served under its own name (revalidated with its ETag) and under a
+    content-hashed name (main.<hash>.js) that is cached for a year as immutable. HTML pages
+    are rewritten to reference the hashed names, so a deploy that changes a script or
+    stylesheet changes the URL the browser loads. HTML itself is never cached.
+
+    Only regular files directly inside the directory with an allowed extension are
+    indexed; symlinks must resolve inside the directory, as in read_file.
+    """
+    def __init__(self, assets=None, hashed=None):
+        self.assets = assets or {} # URL path -> Asset
+        self.hashed = hashed or {} # filename -> hashed filename
+
+    @classmethod
+    def from_directory(cls, directory):
+        base_dir = os.path.realpath(directory)
+        if not os.path.isdir(base_dir):
+            return cls()
+
+        files = {}
+        for filename in sorted(os.listdir(base_dir)):
+            path = os.path.realpath(os.path.join(base_dir, filename))
+            if os.path.commonpath([base_dir, path]) != base_dir or not os.path.isfile(path):
+                continue
+            if os.path.splitext(filename)[1].lower() not in ALLOWED_EXTENSIONS:
+                continue
+            with open(path, "rb") as f:
+                files[filename] = f.read()
+
+        hashed = {
+            filename: hashed_name(filename, body)
+            for filename, body in files.items() if not filename.endswith(".html")
+        }
+
+        def rewrite(match):
+            return match.group(1) + hashed.get(match.group(2), match.group(2)) + match.group(3)
+
+        assets = {}
+        for filename, body in files.items():
+            ext = os.path.splitext(filename)[1].lower()
+            media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            if media_type.startswith("text/") or media_type in ("application/javascript", "application/json"):
+                media_type += "; charset=utf-8"
+            compress = ext in COMPRESSIBLE_EXTENSIONS
+
+            if ext == ".html":
+                body = _REFERENCE.sub(rewrite, body.decode("utf-8")).encode("utf-8")
+                # No Cache-Control: the default no-store policy applies to pages
+                assets["/" + filename] = Asset(body, media_type, None, compress)
+                continue
+
+            assets["/" + filename] = Asset(body, media_type, REVALIDATE_POLICY, compress)
+            assets["/" + hashed[filename]] = Asset(body, media_type, IMMUTABLE_POLICY, compress)
+
+        if "/index.html" in assets:
+            assets["/"] = assets["/index.html"]
+        return cls(assets, hashed)
+
+    def get(self, path):
+        return self.assets.get(path)
+
+
+def choose_encoding(accept_encoding, variants):
+    """
+    Picks the smallest precompressed variant the client accepts, or None for identity.
+    """
+    if not accept_encoding or not variants:
+        return None
+    accepted = set()
+    wildcard = False
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q <= 0:
+            continue
+        if coding == "*":
+            wildcard = True
+        else:
+            accepted.add(coding)
+    candidates = [name for name in variants if name in accepted or wildcard]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda name: len(variants[name]))
+
+
+def asset_response(asset, headers):
+    """
+    Response for a GET or HEAD of `asset`: 304 when the client already holds the
+    representation it would receive, otherwise the smallest variant it accepts.
+
+    Args:
+        asset (Asset): The indexed file.
+        headers: Request headers (a Starlette Headers mapping).
+    """
+    encoding = choose_encoding(headers.get("accept-encoding", ""), asset.variants)
+    etag = asset.etags[encoding]
+    response_headers = {"etag": etag, "vary": "Accept-Encoding"}
+    if asset.cache_control is not None:
+        response_headers["cache-control"] = asset.cache_control
+
+    if etag_matches(headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=response_headers)
+
+    if encoding:
+        response_headers["content-encoding"] = encoding
+        return Response(asset.variants[encoding], headers=response_headers, media_type=asset.media_type)
+    return Response(asset.body, headers=response_headers, media_type=asset.media_type)
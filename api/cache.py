@@ -0,0 +1,129 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from api.singleflight import inflight
+
+# Pure endpoints may be stored by the browser but must be revalidated with If-None-Match
+CACHEABLE_POLICY = "private, no-cache"
+
+
+def request_key(route: str, model: BaseModel) -> str:
+    """Canonical hash of a validated request model (fields in declaration order, coerced values)."""
+    digest = hashlib.sha256(route.encode())
+    digest.update(b"\0")
+    digest.update(model.model_dump_json().encode())
+    return digest.hexdigest()
+
+
+def render_json(content) -> bytes:
+    """Serializes like starlette's JSONResponse so cached bodies are byte-identical."""
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison: ignore W/ prefixes
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag[2:] == etag if tag.startswith("W/") else tag == etag for tag in candidates)
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of rendered JSON bodies, bounded by entry count and total bytes.
+    """
+    def __init__(self, max_entries=1024, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict() # key -> (etag, body)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, body: bytes):
+        etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+        entry = (etag, body)
+        # Single results that would evict a large part of the cache are served but not stored
+        if len(body) > self.max_bytes // 8:
+            return entry
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[1])
+            self._entries[key] = entry
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+result_cache = ResultCache()
+
+
+def cached_response(request: Request, route: str, model: BaseModel, compute,
+                    render=render_json, media_type="application/json", headers=None) -> Response:
+    """
+    Serves a pure computation from the result cache, with strong ETags and 304 handling.
+    Cache misses are coalesced so concurrent identical requests compute once.
+
+    Args:
+        request: Incoming request (for If-None-Match).
+        route: Route name, part of the cache key.
+        model: Validated request model.
+        compute: Zero-argument callable returning the content to render.
+        render: Serializer from content to bytes (JSON by default).
+        media_type: Content type of the rendered body; each type is cached separately.
+        headers (dict): Extra response headers.
+    """
+    if media_type != "application/json":
+        route = f"{route}:{media_type}"
+    key = request_key(route, model)
+    entry = result_cache.get(key)
+    if entry is None:
+        # Identical requests arriving while this one computes wait for its result
+        entry = inflight.do(key, lambda: result_cache.put(key, render(compute())))
+    etag, body = entry
+
+    headers = {**(headers or {}), "ETag": etag, "Cache-Control": CACHEABLE_POLICY}
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
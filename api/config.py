@@ -0,0 +1,16 @@
+import importlib
+import os
+
+
+def env_int(name, default):
+    """Integer setting from the environment; unset or malformed values fall back to `default`."""
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def warm(module):
+    """No-op task used to start worker processes (and import `module` and numpy) ahead of real work."""
+    importlib.import_module(module)
+    return True
@@ -0,0 +1,172 @@
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from api.config import env_int, warm
+from lamina import metrics
+
+
+def _measured(fn, *args):
+    """Worker-side wrapper returning fn's result with the lamina counters it incremented."""
+    from lamina import metrics
+    before = metrics.snapshot()
+    result = fn(*args)
+    after = metrics.snapshot()
+    return result, {name: count - before.get(name, 0) for name, count in after.items()}
+
+
+class Overloaded(Exception):
+    """Raised when the compute pool already holds its maximum number of requests."""
+    def __init__(self, retry_after):
+        super().__init__("Server is busy")
+        self.retry_after = retry_after
+
+
+class Reservation:
+    """An admitted computation running in this process; release() frees its slot (once)."""
+    def __init__(self, executor=None):
+        self._executor = executor
+
+    def release(self):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            with executor._lock:
+                executor._pending -= 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
+
+
+class ComputeExecutor:
+    """
+    Runs expensive request computations on a bounded, lazily started process pool.
+
+    Route handlers run in Starlette's threadpool, where NumPy-heavy requests contend for
+    the GIL. Requests whose estimated cost (plies x evaluation points) reaches `threshold`
+    are sent to worker processes instead; cheaper ones run inline so they never wait behind
+    large ones. At most `max_pending` offloaded requests are admitted (running or queued);
+    beyond that run() raises Overloaded at once rather than queueing.
+    """
+    def __init__(self, max_workers=2, max_pending=16, threshold=20000, retry_after=5):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.threshold = threshold
+        self.retry_after = retry_after
+        self._executor = None
+        self._atexit_registered = False
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.inline = 0
+        self.offloaded = 0
+        self.streamed = 0
+        self.rejected = 0
+
+    def _ensure_started(self):
+        if self._executor is None:
+            # spawn avoids forking a multi-threaded server process
+            ctx = multiprocessing.get_context("spawn")
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=ctx)
+            for _ in range(self.max_workers):
+                self._executor.submit(warm, "api.index")
+            # The pool is recreated after a BrokenProcessPool; one exit handler covers every pool
+            if not self._atexit_registered:
+                atexit.register(self.shutdown)
+                self._atexit_registered = True
+
+    def start(self):
+        """Starts and warms the pool ahead of the first heavy request."""
+        if self.max_workers > 0:
+            with self._lock:
+                self._ensure_started()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def run(self, cost, fn, *args):
+        """
+        Args:
+            cost (int): Estimated cost of the call (see laminate_cost in api/index.py).
+            fn: Picklable module-level function.
+            *args: Picklable arguments.
+
+        Returns:
+            The result of fn(*args).
+
+        Raises:
+            Overloaded: If the pool is saturated.
+        """
+        if self.max_workers <= 0 or cost < self.threshold:
+            with self._lock:
+                self.inline += 1
+            return fn(*args)
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise Overloaded(self.retry_after)
+            self._pending += 1
+            self.offloaded += 1
+            self._ensure_started()
+            executor = self._executor
+
+        try:
+            result, counts = executor.submit(_measured, fn, *args).result()
+            metrics.merge(counts)
+            return result
+        except BrokenProcessPool:
+            # A crashed worker poisons the pool: drop it so the next request starts a fresh one
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def reserve(self, cost):
+        """
+        Admits a computation that must run in this process (e.g. a streamed response)
+        under the same limit as run(): it holds a pending slot until released.
+
+        Returns:
+            Reservation: Release it (or use it as a context manager) when the work ends.
+
+        Raises:
+            Overloaded: If the pool is saturated.
+        """
+        with self._lock:
+            if self.max_workers <= 0 or cost < self.threshold:
+                self.inline += 1
+                return Reservation()
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise Overloaded(self.retry_after)
+            self._pending += 1
+            self.streamed += 1
+            return Reservation(self)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending": self._pending,
+                "inline": self.inline,
+                "offloaded": self.offloaded,
+                "streamed": self.streamed,
+                "rejected": self.rejected,
+            }
+
+
+executor = ComputeExecutor(
+    max_workers=env_int("LAMINA_COMPUTE_WORKERS", 2),
+    max_pending=env_int("LAMINA_COMPUTE_QUEUE", 16),
+    threshold=env_int("LAMINA_OFFLOAD_COST", 20000),
+)
@@ -0,0 +1,132 @@
+import io
+
+import numpy as np
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from api.cache import cached_response
+
+try:
+    import msgpack
+except ImportError: # Optional: MessagePack is only offered when installed
+    msgpack = None
+
+JSON = "application/json"
+NPY = "application/x-npy"
+RAW = "application/octet-stream"
+MSGPACK = "application/msgpack"
+NDJSON = "application/x-ndjson"
+SVG = "image/svg+xml"
+
+# Aliases clients commonly send for the same formats
+_ALIASES = {"application/x-msgpack": MSGPACK, "application/vnd.msgpack": MSGPACK, "application/jsonl": NDJSON}
+
+# Representations of column-oriented results, in server preference order
+COLUMNAR_TYPES = [JSON, NPY, RAW] + ([MSGPACK] if msgpack is not None else [])
+# Results that can also be drawn are offered as SVG plots
+PLOTTABLE_TYPES = COLUMNAR_TYPES + [SVG]
+
+
+def negotiate(accept: str, offered):
+    """
+    Picks the offered media type the client prefers according to its Accept header.
+
+    Exact matches take precedence over type/* and */* ranges; ties in quality go to the
+    earlier offered type. A missing or empty header accepts the first offered type.
+
+    Returns:
+        str: The chosen media type, or None if nothing offered is acceptable.
+    """
+    if not accept or not accept.strip():
+        return offered[0]
+
+    ranges = []
+    for part in accept.split(","):
+        fields = part.split(";")
+        media = fields[0].strip().lower()
+        if not media:
+            continue
+        q = 1.0
+        for param in fields[1:]:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        ranges.append((_ALIASES.get(media, media), q))
+
+    best, best_q = None, 0.0
+    for media_type in offered:
+        major = media_type.split("/")[0] + "/*"
+        # Most specific matching range decides the quality of this type
+        match = None
+        for specificity, pattern in enumerate(("*/*", major, media_type)):
+            for media, q in ranges:
+                if media == pattern:
+                    match = (specificity, q)
+        if match is not None and match[1] > best_q:
+            best, best_q = media_type, match[1]
+    return best
+
+
+def encode_columns(columns, media_type: str) -> bytes:
+    """
+    Encodes equal-length numeric columns without converting elements to Python floats.
+
+    - application/x-npy: one (n_columns, n_rows) little-endian float64 .npy array.
+    - application/octet-stream: the same array as raw bytes, columns one after another.
+    - application/msgpack: {"dtype": "<f8", "length": n_rows, "columns": {name: bytes}}.
+    """
+    arrays = [np.ascontiguousarray(col, dtype="<f8") for col in columns.values()]
+    if media_type == MSGPACK:
+        return msgpack.packb({
+            "dtype": "<f8",
+            "length": len(arrays[0]) if arrays else 0,
+            "columns": {name: arr.tobytes() for name, arr in zip(columns, arrays)},
+        })
+
+    stacked = np.stack(arrays) if arrays else np.empty((0, 0), dtype="<f8")
+    if media_type == NPY:
+        buf = io.BytesIO()
+        np.lib.format.write_array(buf, stacked, allow_pickle=False)
+        return buf.getvalue()
+    return stacked.tobytes()
+
+
+def columnar_response(request: Request, route: str, model: BaseModel, compute, names) -> Response:
+    """
+    Serves a result with .data (JSON), .columns() (binary) or .svg() (image/svg+xml)
+    in the negotiated format.
+
+    Every representation is cached separately under its own ETag.
+
+    Args:
+        request: Incoming request (Accept, If-None-Match).
+        route: Route name, part of the cache key.
+        model: Validated request model.
+        compute: Zero-argument callable returning a PolarResult or Envelope.
+        names (list): Column names, sent in X-Lamina-Columns with binary formats.
+    """
+    media_type = negotiate(request.headers.get("accept", ""), PLOTTABLE_TYPES)
+    if media_type is None:
+        return JSONResponse(status_code=406, content={"detail": "Not Acceptable"})
+
+    headers = {"Vary": "Accept"}
+    if media_type == JSON:
+        return cached_response(request, route, model, lambda: compute().data, headers=headers)
+    if media_type == SVG:
+        return cached_response(
+            request, route, model, lambda: compute().svg(),
+            render=lambda svg: svg.encode("utf-8"), media_type=SVG, headers=headers,
+        )
+
+    headers["X-Lamina-Columns"] = ",".join(names)
+    headers["X-Lamina-Dtype"] = "<f8"
+    return cached_response(
+        request, route, model, lambda: compute().columns(),
+        render=lambda columns: encode_columns(columns, media_type),
+        media_type=media_type,
+        headers=headers,
+    )
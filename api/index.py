@@ -1,30 +1,68 @@
-from fastapi import FastAPI, HTTPException, Path
-from fastapi.responses import FileResponse
-from pydantic import BaseModel, field_validator, model_validator, ValidationError
+from fastapi import FastAPI, HTTPException, Path, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, TypeAdapter, ValidationInfo, field_validator, model_validator, ValidationError
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Literal, Union, Annotated
 import os
 import math
+import json
+import secrets
+import asyncio
+from contextlib import asynccontextmanager
 
 from lamina.materials import Material
 from lamina.clt import Laminate
 from lamina.failure import FailureCriterion
+from lamina.buckling import BucklingAnalysis
+from lamina.batch import LaminateBatch
+from lamina.constraints import ManufacturingRules
+from api.config import env_int
 from api.middleware import SecurityHeadersMiddleware, RateLimitMiddleware, PayloadSizeLimitMiddleware
+from api.ratelimit import backend_from_env
+from api.jobs import jobs
+from api.executor import executor, Overloaded
+from api.cache import cached_response, request_key, render_json
+from api.singleflight import inflight
+from api.formats import columnar_response, negotiate, JSON, NDJSON
+from api.sessions import DesignSession, sessions
+from api.assets import AssetIndex, ALLOWED_EXTENSIONS, asset_response
+from api.metrics import MetricsMiddleware, metrics_allowed, render_metrics, CONTENT_TYPE as METRICS_CONTENT_TYPE
+
+@asynccontextmanager
+async def lifespan(app):
+    # Spawning workers takes seconds, so the compute pool is started with the server
+    executor.start()
+    await run_in_threadpool(static_assets)
+    yield
+    executor.shutdown()
 
 # Disable API documentation endpoints to prevent information disclosure
-app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
+app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None, lifespan=lifespan)
 # Add global 1MB payload size limit middleware
 app.add_middleware(PayloadSizeLimitMiddleware, limit=1048576)
-app.add_middleware(RateLimitMiddleware, limit=100, window=60)
+# Batch requests cost up to MAX_BATCH_ITEMS analyses, so they get a tighter bucket of their own.
+# Set LAMINA_RATE_LIMIT_DB to share buckets between worker processes, and
+# LAMINA_RATE_LIMIT_EXEMPT_TOKEN to let load tests (benchmarks/loadtest.py) bypass the limiter.
+app.add_middleware(
+    RateLimitMiddleware,
+    limit=100,
+    window=60,
+    routes={"/api/batch": (30, 60)},
+    backend=backend_from_env(),
+    exempt_token=os.environ.get("LAMINA_RATE_LIMIT_EXEMPT_TOKEN"),
+)
 app.add_middleware(SecurityHeadersMiddleware)
-
-@app.exception_handler(RequestValidationError)
-async def validation_exception_handler(request, exc):
-    # Prevent reflecting unsanitized user input in the error response
-    # by excluding the 'input' and 'url' fields (Information Disclosure/Reflected DoS)
-    errors = exc.errors()
-
+# Outermost so it times the whole stack and sees 413/429 rejections
+app.add_middleware(MetricsMiddleware)
+
+def sanitize_errors(errors):
+    """
+    Prevent reflecting unsanitized user input in the error response
+    by excluding the 'input' and 'url' fields (Information Disclosure/Reflected DoS)
+    """
     for error in errors:
         # Manually remove 'input' and 'url' to avoid reflecting untrusted data
         error.pop('input', None)
@@ -41,11 +79,30 @@ async def validation_exception_handler(request, exc):
         if 'ctx' in error and 'error' in error['ctx']:
             error['ctx']['error'] = str(error['ctx']['error'])
 
+    return errors
+
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request, exc):
+    errors = sanitize_errors(exc.errors())
     return JSONResponse(
         status_code=422,
         content={"detail": errors},
     )
 
+@app.exception_handler(Overloaded)
+async def overloaded_exception_handler(request, exc):
+    # Heavy computations are shed at admission instead of queueing behind a saturated pool
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+# Ply ceiling of a laminate stack (before mirroring). Batch clients presenting
+# LAMINA_BATCH_TOKEN may send items up to LAMINA_BATCH_MAX_PLIES (see batch_ply_limit).
+MAX_PLIES = env_int("LAMINA_MAX_PLIES", 200)
+TRUSTED_BATCH_MAX_PLIES = env_int("LAMINA_BATCH_MAX_PLIES", 2000)
+
 # Pydantic models
 class MaterialModel(BaseModel):
     model_config = {"extra": "forbid"}
@@ -99,14 +156,20 @@ class LaminateModel(BaseModel):
 
     @field_validator('stack', mode='after')
     @classmethod
-    def check_stack_size(cls, v: List[float]) -> List[float]:
-        if len(v) > 200:
-             raise ValueError('Stack too large (max 200 plies)')
+    def check_stack_size(cls, v: List[float], info: ValidationInfo) -> List[float]:
+        # The ceiling can be raised per call with model_validate(..., context={"max_plies": n})
+        max_plies = (info.context or {}).get("max_plies", MAX_PLIES)
+        if len(v) > max_plies:
+             raise ValueError(f'Stack too large (max {max_plies} plies)')
         if len(v) == 0:
              raise ValueError('Stack cannot be empty')
-        for val in v:
-             if math.isnan(val) or math.isinf(val):
-                  raise ValueError('Must be a finite number')
+        # Optimization: sum() runs in C and any NaN/inf ply makes it non-finite, so valid
+        # stacks are accepted in one pass; only a non-finite sum (possibly an overflow of
+        # huge finite angles) falls back to checking every ply.
+        if not math.isfinite(sum(v)):
+            for val in v:
+                if math.isnan(val) or math.isinf(val):
+                    raise ValueError('Must be a finite number')
         return v
 
     @field_validator('thickness', mode='before')
@@ -153,19 +216,233 @@ class FailureRequest(BaseModel):
     laminate: LaminateModel
     limits: LimitsModel
 
+class PlateModel(BaseModel):
+    model_config = {"extra": "forbid"}
+    a: float
+    b: float
+    m_max: int = 5
+
+    @field_validator('a', 'b')
+    @classmethod
+    def check_positive(cls, v: float) -> float:
+        if math.isnan(v) or math.isinf(v):
+            raise ValueError('Must be a finite number')
+        if v <= 0:
+            raise ValueError('Must be positive')
+        return v
+
+    @field_validator('m_max')
+    @classmethod
+    def check_modes(cls, v: int) -> int:
+        if v < 1 or v > 50:
+            raise ValueError('Mode count must be between 1 and 50')
+        return v
+
+class AnalyzeRequest(BaseModel):
+    model_config = {"extra": "forbid"}
+    laminate: LaminateModel
+    limits: Optional[LimitsModel] = None
+    plate: Optional[PlateModel] = None
+    outputs: List[Literal["abd", "properties", "polar", "envelopes", "buckling"]] = ["abd", "properties"]
+    criteria: List[Literal["tsai_wu", "tsai_hill", "max_stress"]] = ["tsai_wu"]
+
+    @model_validator(mode='after')
+    def check_inputs(self) -> 'AnalyzeRequest':
+        if "envelopes" in self.outputs and self.limits is None:
+            raise ValueError('Limits are required for envelopes')
+        if "buckling" in self.outputs and self.plate is None:
+            raise ValueError('Plate dimensions are required for buckling')
+        return self
+
+MAX_BATCH_ITEMS = 500
+# Plies evaluated per vectorized pass; bounds the (plies x points) temporaries of failure envelopes
+BATCH_PLY_CHUNK = 4096
+
+class BatchItemModel(LaminateModel):
+    material: Optional[MaterialModel] = None
+    limits: Optional[LimitsModel] = None
+
+class RulesModel(BaseModel):
+    """Manufacturing rules for /api/batch (see ManufacturingRules); symmetry comes from each item."""
+    model_config = {"extra": "forbid"}
+    balanced: bool = True
+    max_contiguous: Optional[int] = Field(4, ge=1)
+    min_fraction: float = Field(0.1, ge=0, le=1/3)
+    outer_45: bool = True
+    # Repair items before checking them instead of only rejecting infeasible ones
+    repair: bool = False
+
+    def to_rules(self):
+        return ManufacturingRules(self.balanced, self.max_contiguous, self.min_fraction, self.outer_45)
+
+class BatchRequest(BaseModel):
+    model_config = {"extra": "forbid"}
+    material: Optional[MaterialModel] = None
+    limits: Optional[LimitsModel] = None
+    # Items that still break the rules (after repair, if requested) are rejected before evaluation
+    rules: Optional[RulesModel] = None
+    # Items are validated one by one in the handler so a bad item only fails itself
+    items: List[Any]
+    outputs: List[Literal["abd", "properties", "polar", "failure"]] = ["abd", "properties"]
+
+    @field_validator('items')
+    @classmethod
+    def check_items_size(cls, v: List[Any]) -> List[Any]:
+        if len(v) > MAX_BATCH_ITEMS:
+            raise ValueError(f'Too many items (max {MAX_BATCH_ITEMS})')
+        if len(v) == 0:
+            raise ValueError('Items cannot be empty')
+        return v
+
+class LoadModel(BaseModel):
+    model_config = {"extra": "forbid"}
+    Nx: float = 0
+    Ny: float = 0
+    Nxy: float = 0
+    Mx: float = 0
+    My: float = 0
+    Mxy: float = 0
+
+    @field_validator('Nx', 'Ny', 'Nxy', 'Mx', 'My', 'Mxy')
+    @classmethod
+    def check_finite(cls, v: float) -> float:
+        if math.isnan(v) or math.isinf(v):
+            raise ValueError('Must be a finite number')
+        return v
+
+class OptimizeRequest(BaseModel):
+    model_config = {"extra": "forbid"}
+    material: MaterialModel
+    loads: List[LoadModel]
+    limits: LimitsModel
+    safety_factor: float = 1.5
+    buckling_load: Optional[float] = None
+    a: float = 1.0
+    b: float = 1.0
+    min_plies: int = 4
+    max_plies: int = 16
+    population_size: int = 20
+    generations: int = 10
+    seed: Optional[int] = None
+
+    @field_validator('loads')
+    @classmethod
+    def check_loads_size(cls, v: List[LoadModel]) -> List[LoadModel]:
+        if len(v) > 50:
+            raise ValueError('Too many load cases (max 50)')
+        if len(v) == 0:
+            raise ValueError('Loads cannot be empty')
+        return v
+
+    @field_validator('safety_factor', 'buckling_load', 'a', 'b')
+    @classmethod
+    def check_positive(cls, v: Optional[float]) -> Optional[float]:
+        if v is None:
+            return v
+        if math.isnan(v) or math.isinf(v):
+            raise ValueError('Must be a finite number')
+        if v <= 0:
+            raise ValueError('Must be positive')
+        return v
+
+    @field_validator('min_plies', 'max_plies')
+    @classmethod
+    def check_plies(cls, v: int) -> int:
+        if not 2 <= v <= 200:
+            raise ValueError('Ply count must be between 2 and 200')
+        return v
+
+    @field_validator('population_size')
+    @classmethod
+    def check_population(cls, v: int) -> int:
+        if not 2 <= v <= 200:
+            raise ValueError('Population size must be between 2 and 200')
+        return v
+
+    @field_validator('generations')
+    @classmethod
+    def check_generations(cls, v: int) -> int:
+        if not 1 <= v <= 200:
+            raise ValueError('Generations must be between 1 and 200')
+        return v
+
+    @model_validator(mode='after')
+    def check_ply_range(self) -> 'OptimizeRequest':
+        if self.min_plies > self.max_plies:
+            raise ValueError('min_plies must not exceed max_plies')
+        return self
+
+# Design session (WebSocket) messages, discriminated by "op"
+MAX_SESSION_MESSAGE = 65536
+SessionOutput = Literal["abd", "properties", "polar", "envelope"]
+
+class PlyEdit(BaseModel):
+    model_config = {"extra": "forbid"}
+    angle: float
+
+    @field_validator('angle')
+    @classmethod
+    def check_finite(cls, v: float) -> float:
+        if math.isnan(v) or math.isinf(v):
+            raise ValueError('Must be a finite number')
+        return v
+
+class SessionInit(BaseModel):
+    model_config = {"extra": "forbid"}
+    op: Literal["init"]
+    laminate: LaminateModel
+    limits: Optional[LimitsModel] = None
+    outputs: List[SessionOutput] = ["abd", "properties", "polar", "envelope"]
+
+class SetPly(PlyEdit):
+    op: Literal["set_ply"]
+    index: int
+
+class InsertPly(PlyEdit):
+    op: Literal["insert_ply"]
+    index: Optional[int] = None
+
+class RemovePly(BaseModel):
+    model_config = {"extra": "forbid"}
+    op: Literal["remove_ply"]
+    index: int
+
+class SetMaterial(BaseModel):
+    model_config = {"extra": "forbid"}
+    op: Literal["set_material"]
+    material: MaterialModel
+
+class SetLimits(BaseModel):
+    model_config = {"extra": "forbid"}
+    op: Literal["set_limits"]
+    limits: LimitsModel
+
+class SetOutputs(BaseModel):
+    model_config = {"extra": "forbid"}
+    op: Literal["set_outputs"]
+    outputs: List[SessionOutput]
+
+SessionMessage = TypeAdapter(Annotated[
+    Union[SessionInit, SetPly, InsertPly, RemovePly, SetMaterial, SetLimits, SetOutputs],
+    Field(discriminator="op"),
+])
+
+# Helper to create Material object
+def create_material(data: MaterialModel):
+    return Material(
+        E1=data.E1,
+        E2=data.E2,
+        G12=data.G12,
+        v12=data.v12,
+        name=data.name
+    )
+
 # Helper to create Laminate object
 def create_laminate(data: LaminateModel):
-    mat = Material(
-        E1=data.material.E1,
-        E2=data.material.E2,
-        G12=data.material.G12,
-        v12=data.material.v12,
-        name=data.material.name
-    )
+    mat = create_material(data.material)
     return Laminate(mat, data.stack, data.thickness, data.symmetry)
 
-@app.post("/api/calculate")
-def calculate(data: LaminateModel):
+def compute_calculate(data: LaminateModel):
     lam = create_laminate(data)
     props = lam.properties()
     return {
@@ -173,35 +450,432 @@ def calculate(data: LaminateModel):
         "properties": props
     }
 
-@app.post("/api/polar")
-def polar(data: LaminateModel):
+# Evaluation points per ply of each output, for cost estimates
+POLAR_POINTS = 36
+ENVELOPE_POINTS = 72
+
+def laminate_cost(data: LaminateModel, points=1):
+    """Estimated cost of evaluating a laminate at `points` points: plies x points."""
+    return len(data.stack) * (2 if data.symmetry else 1) * points
+
+def analyze_cost(req: AnalyzeRequest):
+    points = 1
+    if "polar" in req.outputs:
+        points += POLAR_POINTS
+    if "envelopes" in req.outputs:
+        points += ENVELOPE_POINTS * len(set(req.criteria))
+    return laminate_cost(req.laminate, points)
+
+def batch_cost(req: BatchRequest):
+    points = 1
+    if "polar" in req.outputs:
+        points += POLAR_POINTS
+    if "failure" in req.outputs:
+        points += ENVELOPE_POINTS
+    # Items are not validated yet; malformed ones are rejected cheaply and cost nothing here
+    plies = 0
+    for item in req.items:
+        stack = item.get("stack") if isinstance(item, dict) else None
+        if isinstance(stack, list):
+            plies += len(stack) * (2 if item.get("symmetry") is True else 1)
+    return plies * points
+
+POLAR_COLUMNS = ["angle", "Ex", "Ey", "Gxy"]
+ENVELOPE_COLUMNS = ["sigma_x", "sigma_y"]
+
+def compute_polar(data: LaminateModel):
     lam = create_laminate(data)
-    polar_res = lam.polar_stiffness()
-    return polar_res.data
+    return lam.polar_stiffness()
 
-@app.post("/api/failure")
-def failure(req: FailureRequest):
+def compute_failure(req: FailureRequest):
     lam = create_laminate(req.laminate)
     # Using Tsai-Wu
-    envelope = FailureCriterion.tsai_wu(lam, req.limits.model_dump())
-    return envelope.data
+    return FailureCriterion.tsai_wu(lam, req.limits.model_dump())
 
-# Serve static files
-# In Vercel, static files are usually handled by the platform or placed in public/
-# We rely on the custom /{filename} route below to serve static files securely.
+def compute_analyze(req: AnalyzeRequest):
+    # One Laminate serves every output: the ABD inverse, K_all and the unit-load
+    # ply stresses are computed once and shared by all requested criteria.
+    lam = create_laminate(req.laminate)
+    result = {}
+    if "abd" in req.outputs:
+        result["ABD"] = lam.ABD.tolist()
+    if "properties" in req.outputs:
+        result["properties"] = lam.properties()
+    if "polar" in req.outputs:
+        result["polar"] = lam.polar_stiffness().data
+    if "envelopes" in req.outputs:
+        limits = req.limits.model_dump()
+        stresses = FailureCriterion.unit_stresses(lam)
+        result["envelopes"] = {
+            criterion: getattr(FailureCriterion, criterion)(lam, limits, stresses=stresses).data
+            for criterion in dict.fromkeys(req.criteria)
+        }
+    if "buckling" in req.outputs:
+        n_cr, mode = BucklingAnalysis.critical_load(lam, req.plate.a, req.plate.b, req.plate.m_max)
+        result["buckling"] = {"N_cr": n_cr, "mode": mode}
+    return result
+
+# The analysis endpoints are pure functions of the validated payload,
+# so their rendered results are cached by request hash and served with ETags.
+# Polars and envelopes can also be requested as binary columns through the Accept header.
+@app.post("/api/calculate")
+def calculate(data: LaminateModel, request: Request):
+    return cached_response(
+        request, "calculate", data, lambda: executor.run(laminate_cost(data), compute_calculate, data)
+    )
 
-@app.get("/")
-def read_root():
-    if os.path.exists("public/index.html"):
-        return FileResponse('public/index.html')
-    return {"message": "Welcome to Lamina API. Frontend not found."}
+@app.post("/api/polar")
+def polar(data: LaminateModel, request: Request):
+    return columnar_response(
+        request, "polar", data,
+        lambda: executor.run(laminate_cost(data, POLAR_POINTS), compute_polar, data), POLAR_COLUMNS,
+    )
 
+@app.post("/api/failure")
+def failure(req: FailureRequest, request: Request):
+    return columnar_response(
+        request, "failure", req,
+        lambda: executor.run(laminate_cost(req.laminate, ENVELOPE_POINTS), compute_failure, req), ENVELOPE_COLUMNS,
+    )
 
-ALLOWED_EXTENSIONS = {'.html', '.css', '.js', '.json', '.png', '.jpg', '.jpeg', '.svg', '.ico', '.map'}
+@app.post("/api/analyze")
+def analyze(req: AnalyzeRequest, request: Request):
+    return cached_response(request, "analyze", req, lambda: executor.run(analyze_cost(req), compute_analyze, req))
+
+@app.post("/api/batch")
+def batch(req: BatchRequest, request: Request):
+    max_plies = batch_ply_limit(request.headers.get("authorization", ""))
+    media_type = negotiate(request.headers.get("accept", ""), [JSON, NDJSON])
+    if media_type is None:
+        return JSONResponse(status_code=406, content={"detail": "Not Acceptable"})
+    if media_type == NDJSON:
+        # One {"index": i, ...} line per item, written as soon as its chunk is evaluated.
+        # Streams are produced in-process so that lines can be flushed incrementally, but they
+        # pass the same admission check as offloaded batches and hold a slot until they end.
+        reservation = executor.reserve(batch_cost(req))
+
+        def lines():
+            with reservation:
+                for i, result in iter_batch(req, max_plies):
+                    yield render_json({"index": i, **result}) + b"\n"
+
+        # The background task also releases streams that never started
+        return StreamingResponse(lines(), media_type=NDJSON, headers={"Vary": "Accept"},
+                                 background=BackgroundTask(reservation.release))
+    # Batches are not cached (too large to be worth it) but identical in-flight sweeps are shared
+    # The ply ceiling is part of the key: an untrusted client must not share a trusted result
+    return JSONResponse(
+        inflight.do(
+            request_key(f"batch:{max_plies}", req),
+            lambda: executor.run(batch_cost(req), compute_batch, req, max_plies),
+        ),
+        headers={"Vary": "Accept"},
+    )
 
+def batch_ply_limit(authorization: str) -> int:
+    """
+    Ply ceiling for batch items: TRUSTED_BATCH_MAX_PLIES for requests carrying
+    "Authorization: Bearer <LAMINA_BATCH_TOKEN>", MAX_PLIES otherwise.
+    """
+    token = os.environ.get("LAMINA_BATCH_TOKEN")
+    if token:
+        scheme, _, given = (authorization or "").partition(" ")
+        if scheme.lower() == "bearer" and secrets.compare_digest(given.strip().encode(), token.encode()):
+            return max(TRUSTED_BATCH_MAX_PLIES, MAX_PLIES)
+    return MAX_PLIES
+
+def compute_batch(req: BatchRequest, max_plies: int = MAX_PLIES):
+    results: List[Dict[str, Any]] = [None] * len(req.items)
+    for i, result in iter_batch(req, max_plies):
+        results[i] = result
+    return {"results": results}
+
+def iter_batch(req: BatchRequest, max_plies: int = MAX_PLIES):
+    """
+    Yields (index, result) for every batch item: validation errors first, then
+    manufacturing-rule violations (when req.rules is set), then the valid items chunk by
+    chunk as they are evaluated.
+    """
+    valid = []
+    materials = {}
+    context = {"max_plies": max_plies}
+
+    for i, raw in enumerate(req.items):
+        if not isinstance(raw, dict):
+            yield i, {"error": [{"type": "dict_type", "loc": ["items", i], "msg": "Input should be a valid dictionary"}]}
+            continue
+        try:
+            item = BatchItemModel.model_validate(raw, context=context)
+        except ValidationError as exc:
+            errors = sanitize_errors(exc.errors())
+            for error in errors:
+                error['loc'] = ("items", i) + tuple(error.get('loc', ()))
+            yield i, {"error": errors}
+            continue
+
+        material = item.material or req.material
+        limits = item.limits or req.limits
+        if material is None:
+            yield i, {"error": [{"type": "missing", "loc": ["items", i, "material"], "msg": "Field required"}]}
+            continue
+        if "failure" in req.outputs and limits is None:
+            yield i, {"error": [{"type": "missing", "loc": ["items", i, "limits"], "msg": "Field required"}]}
+            continue
+
+        # Share one Material (and its cached Q/invariants) between items with the same definition
+        key = material.model_dump_json()
+        if key not in materials:
+            materials[key] = create_material(material)
+        valid.append((i, item, item.stack, materials[key], limits))
+
+    if req.rules is not None:
+        # Rejected (or repaired) before the stiffness pass, so infeasible items cost nothing more
+        stacks, violations = req.rules.to_rules().check_stacks(
+            [entry[2] for entry in valid], [entry[1].symmetry for entry in valid], req.rules.repair,
+        )
+        feasible = []
+        for (i, item, _, material, limits), stack, broken in zip(valid, stacks, violations):
+            if broken:
+                msg = "Violates manufacturing rules: " + ", ".join(broken)
+                yield i, {"error": [{"type": "manufacturing_rules", "loc": ["items", i, "stack"], "msg": msg}]}
+            else:
+                feasible.append((i, item, stack, material, limits))
+        valid = feasible
+
+    # Evaluate valid items in vectorized chunks bounded by total ply count
+    chunks, current, plies = [], [], 0
+    for entry in valid:
+        n_plies = len(entry[2]) * (2 if entry[1].symmetry else 1)
+        if current and plies + n_plies > BATCH_PLY_CHUNK:
+            chunks.append(current)
+            current, plies = [], 0
+        current.append(entry)
+        plies += n_plies
+    if current:
+        chunks.append(current)
+
+    for chunk in chunks:
+        lams = LaminateBatch(
+            [mat for _, _, _, mat, _ in chunk],
+            [stack for _, _, stack, _, _ in chunk],
+            [item.thickness for _, item, _, _, _ in chunk],
+            [item.symmetry for _, item, _, _, _ in chunk],
+        )
+        outputs = {}
+        if req.rules is not None and req.rules.repair:
+            # The evaluated (repaired) stacks, before mirroring
+            outputs["stack"] = [stack for _, _, stack, _, _ in chunk]
+        if "abd" in req.outputs:
+            outputs["ABD"] = lams.ABD.tolist()
+        if "properties" in req.outputs:
+            outputs["properties"] = lams.properties()
+        if "polar" in req.outputs:
+            outputs["polar"] = lams.polar_stiffness()
+        if "failure" in req.outputs:
+            outputs["failure"] = lams.tsai_wu([lim.model_dump() for _, _, _, _, lim in chunk])
+
+        for j, (i, _, _, _, _) in enumerate(chunk):
+            yield i, {name: values[j] for name, values in outputs.items()}
+
+@app.post("/api/optimize", status_code=202)
+def optimize(req: OptimizeRequest):
+    constraints = {
+        'safety_factor': req.safety_factor,
+        'limits': req.limits.model_dump(),
+    }
+    if req.buckling_load is not None:
+        constraints.update(buckling_load=req.buckling_load, a=req.a, b=req.b)
+
+    params = {
+        "material": req.material.model_dump(),
+        "loads": [load.model_dump() for load in req.loads],
+        "constraints": constraints,
+        "min_plies": req.min_plies,
+        "max_plies": req.max_plies,
+        "population_size": req.population_size,
+        "generations": req.generations,
+        "seed": req.seed,
+    }
+    job_id = jobs.submit(params)
+    if job_id is None:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Optimization queue is full"},
+            headers={"Retry-After": "30"},
+        )
+    return {"job_id": job_id, "status": "queued"}
+
+@app.get("/api/optimize/{job_id}")
+def optimize_status(job_id: str = Path(..., max_length=64)):
+    snapshot = jobs.status(job_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return snapshot
+
+@app.get("/api/optimize/{job_id}/events")
+async def optimize_events(request: Request, job_id: str = Path(..., max_length=64)):
+    """Server-Sent Events stream of job progress; honours Last-Event-ID for reconnects."""
+    try:
+        start = int(request.headers.get("last-event-id", -1)) + 1
+    except ValueError:
+        start = 0
+
+    if await run_in_threadpool(jobs.events, job_id, 0) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def stream():
+        index = max(0, start)
+        while True:
+            snapshot = await run_in_threadpool(jobs.events, job_id, index)
+            if snapshot is None:
+                return
+            events, next_index, finished = snapshot
+            first = next_index - len(events)
+            for k, event in enumerate(events):
+                yield f"id: {first + k}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            index = next_index
+            if finished:
+                return
+            await asyncio.sleep(0.25)
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+@app.delete("/api/optimize/{job_id}")
+def optimize_cancel(job_id: str = Path(..., max_length=64)):
+    if not jobs.cancel(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"job_id": job_id, "status": "cancelling"}
 
-@app.get("/{filename}")
-def read_file(filename: str = Path(..., max_length=255)):
+# Serve static files
+# In Vercel, static files are usually handled by the platform or placed in public/
+# We rely on the custom /{filename} route below to serve static files securely.
+
+def session_cost(session: Optional[DesignSession], message):
+    """Upper bound on the cost of applying one message: every output of the resulting stack."""
+    if isinstance(message, SessionInit):
+        cost = laminate_cost(message.laminate)
+    elif session is not None:
+        cost = len(session.laminate.stack) + 1
+    else:
+        return 0
+    return cost * (2 + POLAR_POINTS + ENVELOPE_POINTS)
+
+def apply_session_message(session: Optional[DesignSession], message):
+    """
+    Applies one validated message.
+
+    Returns:
+        tuple: (session, reply) where reply holds the outputs that changed.
+    """
+    if isinstance(message, SessionInit):
+        lam = message.laminate
+        session = DesignSession(
+            create_material(lam.material), lam.stack, lam.thickness, lam.symmetry,
+            limits=message.limits.model_dump() if message.limits else None,
+            outputs=message.outputs,
+            max_plies=MAX_PLIES,
+        )
+        return session, {"state": session.state(), "changed": session.changes()}
+
+    if session is None:
+        raise ValueError('Session not initialized: send an "init" message first')
+    if isinstance(message, SetPly):
+        session.set_ply(message.index, message.angle)
+    elif isinstance(message, InsertPly):
+        session.insert_ply(message.index, message.angle)
+    elif isinstance(message, RemovePly):
+        session.remove_ply(message.index)
+    elif isinstance(message, SetMaterial):
+        session.set_material(create_material(message.material))
+    elif isinstance(message, SetLimits):
+        session.set_limits(message.limits.model_dump())
+    elif isinstance(message, SetOutputs):
+        session.set_outputs(message.outputs)
+    return session, {"changed": session.changes()}
+
+@app.websocket("/api/session")
+async def design_session(websocket: WebSocket):
+    await websocket.accept()
+    if not sessions.acquire():
+        await websocket.close(code=1013, reason="Too many sessions")
+        return
+
+    session = None
+    seq = 0
+    take = sessions.message_bucket()
+    try:
+        while True:
+            try:
+                text = await asyncio.wait_for(websocket.receive_text(), timeout=sessions.idle_timeout)
+            except asyncio.TimeoutError:
+                await websocket.close(code=1000, reason="Idle timeout")
+                return
+            if len(text) > MAX_SESSION_MESSAGE:
+                await websocket.close(code=1009, reason="Message too large")
+                return
+
+            seq += 1
+            if not take():
+                # Dropped unapplied: the client resends the latest state once the bucket refills
+                reply = {"error": "Too many messages", "retry_after": sessions.message_window}
+                await websocket.send_text(render_json({"seq": seq, **reply}).decode())
+                continue
+            try:
+                message = SessionMessage.validate_json(text)
+                # Admitted like the HTTP routes; the session lives in this process, so the
+                # polar and envelope are computed in the threadpool rather than the pool
+                with executor.reserve(session_cost(session, message)):
+                    session, reply = await run_in_threadpool(apply_session_message, session, message)
+            except ValidationError as exc:
+                reply = {"error": sanitize_errors(exc.errors())}
+            except Overloaded as exc:
+                reply = {"error": "Server is busy", "retry_after": exc.retry_after}
+            except ValueError as exc:
+                reply = {"error": str(exc)}
+            await websocket.send_text(render_json({"seq": seq, **reply}).decode())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sessions.release()
+
+@app.get("/api/metrics")
+def metrics(request: Request):
+    # Scrapes are restricted; unauthorized callers get the same 404 as an unknown route
+    if not metrics_allowed(request.scope, request.headers.get("authorization", "")):
+        raise HTTPException(status_code=404, detail="Not Found")
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+# Static files are indexed (and precompressed) once and served from memory. Not at import:
+# compute workers import this module and never serve files.
+_static_assets = None
+
+def static_assets():
+    """The AssetIndex of public/, built at startup or on the first static request."""
+    global _static_assets
+    if _static_assets is None:
+        _static_assets = AssetIndex.from_directory("public")
+    return _static_assets
+
+async def find_asset(path):
+    index = _static_assets if _static_assets is not None else await run_in_threadpool(static_assets)
+    return index.get(path)
+
+@app.api_route("/", methods=["GET", "HEAD"])
+async def static_index(request: Request):
+    asset = await find_asset("/")
+    if asset is None:
+        return {"message": "Welcome to Lamina API. Frontend not found."}
+    return asset_response(asset, request.headers)
+
+@app.api_route("/{filename}", methods=["GET", "HEAD"])
+async def static_file(request: Request, filename: str = Path(..., max_length=255)):
+    asset = await find_asset("/" + filename)
+    if asset is not None:
+        return asset_response(asset, request.headers)
+    return await run_in_threadpool(read_file, filename)
+
+def read_file(filename):
+    """Fallback for files added to public/ after startup (not in static_assets)."""
     if '\x00' in filename or '/' in filename or '\\' in filename:
         raise HTTPException(status_code=400, detail="Invalid filename")
 
@@ -0,0 +1,249 @@
+import atexit
+import logging
+import math
+import multiprocessing
+import queue
+import secrets
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from api.config import env_int, warm
+
+
+def _json_safe(record):
+    """Replaces non-finite floats (e.g. the infinite safety factor of an all-zero load) with None."""
+    return {
+        key: None if isinstance(value, float) and not math.isfinite(value) else value
+        for key, value in record.items()
+    }
+
+
+def run_optimization(params, events, cancel):
+    """
+    Worker entry point, executed in a pool process.
+
+    Args:
+        params (dict): Plain-data job description (see OptimizeRequest in api/index.py).
+        events: Queue receiving progress events.
+        cancel: Event set by the API process to request cancellation.
+    """
+    import random
+    from lamina.materials import Material
+    from lamina.clt import Laminate
+    from lamina.optimization import GeneticAlgorithm, load_case_safety_factors
+
+    if params.get("seed") is not None:
+        random.seed(params["seed"])
+
+    material = Material(**params["material"])
+    constraints = dict(params["constraints"])
+
+    def callback(info):
+        events.put(_json_safe({"type": "generation", **info}))
+        return cancel.is_set()
+
+    events.put({"type": "started"})
+    ga = GeneticAlgorithm(
+        material, params["loads"], constraints,
+        population_size=params["population_size"],
+        generations=params["generations"],
+        callback=callback,
+    )
+    stack = ga.optimize(params["min_plies"], params["max_plies"])
+    if ga.stopped:
+        return {"cancelled": True}
+
+    result = {"stack": stack, "evaluations": ga.n_evaluations}
+    if stack:
+        lam = Laminate(material, stack)
+        result["plies"] = len(stack)
+        result["safety_factor"] = float(load_case_safety_factors(lam, params["loads"], constraints["limits"]).min())
+    # Results and events are served as strict JSON, which has no Infinity
+    return _json_safe(result)
+
+
+class JobManager:
+    """
+    Runs optimization jobs on a bounded, lazily started process pool.
+
+    Job state lives in this process; workers report progress through a managed queue
+    per job and poll a managed event for cancellation. Finished jobs are kept for
+    `ttl` seconds after completion.
+    """
+    def __init__(self, max_workers=2, max_pending=8, ttl=600, max_jobs=256, max_events=1000):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+        self.max_events = max_events
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._manager = None
+        self._atexit_registered = False
+
+    def _ensure_started(self):
+        if self._executor is None:
+            # spawn avoids forking a multi-threaded server process
+            ctx = multiprocessing.get_context("spawn")
+            self._manager = ctx.Manager()
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=ctx)
+            for _ in range(self.max_workers):
+                self._executor.submit(warm, "lamina.optimization")
+            if not self._atexit_registered:
+                atexit.register(self.shutdown)
+                self._atexit_registered = True
+
+    def shutdown(self):
+        """Stops the pool and its manager; safe to call more than once."""
+        with self._lock:
+            if self._manager is None:
+                return
+            for job in self._jobs.values():
+                if job["finished"] is None:
+                    job["cancel"].set()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._manager.shutdown()
+            self._executor = None
+            self._manager = None
+            # Their queue and event proxies belonged to the manager that was just stopped
+            self._jobs.clear()
+
+    def _purge(self, now):
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job["finished"] is not None and now - job["finished"] > self.ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _active(self):
+        return sum(1 for job in self._jobs.values() if job["finished"] is None)
+
+    def submit(self, params):
+        """
+        Returns:
+            str: Job id, or None if the pool is saturated.
+        """
+        with self._lock:
+            now = time.time()
+            # Jobs that nobody polls must still stop counting as active once they finish
+            for job in self._jobs.values():
+                self._refresh(job)
+            self._purge(now)
+            if self._active() >= self.max_pending or len(self._jobs) >= self.max_jobs:
+                return None
+
+            self._ensure_started()
+            job_id = secrets.token_urlsafe(16)
+            events = self._manager.Queue()
+            cancel = self._manager.Event()
+            job = {
+                "status": "queued",
+                "created": now,
+                "finished": None,
+                "events": [],
+                "dropped_events": 0,
+                "queue": events,
+                "cancel": cancel,
+                "result": None,
+                "error": None,
+            }
+            job["future"] = self._executor.submit(run_optimization, params, events, cancel)
+            self._jobs[job_id] = job
+            return job_id
+
+    def _refresh(self, job):
+        """Drains pending progress events and records completion."""
+        if job["finished"] is not None:
+            return
+        done = job["future"].done()
+        while True:
+            try:
+                event = job["queue"].get_nowait()
+            except (queue.Empty, EOFError, OSError):
+                break
+            if event.get("type") == "started" and job["status"] == "queued":
+                job["status"] = "running"
+            job["events"].append(event)
+
+        # Keep memory bounded for long runs; indices stay stable through dropped_events
+        overflow = len(job["events"]) - self.max_events
+        if overflow > 0:
+            del job["events"][:overflow]
+            job["dropped_events"] += overflow
+
+        if not done:
+            return
+        future = job["future"]
+        if future.cancelled():
+            job["status"] = "cancelled"
+        elif future.exception() is not None:
+            logging.error("Optimization job failed", exc_info=future.exception())
+            job["status"] = "failed"
+            job["error"] = "Optimization failed"
+        elif future.result().get("cancelled"):
+            job["status"] = "cancelled"
+        else:
+            job["status"] = "completed"
+            job["result"] = future.result()
+        job["finished"] = time.time()
+        job["events"].append({"type": job["status"]})
+
+    def status(self, job_id):
+        """
+        Returns:
+            dict: Job snapshot, or None if the job does not exist (or has expired).
+        """
+        with self._lock:
+            self._purge(time.time())
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            self._refresh(job)
+            progress = [e for e in job["events"] if e["type"] == "generation"]
+            return {
+                "job_id": job_id,
+                "status": job["status"],
+                "progress": progress[-1] if progress else None,
+                "events": job["dropped_events"] + len(job["events"]),
+                "result": job["result"],
+                "error": job["error"],
+            }
+
+    def events(self, job_id, start):
+        """
+        Returns:
+            tuple: (events from index `start`, index of the next event, finished flag),
+            or None if the job does not exist.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            self._refresh(job)
+            offset = max(0, start - job["dropped_events"])
+            new = job["events"][offset:]
+            return new, job["dropped_events"] + len(job["events"]), job["finished"] is not None
+
+    def cancel(self, job_id):
+        """
+        Returns:
+            bool: False if the job does not exist.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return False
+            if job["finished"] is None:
+                job["cancel"].set()
+                job["future"].cancel()
+            return True
+
+
+jobs = JobManager(
+    max_workers=env_int("LAMINA_JOB_WORKERS", 2),
+    max_pending=env_int("LAMINA_JOB_QUEUE", 8),
+    ttl=env_int("LAMINA_JOB_TTL", 600),
+)
@@ -0,0 +1,219 @@
+import bisect
+import ipaddress
+import os
+import secrets
+import threading
+import time
+
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+from lamina import metrics as lamina_metrics
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class CounterVec:
+    """Monotonic counter with labels, rendered in the Prometheus text format."""
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, n=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + n
+
+    def value(self, *labels):
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        if not self.labels and not values:
+            values[()] = 0
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_labels(self.labels, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed buckets and labels.
+
+    Observations only increment one bucket; cumulative counts are built at render time.
+    """
+    def __init__(self, name, help, buckets, labels=()):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.labels = labels
+        self._series = {} # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, list(values)) for labels, values in self._series.items())
+        for labels, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), values[:-1]):
+                cumulative += count
+                le = 'le="%s"' % _number(float(bound))
+                lines.append(f"{self.name}_bucket{_labels(self.labels, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, labels)} {_number(values[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labels, labels)} {cumulative}")
+        return lines
+
+
+REQUESTS = CounterVec("lamina_http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+RATE_LIMITED = CounterVec("lamina_rate_limited_total", "Requests rejected by the rate limiter.")
+LATENCY = Histogram(
+    "lamina_http_request_duration_seconds", "Time to the end of the response body.",
+    LATENCY_BUCKETS, ("method", "route"),
+)
+REQUEST_SIZE = Histogram("lamina_http_request_size_bytes", "Request body sizes.", SIZE_BUCKETS, ("route",))
+RESPONSE_SIZE = Histogram("lamina_http_response_size_bytes", "Response body sizes.", SIZE_BUCKETS, ("route",))
+
+# lamina.metrics counter name -> (exported name, help)
+COMPUTE_COUNTERS = {
+    "laminate_builds": ("lamina_laminate_builds_total", "Laminates built (ABD assembled), including batch items."),
+    "abd_inversions": ("lamina_abd_inversions_total", "ABD matrices inverted."),
+    "failure_evaluations": ("lamina_failure_evaluations_total", "Failure envelopes evaluated."),
+}
+
+
+class MetricsMiddleware:
+    """
+    Records per-route latency, request/response sizes and status counts.
+
+    Routes are labelled by their path template (e.g. /api/optimize/{job_id}) so label
+    cardinality stays bounded; requests that never reach a route (404s, rate-limited or
+    oversized requests) are labelled "unmatched".
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        request_bytes = 0
+        response_bytes = 0
+        status = 500
+
+        async def receive_wrapper() -> Message:
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_bytes, status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            LATENCY.observe(time.perf_counter() - start, method, path)
+            REQUEST_SIZE.observe(request_bytes, path)
+            RESPONSE_SIZE.observe(response_bytes, path)
+            REQUESTS.inc(method, path, str(status))
+            if status == 429:
+                RATE_LIMITED.inc()
+
+
+def _sample(name, kind, help, value, labels=""):
+    return [f"# HELP {name} {help}", f"# TYPE {name} {kind}", f"{name}{labels} {_number(value)}"]
+
+
+def render_metrics() -> str:
+    """Renders every metric in the Prometheus text exposition format."""
+    from api.cache import result_cache
+    from api.executor import executor
+    from api.singleflight import inflight
+
+    lines = []
+    for metric in (REQUESTS, RATE_LIMITED, LATENCY, REQUEST_SIZE, RESPONSE_SIZE):
+        lines.extend(metric.render())
+
+    cache = result_cache.stats()
+    lines += _sample("lamina_result_cache_hits_total", "counter", "Result cache hits.", cache["hits"])
+    lines += _sample("lamina_result_cache_misses_total", "counter", "Result cache misses.", cache["misses"])
+    lines += _sample("lamina_result_cache_entries", "gauge", "Entries in the result cache.", cache["entries"])
+    lines += _sample("lamina_result_cache_bytes", "gauge", "Bytes held by the result cache.", cache["bytes"])
+    lines += _sample("lamina_coalesced_requests_total", "counter",
+                     "Requests that waited for an identical in-flight computation.", inflight.followers)
+
+    pool = executor.stats()
+    lines += _sample("lamina_compute_pending", "gauge", "Offloaded or streamed computations running or queued.", pool["pending"])
+    lines += ["# HELP lamina_compute_requests_total Computations by where they ran.",
+              "# TYPE lamina_compute_requests_total counter"]
+    for outcome in ("inline", "offloaded", "streamed", "rejected"):
+        lines.append(f'lamina_compute_requests_total{{outcome="{outcome}"}} {pool[outcome]}')
+
+    counts = lamina_metrics.snapshot()
+    for key, (name, help) in COMPUTE_COUNTERS.items():
+        lines += _sample(name, "counter", help, counts.get(key, 0))
+
+    return "\n".join(lines) + "\n"
+
+
+def metrics_allowed(scope: Scope, authorization: str) -> bool:
+    """
+    With LAMINA_METRICS_TOKEN set, requires "Authorization: Bearer <token>".
+    Otherwise only loopback clients (a local Prometheus agent) may scrape.
+    """
+    token = os.environ.get("LAMINA_METRICS_TOKEN")
+    if token:
+        scheme, _, given = (authorization or "").partition(" ")
+        return scheme.lower() == "bearer" and secrets.compare_digest(given.strip().encode(), token.encode())
+
+    client = scope.get("client")
+    if not client or not client[0]:
+        return False
+    try:
+        return ipaddress.ip_address(client[0]).is_loopback
+    except ValueError:
+        return False
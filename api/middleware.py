@@ -1,86 +1,153 @@
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp, Scope, Receive, Send, Message
-from fastapi import Request, Response
+import anyio
+import math
+import secrets
 import time
 
 from fastapi.responses import JSONResponse
 
 import logging
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+from api.ratelimit import MemoryBackend
+
+# Security headers encoded once as raw ASGI header pairs
+SECURITY_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"strict-transport-security", b"max-age=31536000; includeSubDomains; preload"),
+    (b"cross-origin-opener-policy", b"same-origin"),
+    (b"cross-origin-resource-policy", b"same-origin"),
+    # CSP: allow scripts from self and d3js (CDN)
+    (b"content-security-policy", b"default-src 'self'; script-src 'self' https://cdn.jsdelivr.net; style-src 'self'; img-src 'self' data:; object-src 'none'; base-uri 'self'; frame-ancestors 'none'; form-action 'self'; upgrade-insecure-requests;"),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+    (b"permissions-policy", b"camera=(), microphone=(), geolocation=()"),
+]
+SECURITY_HEADER_NAMES = frozenset(name for name, _ in SECURITY_HEADERS)
+DEFAULT_CACHE_CONTROL = (b"cache-control", b"no-store, no-cache, must-revalidate, max-age=0")
+
+class SecurityHeadersMiddleware:
+    """
+    Adds security headers to every HTTP response.
+    Implemented as a pure ASGI middleware so streaming responses pass through unbuffered.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                headers = []
+                has_cache_control = False
+                for name, value in message.get("headers", ()):
+                    lname = name.lower()
+                    if lname in SECURITY_HEADER_NAMES:
+                        continue
+                    # Routes serving pure, revalidatable results set their own policy
+                    if lname == b"cache-control":
+                        has_cache_control = True
+                    headers.append((name, value))
+                headers.extend(SECURITY_HEADERS)
+                if not has_cache_control:
+                    headers.append(DEFAULT_CACHE_CONTROL)
+                message = {**message, "headers": headers}
+            await send(message)
+
         try:
-            response = await call_next(request)
-        except Exception as e:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
             # Log the error so it's not silently swallowed
             logging.exception("Unhandled exception in application")
+            if response_started:
+                raise
 
             # Prevent 500 errors from bypassing security headers and leaking stack traces
             response = JSONResponse(
                 status_code=500,
                 content={"detail": "Internal Server Error"}
             )
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains; preload"
-        response.headers["Cross-Origin-Opener-Policy"] = "same-origin"
-        response.headers["Cross-Origin-Resource-Policy"] = "same-origin"
-        # CSP: allow scripts from self and d3js (CDN)
-        response.headers["Content-Security-Policy"] = "default-src 'self'; script-src 'self' https://cdn.jsdelivr.net; style-src 'self'; img-src 'self' data:; object-src 'none'; base-uri 'self'; frame-ancestors 'none'; form-action 'self'; upgrade-insecure-requests;"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
-        response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-        return response
-
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, limit=100, window=60):
-        super().__init__(app)
+            await response(scope, receive, send_wrapper)
+
+class RateLimitMiddleware:
+    """
+    Per-client token-bucket rate limiting.
+    Implemented as a pure ASGI middleware to avoid per-request task and stream wrapping.
+
+    Clients get `limit` requests per `window` seconds, refilled continuously. `routes` maps
+    path prefixes to their own (limit, window); those requests use a separate bucket per
+    prefix. Bucket storage is pluggable (see api/ratelimit.py) so several worker processes
+    can share counters.
+
+    With `exempt_token` set, requests sending it in the X-Lamina-Exempt header bypass the
+    limiter (used by the load-testing harness, which would otherwise only measure 429s).
+    """
+    EXEMPT_HEADER = b"x-lamina-exempt"
+
+    def __init__(self, app: ASGIApp, limit=100, window=60, routes=None, backend=None, exempt_token=None):
+        self.app = app
         self.limit = limit
         self.window = window
-        self.clients = {} # ip -> (count, start_time)
+        self.exempt_token = exempt_token.encode() if exempt_token else None
+        # Longest prefix first so the most specific route limit wins
+        self.routes = sorted((routes or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self.backend = backend if backend is not None else MemoryBackend()
+
+    def _policy(self, path):
+        for prefix, (limit, window) in self.routes:
+            if path.startswith(prefix):
+                return prefix, limit, window
+        return "", self.limit, self.window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
 
-    async def dispatch(self, request: Request, call_next):
-        # Use request.client.host which is populated by the ASGI server (Uvicorn/Vercel)
+        # Use the client address populated by the ASGI server (Uvicorn/Vercel)
         # using trusted proxy headers. This avoids IP spoofing via X-Forwarded-For injection.
-        if request.client and request.client.host:
-            ip = request.client.host
+        client = scope.get("client")
+        if client and client[0]:
+            ip = client[0]
         else:
             ip = "unknown"
 
-        now = time.time()
-
-        # Cleanup if cache grows too large (simple protection against memory exhaustion)
-        if len(self.clients) > 10000:
-            # Secure cleanup: Remove expired entries instead of clearing all (fail-secure)
-            # This prevents an attacker from resetting the limit by filling the cache
-            expired = [ip for ip, (count, start) in self.clients.items() if now > start + self.window]
-            for ip in expired:
-                del self.clients[ip]
-
-            # If still too large, remove oldest entries (FIFO) to maintain memory bounds
-            if len(self.clients) > 10000:
-                # Remove first 100 entries (approx. 1% of cache)
-                # Python dicts preserve insertion order, so keys are ordered by insertion time
-                keys = list(self.clients.keys())
-                for k in keys[:100]:
-                    del self.clients[k]
-
-        # Get current usage
-        # Default start_time is now if new IP
-        count, start_time = self.clients.get(ip, (0, now))
-
-        # Check if window expired
-        if now > start_time + self.window:
-            count = 1
-            start_time = now
+        if self.exempt_token is not None:
+            for name, value in scope.get("headers", ()):
+                if name == self.EXEMPT_HEADER and secrets.compare_digest(value, self.exempt_token):
+                    return await self.app(scope, receive, send)
+
+        prefix, limit, window = self._policy(scope.get("path", ""))
+        key = f"{prefix}|{ip}"
+        if self.backend.blocking:
+            # Keep other requests running while this one waits on a shared store
+            allowed = await anyio.to_thread.run_sync(self.backend.hit, key, limit, window, time.time())
         else:
-            count += 1
+            allowed = self.backend.hit(key, limit, window, time.time())
+        if not allowed:
+            await self.send_429(send, math.ceil(window / limit))
+            return
 
-        if count > self.limit:
-            return Response("Too Many Requests", status_code=429)
+        await self.app(scope, receive, send)
 
-        self.clients[ip] = (count, start_time)
-        return await call_next(request)
+    async def send_429(self, send: Send, retry_after: int = 1):
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"text/plain"),
+                (b"content-length", b"17"),
+                (b"retry-after", str(retry_after).encode()),
+            ],
+        })
+        await send({
+            "type": "http.response.body",
+            "body": b"Too Many Requests",
+        })
 
 class PayloadSizeLimitMiddleware:
     """
@@ -0,0 +1,140 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+class RateLimitBackend:
+    """
+    Storage interface for token-bucket rate limiting.
+
+    A bucket holds up to `limit` tokens and refills at `limit / window` tokens per second;
+    each request takes one token. Backends must make hit() atomic for their scope
+    (a process for MemoryBackend, every process sharing the file for SQLiteBackend).
+
+    Backends whose hit() may block (on I/O or locks held by other processes) set
+    `blocking`, and the middleware calls them from a worker thread instead of the event loop.
+    """
+    blocking = False
+
+    def hit(self, key: str, limit: int, window: float, now: float) -> bool:
+        """Takes a token from the bucket `key`. Returns False if the bucket is empty."""
+        raise NotImplementedError
+
+    @staticmethod
+    def _refill(tokens, updated, limit, window, now):
+        return min(float(limit), tokens + (now - updated) * (limit / window))
+
+
+class MemoryBackend(RateLimitBackend):
+    """
+    In-process buckets kept in least-recently-used order.
+
+    Idle buckets refill to full after one window, so they are equivalent to absent ones and
+    are expired from the LRU end. Each hit does O(1) work plus amortized O(1) expiry, and
+    the number of buckets never exceeds max_keys (the least recently seen client is dropped).
+    """
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict() # key -> [tokens, updated, window]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def hit(self, key, limit, window, now):
+        with self._lock:
+            # Expire idle buckets from the least recently used end
+            while self._buckets:
+                oldest = next(iter(self._buckets.values()))
+                if now - oldest[1] < oldest[2]:
+                    break
+                self._buckets.popitem(last=False)
+
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                tokens = float(limit)
+                if len(self._buckets) >= self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                tokens = self._refill(bucket[0], bucket[1], limit, window, now)
+                self._buckets.move_to_end(key)
+
+            allowed = tokens >= 1.0
+            if allowed:
+                tokens -= 1.0
+            self._buckets[key] = [tokens, now, window]
+            return allowed
+
+
+class SQLiteBackend(RateLimitBackend):
+    """
+    Buckets shared by every worker process through a local SQLite database.
+
+    Stand-in for a Redis-style shared counter store when running several uvicorn workers
+    on one host. Expired rows are purged every `purge_every` hits and the table is capped
+    at max_keys rows.
+    """
+    # BEGIN IMMEDIATE waits up to the connection timeout for other writers
+    blocking = True
+
+    def __init__(self, path, max_keys=10000, purge_every=1000):
+        self.path = path
+        self.max_keys = max_keys
+        self.purge_every = purge_every
+        self._local = threading.local()
+        self._hits = 0
+        self._hits_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, window REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS buckets_updated ON buckets (updated)")
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key, limit, window, now):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens = float(limit) if row is None else self._refill(row[0], row[1], limit, window, now)
+            allowed = tokens >= 1.0
+            if allowed:
+                tokens -= 1.0
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, updated, window) VALUES (?, ?, ?, ?)",
+                (key, tokens, now, window),
+            )
+
+            with self._hits_lock:
+                self._hits += 1
+                purge = self._hits % self.purge_every == 0
+            if purge:
+                conn.execute("DELETE FROM buckets WHERE ? - updated >= window", (now,))
+                conn.execute(
+                    "DELETE FROM buckets WHERE key IN "
+                    "(SELECT key FROM buckets ORDER BY updated DESC LIMIT -1 OFFSET ?)",
+                    (self.max_keys,),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed
+
+
+def backend_from_env():
+    """SQLiteBackend when LAMINA_RATE_LIMIT_DB is set (shared across workers), else MemoryBackend."""
+    path = os.environ.get("LAMINA_RATE_LIMIT_DB")
+    if path:
+        return SQLiteBackend(path)
+    return MemoryBackend()
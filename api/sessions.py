@@ -0,0 +1,195 @@
+import threading
+import time
+
+from api.config import env_int
+from api.ratelimit import MemoryBackend
+from lamina.clt import Laminate
+from lamina.failure import FailureCriterion
+
+SESSION_OUTPUTS = ("abd", "properties", "polar", "envelope")
+
+
+class DesignSession:
+    """
+    Server-side state of one interactive design session.
+
+    Keeps the base stack (before mirroring), the Laminate built from it and the outputs
+    last sent to the client. Ply angle edits update the laminate incrementally
+    (Laminate.set_angles); each reply only carries outputs whose values changed.
+    """
+    # Full rebuild after this many incremental edits to bound floating-point drift
+    REBUILD_EVERY = 256
+
+    def __init__(self, material, stack, thickness=0.125e-3, symmetry=False, limits=None,
+                 outputs=SESSION_OUTPUTS, max_plies=200):
+        """
+        Args:
+            material (Material): Ply material.
+            stack (list): Ply angles in degrees, before mirroring.
+            thickness (float): Ply thickness (m).
+            symmetry (bool): Mirror the stack.
+            limits (dict): Strength limits; the envelope is only produced when set.
+            outputs (list): Outputs pushed to the client (see SESSION_OUTPUTS).
+            max_plies (int): Largest base stack allowed.
+        """
+        self.material = material
+        self.stack = list(stack)
+        self.thickness = thickness
+        self.symmetry = symmetry
+        self.limits = limits
+        self.outputs = list(outputs)
+        self.max_plies = max_plies
+        self._sent = {}
+        self._dirty = set(SESSION_OUTPUTS)
+        self._rebuild()
+
+    def _rebuild(self):
+        self.laminate = Laminate(self.material, list(self.stack), self.thickness, self.symmetry)
+        self._edits = 0
+        self._dirty.update(SESSION_OUTPUTS)
+
+    def _check_index(self, index, size):
+        if not -size <= index < size:
+            raise ValueError(f'Ply index out of range (0 to {size - 1})')
+        return index % size
+
+    def set_ply(self, index, angle):
+        n = len(self.stack)
+        index = self._check_index(index, n)
+        self.stack[index] = angle
+        if self._edits >= self.REBUILD_EVERY:
+            self._rebuild()
+            return
+
+        indices = [index]
+        if self.symmetry:
+            indices.append(2 * n - 1 - index)
+        self.laminate.set_angles(indices, [angle] * len(indices))
+        self._edits += 1
+        self._dirty.update(SESSION_OUTPUTS)
+
+    def insert_ply(self, index, angle):
+        if len(self.stack) >= self.max_plies:
+            raise ValueError(f'Stack too large (max {self.max_plies} plies)')
+        if index is None:
+            index = len(self.stack)
+        else:
+            index = self._check_index(index, len(self.stack) + 1)
+        # Insertions shift every ply above them, so the laminate is rebuilt
+        self.stack.insert(index, angle)
+        self._rebuild()
+
+    def remove_ply(self, index):
+        if len(self.stack) == 1:
+            raise ValueError('Stack cannot be empty')
+        del self.stack[self._check_index(index, len(self.stack))]
+        self._rebuild()
+
+    def set_material(self, material):
+        self.material = material
+        self._rebuild()
+
+    def set_thickness(self, thickness):
+        self.thickness = thickness
+        self._rebuild()
+
+    def set_symmetry(self, symmetry):
+        self.symmetry = symmetry
+        self._rebuild()
+
+    def set_limits(self, limits):
+        self.limits = limits
+        self._dirty.add("envelope")
+
+    def set_outputs(self, outputs):
+        self.outputs = list(outputs)
+        # Outputs re-enabled later may be stale on the client
+        for name in list(self._sent):
+            if name not in self.outputs:
+                del self._sent[name]
+
+    def _compute(self, name):
+        lam = self.laminate
+        if name == "abd":
+            return lam.ABD.tolist()
+        if name == "properties":
+            return {key: float(value) for key, value in lam.properties().items()}
+        if name == "polar":
+            return lam.polar_stiffness().data
+        if self.limits is None:
+            return None
+        return FailureCriterion.tsai_wu(lam, self.limits).data
+
+    def changes(self):
+        """
+        Returns:
+            dict: Requested outputs whose value differs from what was last returned.
+        """
+        changed = {}
+        for name in self.outputs:
+            if name in self._sent and name not in self._dirty:
+                continue
+            value = self._compute(name)
+            if name not in self._sent or self._sent[name] != value:
+                self._sent[name] = value
+                changed[name] = value
+        self._dirty.clear()
+        return changed
+
+    def state(self):
+        return {
+            "stack": list(self.stack),
+            "symmetry": self.symmetry,
+            "thickness": self.thickness,
+            "plies": len(self.laminate.stack),
+        }
+
+
+class SessionRegistry:
+    """
+    Caps the number of concurrent design sessions and the message rate of each.
+
+    Sessions live as long as their WebSocket; idle connections are closed after
+    `idle_timeout` seconds by the endpoint, which frees their slot. Each session may send
+    `message_limit` messages per `message_window` seconds (a token bucket, see
+    message_bucket); RateLimitMiddleware only sees the HTTP upgrade, not the messages.
+    """
+    def __init__(self, max_sessions=100, idle_timeout=300, message_limit=30, message_window=1):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.message_limit = message_limit
+        self.message_window = message_window
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self._active >= self.max_sessions:
+                return False
+            self._active += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self._active -= 1
+
+    @property
+    def active(self):
+        return self._active
+
+    def message_bucket(self):
+        """
+        Returns:
+            callable: take() for a new session: takes a token and returns False when the
+            session has exceeded its message rate.
+        """
+        bucket = MemoryBackend(max_keys=1)
+        return lambda: bucket.hit("session", self.message_limit, self.message_window, time.monotonic())
+
+
+sessions = SessionRegistry(
+    max_sessions=env_int("LAMINA_MAX_SESSIONS", 100),
+    idle_timeout=env_int("LAMINA_SESSION_IDLE", 300),
+    message_limit=env_int("LAMINA_SESSION_MESSAGES", 30),
+    message_window=env_int("LAMINA_SESSION_WINDOW", 1),
+)
@@ -0,0 +1,100 @@
+"""
+Microbenchmark of per-request middleware overhead.
+
+Calls the ASGI apps directly (no sockets or HTTP client) so the numbers isolate the
+cost of the middleware stack around a trivial endpoint.
+
+Usage:
+    python -m benchmarks.bench_middleware [iterations]
+"""
+import asyncio
+import sys
+import time
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from api.middleware import SecurityHeadersMiddleware, RateLimitMiddleware, PayloadSizeLimitMiddleware
+from api.metrics import MetricsMiddleware
+
+
+class _PassthroughHTTPMiddleware(BaseHTTPMiddleware):
+    """Reference: the cost of an empty BaseHTTPMiddleware layer."""
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+def _build(*middleware):
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    for cls, kwargs in middleware:
+        app.add_middleware(cls, **kwargs)
+    return app
+
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/ping",
+    "raw_path": b"/ping",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"bench")],
+    "client": ("127.0.0.1", 1234),
+    "server": ("bench", 80),
+}
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message):
+    pass
+
+
+async def _run(app, n):
+    # Warm up routing and lazy imports
+    for _ in range(100):
+        await app(dict(SCOPE), _receive, _send)
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(dict(SCOPE), _receive, _send)
+    return (time.perf_counter() - start) / n
+
+
+def main(n=5000):
+    limit = {"limit": 10 ** 9, "window": 60}
+    configs = [
+        ("no middleware", _build()),
+        ("BaseHTTPMiddleware passthrough x2", _build((_PassthroughHTTPMiddleware, {}), (_PassthroughHTTPMiddleware, {}))),
+        ("lamina stack (payload, rate limit, security)", _build(
+            (PayloadSizeLimitMiddleware, {"limit": 1048576}),
+            (RateLimitMiddleware, limit),
+            (SecurityHeadersMiddleware, {}),
+        )),
+        ("lamina stack + metrics", _build(
+            (PayloadSizeLimitMiddleware, {"limit": 1048576}),
+            (RateLimitMiddleware, limit),
+            (SecurityHeadersMiddleware, {}),
+            (MetricsMiddleware, {}),
+        )),
+    ]
+
+    baseline = None
+    for name, app in configs:
+        per_request = asyncio.run(_run(app, n))
+        if baseline is None:
+            baseline = per_request
+        print(f"{name:48s} {per_request * 1e6:8.1f} us/request  (+{(per_request - baseline) * 1e6:6.1f} us)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,302 @@
+"""
+Load test for the API: replays a mix of requests and reports throughput, latency
+percentiles, error and 429 rates.
+
+The app runs either in-process (ASGI, no sockets) or under uvicorn in a subprocess;
+--url targets a server that is already running. Requests carry an X-Lamina-Exempt token
+so the rate limiter lets them through (pass --respect-rate-limit to measure it instead).
+Against --url that only works if the server was started with the same
+LAMINA_RATE_LIMIT_EXEMPT_TOKEN (--token).
+
+Load is either closed-loop (--concurrency clients sending back to back) or open-loop
+(--rate requests per second). In open-loop mode latency is measured from the scheduled
+send time, so a saturated server shows up as queueing delay rather than a lower rate.
+
+Recordings are JSON lines of {"path": ..., "body": {...}} (optionally "method"); they
+replace the generated payloads.
+
+Usage:
+    python -m benchmarks.loadtest --concurrency 16 --duration 10
+    python -m benchmarks.loadtest --server uvicorn --rate 200 --mix calculate=6,polar=3,failure=1
+    python -m benchmarks.loadtest --replay recorded.jsonl --requests 5000 --output report.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import secrets
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+MATERIAL = {"E1": 140e9, "E2": 10e9, "G12": 5e9, "v12": 0.3, "name": "Carbon/Epoxy"}
+LIMITS = {"xt": 1500e6, "xc": 1200e6, "yt": 50e6, "yc": 250e6, "s": 70e6}
+ROUTES = {"calculate": "/api/calculate", "polar": "/api/polar", "failure": "/api/failure"}
+
+
+def parse_mix(text):
+    """"calculate=6,polar=3,failure=1" -> {"calculate": 6.0, ...}"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ROUTES:
+            raise ValueError(f"Unknown route in mix: {name} (expected one of {', '.join(ROUTES)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def generate_requests(mix, distinct, max_plies, seed=0):
+    """
+    Builds a pool of `distinct` payloads per route in the mix; the pool size sets how often
+    the result cache can answer. Returns (requests, weights) with requests as (method, path, body).
+    """
+    rng = random.Random(seed)
+    requests, weights = [], []
+    for name, weight in mix.items():
+        for _ in range(distinct):
+            laminate = {
+                "material": MATERIAL,
+                "stack": [rng.choice((0, 45, -45, 90)) for _ in range(rng.randint(2, max_plies))],
+                "symmetry": rng.random() < 0.5,
+            }
+            body = {"laminate": laminate, "limits": LIMITS} if name == "failure" else laminate
+            requests.append(("POST", ROUTES[name], json.dumps(body).encode()))
+            weights.append(weight / distinct)
+    return requests, weights
+
+
+def load_recording(path):
+    requests = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                body = record.get("body")
+                requests.append((
+                    record.get("method", "POST" if body is not None else "GET"),
+                    record["path"],
+                    json.dumps(body).encode() if body is not None else None,
+                ))
+    return requests, [1.0] * len(requests)
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(samples, elapsed):
+    """
+    Args:
+        samples (list): (status, latency seconds); status 0 for transport errors.
+        elapsed (float): Wall time of the run.
+    """
+    total = len(samples)
+    statuses = {}
+    for status, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    latencies = sorted(latency for status, latency in samples if 200 <= status < 300)
+    rate_limited = statuses.get("429", 0)
+    errors = sum(count for status, count in statuses.items() if not 200 <= int(status) < 300) - rate_limited
+    return {
+        "requests": total,
+        "elapsed": elapsed,
+        "throughput": total / elapsed if elapsed > 0 else 0.0,
+        "latency": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else None,
+        },
+        "error_rate": errors / total if total else 0.0,
+        "rate_limited_rate": rate_limited / total if total else 0.0,
+        "statuses": statuses,
+    }
+
+
+async def run_load(client, requests, weights, headers, concurrency=8, rate=None,
+                   duration=10.0, max_requests=None, seed=0):
+    """Sends requests until `duration` seconds or `max_requests` have passed; returns the summary."""
+    rng = random.Random(seed)
+    samples = []
+    start = time.perf_counter()
+    deadline = start + duration
+    sent = 0
+
+    def next_request():
+        nonlocal sent
+        if (max_requests is not None and sent >= max_requests) or time.perf_counter() >= deadline:
+            return None
+        sent += 1
+        return rng.choices(requests, weights)[0]
+
+    async def send(request, t0):
+        method, path, body = request
+        try:
+            response = await client.request(method, path, content=body, headers=headers)
+            await response.aread()
+            status = response.status_code
+        except httpx.HTTPError:
+            status = 0
+        samples.append((status, time.perf_counter() - t0))
+
+    if rate is None:
+        async def worker():
+            while (request := next_request()) is not None:
+                await send(request, time.perf_counter())
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    else:
+        # Open loop: request i is due at start + i / rate, whether or not earlier ones finished.
+        # `concurrency` still caps requests in flight (as a client connection pool would).
+        slots = asyncio.Semaphore(concurrency)
+        tasks = []
+        i = 0
+
+        async def scheduled(request, due):
+            async with slots:
+                await send(request, due)
+
+        while (request := next_request()) is not None:
+            due = start + i / rate
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(scheduled(request, due)))
+            i += 1
+        await asyncio.gather(*tasks)
+
+    return summarize(samples, time.perf_counter() - start)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_uvicorn(token, workers=1):
+    """Starts the app under uvicorn on a free local port and waits until it answers."""
+    port = _free_port()
+    env = dict(os.environ, LAMINA_RATE_LIMIT_EXEMPT_TOKEN=token)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.index:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            httpx.get(url + "/", timeout=1.0)
+            return process, url
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn did not start within 60 s")
+
+
+def _format_ms(seconds):
+    return "-" if seconds is None else f"{seconds * 1e3:.1f} ms"
+
+
+def report(summary, out=sys.stdout):
+    lat = summary["latency"]
+    print(f"requests     {summary['requests']} in {summary['elapsed']:.1f} s", file=out)
+    print(f"throughput   {summary['throughput']:.1f} req/s", file=out)
+    print(f"latency      p50 {_format_ms(lat['p50'])}  p95 {_format_ms(lat['p95'])}  "
+          f"p99 {_format_ms(lat['p99'])}  max {_format_ms(lat['max'])}", file=out)
+    print(f"errors       {summary['error_rate']:.2%}", file=out)
+    print(f"429s         {summary['rate_limited_rate']:.2%}", file=out)
+    print(f"statuses     {summary['statuses']}", file=out)
+
+
+async def _main(args):
+    token = args.token or secrets.token_hex(16)
+    headers = {"content-type": "application/json"}
+    if not args.respect_rate_limit:
+        headers["x-lamina-exempt"] = token
+
+    if args.replay:
+        requests, weights = load_recording(args.replay)
+    else:
+        requests, weights = generate_requests(parse_mix(args.mix), args.distinct, args.max_plies, args.seed)
+
+    process = None
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    elif args.server == "uvicorn":
+        process, url = start_uvicorn(token, args.workers)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        client = httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits)
+    else:
+        # The app reads the exemption token when it is imported
+        os.environ["LAMINA_RATE_LIMIT_EXEMPT_TOKEN"] = token
+        from api.index import app
+        from api.executor import executor
+        executor.start()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest",
+                                   timeout=args.timeout)
+    try:
+        async with client:
+            if args.warmup > 0:
+                # Lets worker processes, connections and caches settle; not reported
+                await run_load(client, requests, weights, headers, concurrency=args.concurrency,
+                               duration=args.warmup, seed=args.seed + 1)
+            return await run_load(
+                client, requests, weights, headers, concurrency=args.concurrency, rate=args.rate,
+                duration=args.duration, max_requests=args.requests, seed=args.seed,
+            )
+    finally:
+        if process is not None:
+            # SIGINT runs the app's shutdown (stopping its compute pool) before exiting
+            process.send_signal(signal.SIGINT)
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--server", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--url", help="target an already running server instead")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--mix", default="calculate=6,polar=3,failure=1", help="route weights")
+    parser.add_argument("--replay", help="JSON lines recording to replay instead of the generated mix")
+    parser.add_argument("--distinct", type=int, default=50, help="distinct payloads per route")
+    parser.add_argument("--max-plies", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, help="open-loop target rate (req/s)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--requests", type=int, help="stop after this many requests")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds of unreported closed-loop load first")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--token", help="rate limiter exemption token (default: random)")
+    parser.add_argument("--respect-rate-limit", action="store_true", help="do not send the exemption token")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the summary to this JSON file")
+    args = parser.parse_args(argv)
+    if args.url and not args.token and not args.respect_rate_limit:
+        parser.error("--url needs the server's --token, or --respect-rate-limit")
+
+    summary = asyncio.run(_main(args))
+    report(summary)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+    return 1 if summary["requests"] == 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
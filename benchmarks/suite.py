@@ -0,0 +1,333 @@
+"""
+Benchmark suite for the CLT kernels, failure envelopes, the optimizer and the API.
+
+Each benchmark is timed in several repeats of an auto-calibrated number of loops and
+reported per operation (median and best of the repeats). Results can be written as JSON
+and compared against a stored baseline: any benchmark whose median is slower than the
+baseline by more than the threshold is reported and makes the run exit with status 1.
+
+Baselines are machine-specific; record one on the machine that runs the comparison.
+
+Usage:
+    python -m benchmarks.suite [--quick] [--filter TEXT] [--output results.json]
+    python -m benchmarks.suite --save-baseline            # writes benchmarks/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json [--threshold 0.25]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from lamina.materials import CarbonEpoxy
+from lamina.clt import Laminate
+from lamina.failure import FailureCriterion
+from lamina.buckling import BucklingAnalysis
+from lamina.optimization import GeneticAlgorithm, calculate_safety_factor
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+PLIES = (4, 16, 64, 200)
+POINTS = (72, 1000, 10000)
+# Smallest and largest sizes only, for quick checks
+QUICK_PLIES = (4, 200)
+QUICK_POINTS = (72, 10000)
+
+LIMITS = {'xt': 1500e6, 'xc': 1200e6, 'yt': 50e6, 'yc': 250e6, 's': 70e6}
+LOAD = {'Nx': 100e3, 'Ny': 20e3, 'Nxy': 5e3}
+MATERIAL_JSON = {"E1": 140e9, "E2": 10e9, "G12": 5e9, "v12": 0.3, "name": "Carbon/Epoxy"}
+
+BENCHMARKS = []
+
+
+def benchmark(name, ops=1, **grid):
+    """
+    Registers `setup(**params) -> callable` for every combination of the grid values.
+
+    Each grid entry maps a parameter to (full values, quick values). `ops` is the number
+    of operations one call of the returned callable performs.
+    """
+    def register(setup):
+        BENCHMARKS.append((name, setup, ops, grid))
+        return setup
+    return register
+
+
+def _stack(plies):
+    return [(0, 45, -45, 90)[i % 4] for i in range(plies)]
+
+
+def _laminate(plies):
+    return Laminate(CarbonEpoxy(), _stack(plies))
+
+
+@benchmark("laminate_init", plies=(PLIES, QUICK_PLIES))
+def _laminate_init(plies):
+    material = CarbonEpoxy()
+    stack = _stack(plies)
+    # Laminates build on first access: read ABD so the build is timed, not just the constructor
+    return lambda: Laminate(material, stack).ABD
+
+
+@benchmark("laminate_update", plies=(PLIES, QUICK_PLIES))
+def _laminate_update(plies):
+    return _laminate(plies).update
+
+
+@benchmark("abd_inverse", plies=(PLIES, QUICK_PLIES))
+def _abd_inverse(plies):
+    lam = _laminate(plies)
+
+    def run():
+        lam._abd = None
+        return lam.abd
+    return run
+
+
+@benchmark("polar_stiffness", plies=(PLIES, QUICK_PLIES))
+def _polar_stiffness(plies):
+    return _laminate(plies).polar_stiffness
+
+
+def _envelope(criterion):
+    def setup(plies, points):
+        lam = _laminate(plies)
+        evaluate = getattr(FailureCriterion, criterion)
+        return lambda: evaluate(lam, LIMITS, num_points=points)
+    return setup
+
+
+for _criterion in ("tsai_wu", "tsai_hill", "max_stress"):
+    benchmark(f"envelope_{_criterion}", plies=(PLIES, QUICK_PLIES), points=(POINTS, QUICK_POINTS))(_envelope(_criterion))
+
+
+@benchmark("safety_factor", plies=(PLIES, QUICK_PLIES))
+def _safety_factor(plies):
+    lam = _laminate(plies)
+    return lambda: calculate_safety_factor(lam, LOAD, LIMITS)
+
+
+@benchmark("buckling_critical_load", plies=(PLIES, QUICK_PLIES))
+def _buckling(plies):
+    lam = Laminate(CarbonEpoxy(), _stack(plies // 2 or 1), symmetry=True)
+    return lambda: BucklingAnalysis.critical_load(lam, 0.5, 0.3, m_max=10)
+
+
+@benchmark("ga_optimize")
+def _ga():
+    constraints = {'safety_factor': 1.2, 'limits': LIMITS}
+
+    def run():
+        # Same seed every call: every repeat performs the same search
+        random.seed(1234)
+        ga = GeneticAlgorithm(CarbonEpoxy(), {'Nx': 1000e3, 'Ny': 0, 'Nxy': 0}, constraints,
+                              population_size=10, generations=5)
+        return ga.optimize(min_plies=4, max_plies=32)
+    return run
+
+
+API_REQUESTS = 50
+
+
+def _api_client(path, bodies):
+    """
+    Calls the full ASGI app (middleware included) in-process, API_REQUESTS requests per call.
+
+    Requests come from rotating client addresses so the rate limiter never rejects them.
+    """
+    from api.index import app
+
+    loop = asyncio.new_event_loop()
+    counter = itertools.count()
+
+    async def request(body):
+        i = next(counter)
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "POST", "scheme": "http", "path": path, "raw_path": path.encode(),
+            "root_path": "", "query_string": b"",
+            "headers": [(b"host", b"bench"), (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode())],
+            "client": (f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}", 1234),
+            "server": ("bench", 80),
+        }
+        status = None
+
+        async def receive():
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        await app(scope, receive, send)
+        if status != 200:
+            raise RuntimeError(f"{path} returned {status}")
+
+    async def batch():
+        for _ in range(API_REQUESTS):
+            await request(next(bodies))
+
+    return lambda: loop.run_until_complete(batch())
+
+
+@benchmark("api_calculate_cached", ops=API_REQUESTS)
+def _api_calculate_cached():
+    body = json.dumps({"material": MATERIAL_JSON, "stack": _stack(16), "symmetry": True}).encode()
+    return _api_client("/api/calculate", itertools.repeat(body))
+
+
+@benchmark("api_calculate_uncached", ops=API_REQUESTS, plies=(PLIES, QUICK_PLIES))
+def _api_calculate_uncached(plies):
+    # A different thickness per request defeats the result cache
+    bodies = (
+        json.dumps({"material": MATERIAL_JSON, "stack": _stack(plies), "thickness": 1e-4 + i * 1e-12}).encode()
+        for i in itertools.count()
+    )
+    return _api_client("/api/calculate", bodies)
+
+
+@benchmark("api_failure_uncached", ops=API_REQUESTS, plies=(PLIES, QUICK_PLIES))
+def _api_failure_uncached(plies):
+    bodies = (
+        json.dumps({
+            "laminate": {"material": MATERIAL_JSON, "stack": _stack(plies), "thickness": 1e-4 + i * 1e-12},
+            "limits": LIMITS,
+        }).encode()
+        for i in itertools.count()
+    )
+    return _api_client("/api/failure", bodies)
+
+
+def _cases(quick, pattern):
+    for name, setup, ops, grid in BENCHMARKS:
+        keys = list(grid)
+        values = [grid[key][1 if quick else 0] for key in keys]
+        for combo in itertools.product(*values):
+            params = dict(zip(keys, combo))
+            label = name + ("[" + ",".join(f"{k}={v}" for k, v in params.items()) + "]" if params else "")
+            if pattern and pattern not in label:
+                continue
+            yield label, setup, ops, params
+
+
+def measure(fn, ops=1, repeats=5, min_time=0.1):
+    """
+    Returns:
+        dict: Seconds per operation {"median", "min"} over `repeats` repeats, and the
+        number of loops per repeat (calibrated so a repeat lasts at least `min_time`).
+    """
+    fn()  # warm-up: lazy imports, caches, allocator
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= max(2, min(10, int(min_time / max(elapsed, 1e-9)) + 1))
+
+    times = [elapsed / (loops * ops)]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        times.append((time.perf_counter() - start) / (loops * ops))
+    return {"median": statistics.median(times), "min": min(times), "loops": loops}
+
+
+def run(quick=False, pattern=None, repeats=5, min_time=0.1, out=sys.stdout):
+    results = {}
+    for label, setup, ops, params in _cases(quick, pattern):
+        result = measure(setup(**params), ops, repeats, min_time)
+        results[label] = result
+        print(f"{label:52s} {_format(result['median']):>10s}  (min {_format(result['min'])})", file=out)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Returns:
+        list: (name, baseline median, current median) for benchmarks slower than
+        baseline * (1 + threshold). Benchmarks missing from either side are skipped.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is not None and result["median"] > base["median"] * (1 + threshold):
+            regressions.append((name, base["median"], result["median"]))
+    return regressions
+
+
+def _format(seconds):
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} us"
+
+
+def _metadata():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--quick", action="store_true", help="smallest and largest sizes only")
+    parser.add_argument("--filter", help="only benchmarks whose name contains this text")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.1, help="minimum seconds per repeat")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON file (default: benchmarks/baseline.json if present)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, as a fraction (default 0.25)")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run(args.quick, args.filter, args.repeats, args.min_time)
+    document = {"meta": _metadata(), "results": results}
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+    baseline_path = args.baseline or DEFAULT_BASELINE
+    if args.save_baseline:
+        # Merge so a filtered run only replaces the benchmarks it measured
+        if os.path.exists(baseline_path):
+            with open(baseline_path) as f:
+                stored = json.load(f)
+            document["results"] = {**stored.get("results", {}), **results}
+        with open(baseline_path, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"Baseline written to {baseline_path}")
+        return 0
+
+    if args.baseline is None and not os.path.exists(baseline_path):
+        return 0
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.threshold)
+    for name, before, after in regressions:
+        print(f"REGRESSION {name}: {_format(before)} -> {_format(after)} (+{(after / before - 1) * 100:.0f}%)")
+    if regressions:
+        return 1
+    print(f"No regressions beyond {args.threshold:.0%} against {baseline_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,3 +3,6 @@ from .clt import Laminate, PolarResult
 from .failure import FailureCriterion, Envelope
 from .buckling import BucklingAnalysis
 from .optimization import GeneticAlgorithm
+from .constraints import ManufacturingRules
+from .surrogate import QuadraticSurrogate, lamination_parameters
+from .profiling import profile
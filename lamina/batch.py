@@ -0,0 +1,217 @@
+import numpy as np
+from lamina import metrics
+from lamina.clt import _Q_bar_from_invariants, _polar_moduli
+from lamina.optimization import _tsai_wu_coefficients, _tsai_wu_roots
+
+
+class LaminateBatch:
+    """
+    Many laminates evaluated together in one vectorized pass.
+
+    Plies of all laminates are concatenated into flat arrays and per-laminate sums use
+    np.add.reduceat, so laminates may differ in ply count, ply thickness and material.
+    Results match Laminate item by item.
+
+    With `rules`, the stacks are checked (and optionally repaired) against the
+    manufacturing rules before the stiffness pass; `violations` lists the rules each
+    laminate still breaks, so callers can drop infeasible designs (see
+    ManufacturingRules.check_stacks to filter before building a batch).
+    """
+    def __init__(self, materials, stacks, thickness=0.125e-3, symmetry=False, rules=None, repair=False):
+        """
+        Args:
+            materials (Material or list): One material for all laminates, or one per laminate.
+            stacks (list): List of ply angle lists in degrees.
+            thickness (float or list): Ply thickness (m), shared or per laminate.
+            symmetry (bool or list): Mirror the stacks, shared or per laminate.
+            rules (ManufacturingRules): Optional stacking rules, applied to the stacks as
+                given (half-stacks where symmetric).
+            repair (bool): Repair stacks against `rules` before evaluating them.
+        """
+        m = len(stacks)
+        if isinstance(materials, (list, tuple)):
+            if len(materials) != m:
+                raise ValueError("Need one material per laminate")
+            self.materials = list(materials)
+        else:
+            self.materials = [materials] * m
+        thickness = np.broadcast_to(np.asarray(thickness, dtype=np.float64), (m,))
+        symmetry = np.broadcast_to(np.asarray(symmetry, dtype=bool), (m,))
+
+        self.violations = None
+        if rules is not None:
+            stacks, self.violations = rules.check_stacks(stacks, symmetry, repair)
+
+        self.stacks = [list(st) + list(st)[::-1] if sym else list(st) for st, sym in zip(stacks, symmetry)]
+        counts = np.array([len(st) for st in self.stacks], dtype=np.intp)
+        if m == 0 or (counts == 0).any():
+            raise ValueError("Stacks cannot be empty")
+
+        self.n_laminates = m
+        self.n_plies = counts
+        self.ply_thickness = thickness.copy()
+        self.total_thickness = counts * thickness
+        self.offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        self.owner = np.repeat(np.arange(m), counts)
+
+        angles = np.concatenate([np.asarray(st, dtype=np.float64) for st in self.stacks])
+        rads = np.radians(angles)
+        self.c = np.cos(rads)
+        self.s = np.sin(rads)
+        self.c2 = self.c * self.c
+        self.s2 = self.s * self.s
+        self.cs = self.c * self.s
+
+        # Ply interfaces relative to each laminate's own mid-plane
+        local = np.arange(len(angles)) - self.offsets[self.owner]
+        t = thickness[self.owner]
+        zk_1 = local * t - self.total_thickness[self.owner] / 2
+        zk = zk_1 + t
+        self.z_mids = (zk + zk_1) / 2.0
+
+        # Per-ply invariants, shared through a lookup when materials repeat
+        mat_ids = {}
+        mat_index = np.array([mat_ids.setdefault(id(mat), len(mat_ids)) for mat in self.materials])
+        unique = {idx: mat for mat, idx in zip(self.materials, mat_index)}
+        U = np.array([unique[i].invariants for i in range(len(unique))]).T # (5, n_materials)
+        Q = np.array([unique[i].Q() for i in range(len(unique))])
+        self._ply_material = mat_index[self.owner]
+        self._Q = Q
+
+        Q_bars_flat = _Q_bar_from_invariants(U[:, self._ply_material], self.c2, self.s2, self.cs)
+
+        h = zk - zk_1
+        sum_z = zk + zk_1
+        h2 = h * sum_z
+        h3 = h * (sum_z * sum_z - zk * zk_1)
+
+        A_flat = np.add.reduceat(Q_bars_flat * h, self.offsets, axis=1)
+        B_flat = np.add.reduceat(Q_bars_flat * h2, self.offsets, axis=1)
+        B_flat *= 0.5
+        D_flat = np.add.reduceat(Q_bars_flat * h3, self.offsets, axis=1)
+        D_flat *= (1/3)
+
+        self.A = A_flat.T.reshape(m, 3, 3)
+        self.B = B_flat.T.reshape(m, 3, 3)
+        self.D = D_flat.T.reshape(m, 3, 3)
+
+        self.ABD = np.empty((m, 6, 6))
+        self.ABD[:, :3, :3] = self.A
+        self.ABD[:, :3, 3:] = self.B
+        self.ABD[:, 3:, :3] = self.B
+        self.ABD[:, 3:, 3:] = self.D
+
+        self._abd = None
+        metrics.incr("laminate_builds", m)
+
+    @property
+    def abd(self):
+        """Lazy evaluation of the compliance matrices (singular laminates get zeros, as in Laminate)."""
+        if self._abd is None:
+            metrics.incr("abd_inversions", self.n_laminates)
+            try:
+                self._abd = np.linalg.inv(self.ABD)
+            except np.linalg.LinAlgError:
+                self._abd = np.zeros_like(self.ABD)
+                for i, ABD in enumerate(self.ABD):
+                    try:
+                        self._abd[i] = np.linalg.inv(ABD)
+                    except np.linalg.LinAlgError:
+                        pass
+        return self._abd
+
+    def properties(self):
+        """Returns equivalent engineering constants for every laminate."""
+        h = self.total_thickness
+        a = self.abd[:, :3, :3]
+        a00, a11, a22, a01 = a[:, 0, 0], a[:, 1, 1], a[:, 2, 2], a[:, 0, 1]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            Ex = np.where(a00 != 0, 1 / (h * a00), 0)
+            Ey = np.where(a11 != 0, 1 / (h * a11), 0)
+            Gxy = np.where(a22 != 0, 1 / (h * a22), 0)
+            vxy = np.where(a00 != 0, -a01 / a00, 0)
+
+        return [
+            {"Ex": ex, "Ey": ey, "Gxy": gxy, "vxy": v}
+            for ex, ey, gxy, v in zip(Ex.tolist(), Ey.tolist(), Gxy.tolist(), vxy.tolist())
+        ]
+
+    def polar_stiffness(self, step=10):
+        """
+        Returns:
+            list: For each laminate, the same list of dicts as Laminate.polar_stiffness().data.
+        """
+        angles = np.arange(0, 360, step)
+        Ex, Ey, Gxy = _polar_moduli(self.abd[:, :3, :3], self.total_thickness, angles)
+
+        angles_list = angles.tolist()
+        return [
+            [
+                {"angle": a, "Ex": ex, "Ey": ey, "Gxy": gxy}
+                for a, ex, ey, gxy in zip(angles_list, ex_row, ey_row, gxy_row)
+            ]
+            for ex_row, ey_row, gxy_row in zip(Ex.tolist(), Ey.tolist(), Gxy.tolist())
+        ]
+
+    def tsai_wu(self, limits, num_points=72):
+        """
+        Tsai-Wu failure envelopes for every laminate.
+
+        Args:
+            limits (dict or list): Strength limits, shared or one dict per laminate.
+            num_points (int): Number of load directions.
+
+        Returns:
+            list: For each laminate, the same list of (sigma_x, sigma_y) as FailureCriterion.tsai_wu().data.
+        """
+        m = self.n_laminates
+        metrics.incr("failure_evaluations", m)
+        if isinstance(limits, dict):
+            limits = [limits] * m
+        coeffs = np.array([_tsai_wu_coefficients(lim) for lim in limits]).T[:, self.owner, np.newaxis]
+        F1, F2, F11, F22, F66, F12 = coeffs
+
+        angles = np.arange(num_points, dtype=np.float64) * (2 * np.pi / max(1, num_points - 1))
+        sx_unit = np.cos(angles)
+        sy_unit = np.sin(angles)
+
+        # strain_curvature: (m, 6, n_angles) from the first two compliance columns
+        NM = np.stack([np.outer(self.total_thickness, sx_unit), np.outer(self.total_thickness, sy_unit)], axis=1)
+        strain_curvature = self.abd[:, :, :2] @ NM
+        eps = strain_curvature[self.owner, :3, :]
+        eps += self.z_mids[:, np.newaxis, np.newaxis] * strain_curvature[self.owner, 3:, :]
+
+        # Local strains and stresses for every ply and direction
+        c2 = self.c2[:, np.newaxis]
+        s2 = self.s2[:, np.newaxis]
+        cs = self.cs[:, np.newaxis]
+        ex, ey, gxy = eps[:, 0], eps[:, 1], eps[:, 2]
+        e1 = c2 * ex + s2 * ey + cs * gxy
+        e2 = ex + ey - e1
+        g12 = 2*cs * (ey - ex) + (c2 - s2) * gxy
+
+        Q = self._Q[self._ply_material]
+        s1 = Q[:, 0, 0, np.newaxis] * e1 + Q[:, 0, 1, np.newaxis] * e2
+        s2_ = Q[:, 0, 1, np.newaxis] * e1 + Q[:, 1, 1, np.newaxis] * e2
+        t12 = Q[:, 2, 2, np.newaxis] * g12
+
+        A = s1 * s1
+        A *= F11
+        A += F22 * (s2_ * s2_)
+        A += F66 * (t12 * t12)
+        A += (2 * F12) * (s1 * s2_)
+
+        B = F1 * s1
+        B += F2 * s2_
+
+        f_all = _tsai_wu_roots(A, B)
+        min_factor = np.minimum.reduceat(f_all, self.offsets, axis=0)
+
+        envelopes = []
+        for row in min_factor:
+            valid = row != np.inf
+            final_sx = sx_unit[valid] * row[valid]
+            final_sy = sy_unit[valid] * row[valid]
+            envelopes.append(list(zip(final_sx.tolist(), final_sy.tolist())))
+        return envelopes
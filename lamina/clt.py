@@ -1,6 +1,12 @@
+import math
+from itertools import chain
 import numpy as np
-import matplotlib.pyplot as plt
 from lamina.materials import Material
+from lamina import metrics, plotting
+
+# Laminates with up to this many plies are built with plain float arithmetic: below it,
+# the fixed cost of creating dozens of small NumPy temporaries outweighs the arithmetic
+SCALAR_PLY_LIMIT = 16
 
 def _get_transformation_matrices(angle_deg):
     """
@@ -78,25 +84,198 @@ def _transform_stiffness(Q, angle_deg):
     T_sigma, T_epsilon_inv = _get_transformation_matrices(angle_deg)
     return _apply_transformation(Q, T_sigma, T_epsilon_inv)
 
+def _Q_bar_from_invariants(invariants, c2, s2, cs):
+    """
+    Flattened transformed stiffness Q_bar (9, n) from Tsai-Pagano invariants and trig values.
+    Invariants may be scalars or per-ply arrays (used by LaminateBatch for mixed materials).
+    """
+    U1, U2, U3, U4, U5 = invariants
+
+    # Calculate double angles from pre-squared trig values
+    # Optimization: Pre-compute repetitive array multiplications to reduce allocation overhead
+    cos2 = c2 - s2
+    sin2 = cs * 2.0
+
+    cos4 = cos2*cos2
+    cos4 -= sin2*sin2
+
+    sin4 = cos2 * sin2
+    sin4 *= 2.0
+
+    U2_cos2 = cos2 * U2
+    U3_cos4 = cos4 * U3
+    half_U2_sin2 = sin2 * (0.5 * U2)
+    U3_sin4 = sin4 * U3
+
+    Q_bar_11 = U1 + U2_cos2 + U3_cos4
+    Q_bar_12 = U4 - U3_cos4
+    Q_bar_22 = U1 - U2_cos2 + U3_cos4
+    Q_bar_16 = half_U2_sin2 + U3_sin4
+    Q_bar_26 = half_U2_sin2 - U3_sin4
+    Q_bar_66 = U5 - U3_cos4
+
+    # Optimization: Returning a constructed array instead of allocating via np.empty
+    # and assigning row by row reduces redundant operations and array subset assignments
+    res = np.array([
+        Q_bar_11, Q_bar_12, Q_bar_16,
+        Q_bar_12, Q_bar_22, Q_bar_26,
+        Q_bar_16, Q_bar_26, Q_bar_66
+    ])
+
+    # Ensure 2D shape (9, 1) for scalar inputs to maintain backward compatibility
+    return res if res.ndim > 1 else res[:, np.newaxis]
+
+def _Q_bar_terms(invariants, rad):
+    """Scalar (Q11, Q12, Q16, Q22, Q26, Q66) of Q_bar for one ply angle in radians."""
+    U1, U2, U3, U4, U5 = invariants
+    cos2 = math.cos(2 * rad)
+    sin2 = math.sin(2 * rad)
+    cos4 = math.cos(4 * rad)
+    sin4 = math.sin(4 * rad)
+    return (
+        U1 + U2 * cos2 + U3 * cos4,
+        U4 - U3 * cos4,
+        0.5 * U2 * sin2 + U3 * sin4,
+        U1 - U2 * cos2 + U3 * cos4,
+        0.5 * U2 * sin2 - U3 * sin4,
+        U5 - U3 * cos4,
+    )
+
+def _stiffness_terms(invariants, w, c2, s2, c4, s4):
+    """
+    (11, 12, 16, 22, 26, 66) terms of sum(w_k * Q_bar(a_k)) from the weighted sums
+    w = sum(w_k), c2 = sum(w_k cos 2a_k), s2, c4 and s4 likewise (floats).
+    """
+    U1, U2, U3, U4, U5 = invariants
+    U2_c2 = U2 * c2
+    U3_c4 = U3 * c4
+    half_U2_s2 = 0.5 * U2 * s2
+    U3_s4 = U3 * s4
+    return (
+        U1 * w + U2_c2 + U3_c4,
+        U4 * w - U3_c4,
+        half_U2_s2 + U3_s4,
+        U1 * w - U2_c2 + U3_c4,
+        half_U2_s2 - U3_s4,
+        U5 * w - U3_c4,
+    )
+
+def _polar_moduli(a, h, angles):
+    """
+    Ex, Ey and Gxy of the in-plane compliance a (3, 3) or (m, 3, 3) rotated to each angle (degrees).
+    Returns arrays of shape (n_angles,) or (m, n_angles).
+    """
+    # Broadcast compliance components against the angle axis
+    a = np.asarray(a)[..., np.newaxis]
+    S11, S12, S16 = a[..., 0, 0, :], a[..., 0, 1, :], a[..., 0, 2, :]
+    S21, S22, S26 = a[..., 1, 0, :], a[..., 1, 1, :], a[..., 1, 2, :]
+    S61, S62, S66 = a[..., 2, 0, :], a[..., 2, 1, :], a[..., 2, 2, :]
+
+    rads = np.radians(angles)
+    c = np.cos(rads)
+    # Using -angles implicitly as T_sigma(-theta) corresponds to stress transformation inverse
+    s = -np.sin(rads)
+
+    c2 = c * c
+    s2 = s * s
+    cs = c * s
+    c4 = c2 * c2
+    s4 = s2 * s2
+    c2s2 = c2 * s2
+    c2_s2 = c2 - s2
+
+    a00 = S11*c4 + S22*s4 + c2s2*(S12 + S21 + S66) - cs*c2*(S61 + S16) - cs*s2*(S62 + S26)
+    a11 = S11*s4 + S22*c4 + c2s2*(S12 + S21 + S66) + cs*s2*(S61 + S16) + cs*c2*(S62 + S26)
+    a22 = 4*c2s2*(S11 - S21 - S12 + S22) + 2*cs*c2_s2*(S61 - S62 + S16 - S26) + c2_s2*c2_s2*S66
+
+    # Optimization: Use np.divide instead of manual masking to reduce array loops and boolean array overhead
+    h_inv = np.broadcast_to(1.0 / np.asarray(h, dtype=np.float64)[..., np.newaxis], a00.shape)
+
+    Ex = np.zeros_like(a00)
+    Ey = np.zeros_like(a11)
+    Gxy = np.zeros_like(a22)
+
+    np.divide(h_inv, a00, out=Ex, where=a00!=0)
+    np.divide(h_inv, a11, out=Ey, where=a11!=0)
+    np.divide(h_inv, a22, out=Gxy, where=a22!=0)
+
+    return Ex, Ey, Gxy
+
 class PolarResult:
-    def __init__(self, data):
-        self.data = data # list of dicts
+    def __init__(self, data=None, columns=None):
+        """
+        Args:
+            data (list): List of {"angle", "Ex", "Ey", "Gxy"} dicts.
+            columns (dict): The same values as arrays keyed by name. When given instead of
+                `data`, the list is only built on first access.
+        """
+        self._data = data
+        self._columns = columns
 
-    def plot(self, filename="polar_plot.png"):
-        # Generate plot using matplotlib
-        angles = [d['angle'] for d in self.data]
-        Ex = [d['Ex'] for d in self.data]
+    @property
+    def data(self):
+        if self._data is None:
+            c = self._columns
+            self._data = [
+                {"angle": a, "Ex": ex, "Ey": ey, "Gxy": gxy}
+                for a, ex, ey, gxy in zip(c["angle"].tolist(), c["Ex"].tolist(), c["Ey"].tolist(), c["Gxy"].tolist())
+            ]
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+        self._columns = None
+
+    def columns(self):
+        """Returns the polar as array columns {"angle", "Ex", "Ey", "Gxy"}."""
+        if self._columns is None:
+            self._columns = {
+                key: np.array([d[key] for d in self._data])
+                for key in ("angle", "Ex", "Ey", "Gxy")
+            }
+        return self._columns
+
+    def svg(self, component="Ex", title=None):
+        """
+        Renders one component against the loading angle as an SVG document (no matplotlib).
+
+        Args:
+            component (str): "Ex", "Ey" or "Gxy".
+            title (str): Plot title; defaults to "Stiffness Polar Plot (<component>)".
 
-        rads = np.radians(angles)
+        Returns:
+            str: The SVG document.
+        """
+        c = self.columns()
+        return plotting.polar_svg(c["angle"], c[component], title or f"Stiffness Polar Plot ({component})")
 
-        plt.figure()
-        ax = plt.subplot(111, projection='polar')
-        ax.plot(rads, Ex)
-        ax.set_title("Stiffness Polar Plot (Ex)")
-        plt.savefig(filename)
-        plt.close()
+    def plot(self, filename="polar_plot.png", component="Ex"):
+        """
+        Writes the polar plot to `filename`: SVG files are rendered directly, other
+        formats (PNG by default) go through matplotlib, which must then be installed.
+        """
+        if filename.lower().endswith(".svg"):
+            plotting.save_svg(self.svg(component), filename)
+            return
+        c = self.columns()
+        plotting.polar_matplotlib(c["angle"], c[component], filename, f"Stiffness Polar Plot ({component})")
 
 class Laminate:
+    """
+    A laminate: a material, a stack of ply angles and a ply thickness.
+
+    Laminates are immutable by default: material, stack and ply thickness are fixed at
+    construction, derived arrays are read-only, and set_angles() is the one in-place edit.
+    Derived fields (z_coords, z_mids, the per-ply trig values, A, B, D and ABD) are
+    computed by update() on first access, so construction only stores the definition, and
+    pickles carry only the definition.
+    """
+    # Slots filled by update(); reading one that is unset calls update() (see __getattr__)
+    _DERIVED = ("z_coords", "z_mids", "rads", "c", "s", "c2", "s2", "cs", "A", "B", "D", "ABD")
+    __slots__ = ("_material", "_raw_stack", "_stack", "_ply_thickness", "_total_thickness",
+                 "_abd", "_K_all", "_K_all_z") + _DERIVED
+
     def __init__(self, material, stack, thickness=0.125e-3, symmetry=False):
         """
         Args:
@@ -105,44 +284,209 @@ class Laminate:
             thickness (float): Thickness of a single ply (m).
             symmetry (bool): If True, mirrors the stack.
         """
-        self.material = material
-        self.raw_stack = stack
+        self._material = material
+        # Tuples: the laminate never shares a mutable stack with the caller
+        self._raw_stack = tuple(stack)
         if symmetry:
-            self.stack = stack + stack[::-1]
+            self._stack = self._raw_stack + self._raw_stack[::-1]
         else:
-            self.stack = stack
-        self.ply_thickness = thickness
-        self.total_thickness = len(self.stack) * thickness
+            self._stack = self._raw_stack
+        self._ply_thickness = thickness
+        self._total_thickness = self._calculate_total_thickness()
+
+    def __getattr__(self, name):
+        # Only called when normal lookup fails, i.e. for derived slots not computed yet
+        if name in Laminate._DERIVED:
+            self.update()
+            return object.__getattribute__(self, name)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __getstate__(self):
+        # The definition only: derived fields and caches are recomputed on first access
+        extra = getattr(self, "__dict__", None) # subclasses without __slots__
+        return (self._material, self._raw_stack, self._stack, self._ply_thickness, self._total_thickness, extra)
+
+    def __setstate__(self, state):
+        self._material, self._raw_stack, self._stack, self._ply_thickness, self._total_thickness, extra = state
+        if extra:
+            self.__dict__.update(extra)
+
+    @property
+    def material(self):
+        return self._material
+
+    @property
+    def raw_stack(self):
+        """Ply angles as given, before mirroring (a tuple)."""
+        return self._raw_stack
 
-        self.Q_mat = material.Q()
-        self.update()
+    @property
+    def stack(self):
+        """Ply angles of the full (mirrored) stack (a tuple)."""
+        return self._stack
+
+    @property
+    def ply_thickness(self):
+        return self._ply_thickness
+
+    @property
+    def total_thickness(self):
+        return self._total_thickness
+
+    @property
+    def Q_mat(self):
+        return self._material.Q()
 
     def update(self):
-        self.z_coords = self._calculate_z_coords()
+        """(Re)computes the derived fields. Called automatically on first access."""
+        metrics.incr("laminate_builds")
+        # The scalar kernel assumes equal ply thicknesses, i.e. the default z coordinates
+        if len(self.stack) <= SCALAR_PLY_LIMIT and type(self)._calculate_z_coords is Laminate._calculate_z_coords:
+            self._update_scalar()
+        else:
+            self._update_vectorized()
+
+        # Lazy property invalidation
+        self._abd = None
+        self._K_all = None
+        self._K_all_z = None
+
+    def _update_scalar(self):
+        """
+        update() for small laminates, with floats and math instead of NumPy temporaries.
+
+        All plies share one thickness t, so with mid-plane z_m the ply weights of A, B and D
+        reduce to t, t z_m and t (z_m^2 + t^2 / 12). Q_bar is linear in (1, cos 2a, sin 2a,
+        cos 4a, sin 4a), so only the weighted sums of those (lamination parameters) are
+        accumulated, once per distinct angle, and combined with the invariants at the end.
+        """
+        stack = self.stack
+        n = len(stack)
+        t = self.ply_thickness
+        z0 = -n * t / 2
+
+        # angle -> [ply count, sum of z_m, sum of z_m^2]
+        moments = {}
+        z_coords = [z0]
+        z_mids = []
+        zk_1 = z0
+        for k, angle in enumerate(stack):
+            zk = (k + 1) * t + z0
+            z_coords.append(zk)
+            zm = (zk + zk_1) / 2.0
+            z_mids.append(zm)
+            zk_1 = zk
+            m = moments.get(angle)
+            if m is None:
+                moments[angle] = [1, zm, zm * zm]
+            else:
+                m[0] += 1
+                m[1] += zm
+                m[2] += zm * zm
+
+        trig = {}
+        # Weighted sums of cos 2a, sin 2a, cos 4a, sin 4a for A (a*), B (b*) and D (d*)
+        a_c2 = a_s2 = a_c4 = a_s4 = 0.0
+        b_c2 = b_s2 = b_c4 = b_s4 = b_w = 0.0
+        d_c2 = d_s2 = d_c4 = d_s4 = d_w = 0.0
+        t2_12 = t * t / 12
+        for angle, (count, z1, z2) in moments.items():
+            rad = math.radians(angle)
+            c = math.cos(rad)
+            s = math.sin(rad)
+            c2 = c * c
+            s2 = s * s
+            cs = c * s
+            trig[angle] = (rad, c, s, c2, s2, cs)
+
+            # Same double-angle form as _Q_bar_from_invariants
+            cos2 = c2 - s2
+            sin2 = cs * 2.0
+            cos4 = cos2 * cos2 - sin2 * sin2
+            sin4 = cos2 * sin2 * 2.0
+            a_c2 += count * cos2
+            a_s2 += count * sin2
+            a_c4 += count * cos4
+            a_s4 += count * sin4
+            b_w += z1
+            b_c2 += z1 * cos2
+            b_s2 += z1 * sin2
+            b_c4 += z1 * cos4
+            b_s4 += z1 * sin4
+            w = z2 + count * t2_12
+            d_w += w
+            d_c2 += w * cos2
+            d_s2 += w * sin2
+            d_c4 += w * cos4
+            d_s4 += w * sin4
+
+        U = self.material.invariants
+        a = _stiffness_terms(U, n * t, a_c2 * t, a_s2 * t, a_c4 * t, a_s4 * t)
+        b = _stiffness_terms(U, b_w * t, b_c2 * t, b_s2 * t, b_c4 * t, b_s4 * t)
+        d = _stiffness_terms(U, d_w * t, d_c2 * t, d_s2 * t, d_c4 * t, d_s4 * t)
+
+        # Optimization: np.fromiter over flat sequences is about twice as fast as np.array
+        # on nested lists, and one (n, 6) conversion replaces six per-row arrays
+        rows = np.fromiter(chain.from_iterable(map(trig.__getitem__, stack)), np.float64, 6 * n)
+        self._store_plies(
+            rows.reshape(n, 6).T.copy(),
+            np.fromiter(z_coords, np.float64, n + 1),
+            np.fromiter(z_mids, np.float64, n),
+        )
+        self._store_stiffness(np.fromiter((
+            a[0], a[1], a[2], b[0], b[1], b[2],
+            a[1], a[3], a[4], b[1], b[3], b[4],
+            a[2], a[4], a[5], b[2], b[4], b[5],
+            b[0], b[1], b[2], d[0], d[1], d[2],
+            b[1], b[3], b[4], d[1], d[3], d[4],
+            b[2], b[4], b[5], d[2], d[4], d[5],
+        ), np.float64, 36).reshape(6, 6))
+
+    def _store_plies(self, rows, z_coords, z_mids):
+        """Stores the (6, n) rows rads, c, s, c2, s2, cs and the z coordinates, read-only."""
+        # Views taken after setflags are read-only too
+        rows.setflags(write=False)
+        z_coords.setflags(write=False)
+        z_mids.setflags(write=False)
+        self.rads, self.c, self.s, self.c2, self.s2, self.cs = rows
+        self.z_coords = z_coords
+        self.z_mids = z_mids
+
+    def _store_stiffness(self, ABD):
+        ABD.setflags(write=False)
+        self.ABD = ABD
+        self.A = ABD[:3, :3]
+        self.B = ABD[:3, 3:]
+        self.D = ABD[3:, 3:]
+
+    def _update_vectorized(self):
+        z_coords = self._calculate_z_coords()
 
         # Vectorized calculation for performance
         # 1. Calculate Q_bar for all plies at once
-        angles = np.array(self.stack)
+        angles = np.array(self.stack, dtype=np.float64)
 
         # Precompute and store trig values for reuse in failure analysis and optimization
-        self.rads = np.radians(angles)
-        self.c = np.cos(self.rads)
-        self.s = np.sin(self.rads)
-        self.c2 = self.c * self.c
-        self.s2 = self.s * self.s
-        self.cs = self.c * self.s
+        # Optimization: Computed in place into the rows of one (6, n) array
+        rows = np.empty((6, len(angles)))
+        rads, c, s, c2, s2, cs = rows
+        np.radians(angles, out=rads)
+        np.cos(rads, out=c)
+        np.sin(rads, out=s)
+        np.multiply(c, c, out=c2)
+        np.multiply(s, s, out=s2)
+        np.multiply(c, s, out=cs)
 
         # Cache geometric midpoints for optimization functions
-        zk_full = self.z_coords
-        self.z_mids = (zk_full[:-1] + zk_full[1:]) / 2.0
+        z_mids = (z_coords[:-1] + z_coords[1:]) / 2.0
 
         # Calculate Q_bar using precomputed trig values for performance
         # Optimization: returns (9, n_plies) array directly
-        Q_bars_flat = self._get_Q_bar_from_trig(self.c2, self.s2, self.cs)
+        Q_bars_flat = self._get_Q_bar_from_trig(c2, s2, cs)
 
         # 2. Calculate thickness terms
-        zk = self.z_coords[1:]
-        zk_1 = self.z_coords[:-1]
+        zk = z_coords[1:]
+        zk_1 = z_coords[:-1]
 
         # Optimization: algebraically factoring common terms for h2 and h3
         # h2 = zk^2 - zk_1^2 = (zk - zk_1)(zk + zk_1) = h * sum_z
@@ -164,20 +508,82 @@ class Laminate:
         D_flat = np.dot(Q_bars_flat, h3)
         D_flat *= (1/3)
 
-        self.A = A_flat.reshape(3, 3)
-        self.B = B_flat.reshape(3, 3)
-        self.D = D_flat.reshape(3, 3)
-
         # ABD Matrix
         # Optimization: Avoiding chained slice assignments with intermediate .reshape(3, 3)
-        # directly on self.ABD avoids redundant array proxy generation overhead
-        self.ABD = np.empty((6, 6))
-        self.ABD[:3, :3].flat = A_flat
-        self.ABD[:3, 3:].flat = B_flat
-        self.ABD[3:, :3].flat = B_flat
-        self.ABD[3:, 3:].flat = D_flat
+        # directly on ABD avoids redundant array proxy generation overhead
+        ABD = np.empty((6, 6))
+        ABD[:3, :3].flat = A_flat
+        ABD[:3, 3:].flat = B_flat
+        ABD[3:, :3].flat = B_flat
+        ABD[3:, 3:].flat = D_flat
+
+        self._store_plies(rows, z_coords, z_mids)
+        self._store_stiffness(ABD)
+
+    def set_angles(self, indices, angles):
+        """
+        Changes the angles of some plies in place.
+
+        A, B and D are updated by the changed plies' contributions only, which is
+        O(len(indices)) instead of a full update().
+
+        Args:
+            indices (list): Ply indices in the (mirrored) stack.
+            angles (list): New ply angles in degrees.
+        """
+        U = [float(u) for u in self.material.invariants]
+        z = self.z_coords
+        # The stored arrays are read-only: edit copies and store them again
+        rows = np.array((self.rads, self.c, self.s, self.c2, self.s2, self.cs))
+        stack = list(self._stack)
+        # Accumulated changes of the (11, 12, 16, 22, 26, 66) terms of A, B and D
+        dA = [0.0] * 6
+        dB = [0.0] * 6
+        dD = [0.0] * 6
+
+        # Optimization: Edits touch one or two plies, where scalar math is several times
+        # faster than building small NumPy temporaries
+        for i, angle in zip(indices, angles):
+            rad = math.radians(angle)
+            new = _Q_bar_terms(U, rad)
+            old = _Q_bar_terms(U, float(rows[0, i]))
+
+            zk_1 = float(z[i])
+            zk = float(z[i + 1])
+            h = zk - zk_1
+            sum_z = zk + zk_1
+            h2 = 0.5 * h * sum_z
+            h3 = h * (sum_z * sum_z - zk * zk_1) / 3
+            for k in range(6):
+                d = new[k] - old[k]
+                dA[k] += d * h
+                dB[k] += d * h2
+                dD[k] += d * h3
+
+            c = math.cos(rad)
+            s = math.sin(rad)
+            stack[i] = angle
+            rows[:, i] = (rad, c, s, c * c, s * s, c * s)
+
+        self._stack = tuple(stack)
+        n = len(self._raw_stack)
+        if n != len(stack):
+            # Symmetric: the base stack is the lower half while the edits keep the mirror
+            mirrored = self._stack[:n] == self._stack[:n - 1:-1]
+            self._raw_stack = self._stack[:n] if mirrored else self._stack
+        else:
+            self._raw_stack = self._stack
+        self._store_plies(rows, z, self.z_mids)
+        a, b, d = dA, dB, dD
+        self._store_stiffness(self.ABD + np.array([
+            [a[0], a[1], a[2], b[0], b[1], b[2]],
+            [a[1], a[3], a[4], b[1], b[3], b[4]],
+            [a[2], a[4], a[5], b[2], b[4], b[5]],
+            [b[0], b[1], b[2], d[0], d[1], d[2]],
+            [b[1], b[3], b[4], d[1], d[3], d[4]],
+            [b[2], b[4], b[5], d[2], d[4], d[5]],
+        ]))
 
-        # Lazy property invalidation
         self._abd = None
         self._K_all = None
         self._K_all_z = None
@@ -203,7 +609,9 @@ class Laminate:
             T_all[:, 2, 1] = 2*cs
             T_all[:, 2, 2] = c2 - s2
 
-            self._K_all = Q @ T_all
+            K_all = Q @ T_all
+            K_all.setflags(write=False)
+            self._K_all = K_all
         return self._K_all
 
     @property
@@ -213,19 +621,27 @@ class Laminate:
             zk = self.z_coords[1:]
             zk_1 = self.z_coords[:-1]
             z_mids = (zk + zk_1) / 2
-            self._K_all_z = self.K_all * z_mids[:, np.newaxis, np.newaxis]
+            K_all_z = self.K_all * z_mids[:, np.newaxis, np.newaxis]
+            K_all_z.setflags(write=False)
+            self._K_all_z = K_all_z
         return self._K_all_z
 
     @property
     def abd(self):
         """Lazy evaluation of the compliance matrix (inverse of ABD)."""
         if getattr(self, '_abd', None) is None:
+            metrics.incr("abd_inversions")
             try:
-                self._abd = np.linalg.inv(self.ABD)
+                abd = np.linalg.inv(self.ABD)
             except np.linalg.LinAlgError:
-                self._abd = np.zeros_like(self.ABD)
+                abd = np.zeros(self.ABD.shape)
+            abd.setflags(write=False)
+            self._abd = abd
         return self._abd
 
+    def _calculate_total_thickness(self):
+        return len(self._stack) * self._ply_thickness
+
     def _calculate_z_coords(self):
         n_plies = len(self.stack)
         h = self.total_thickness
@@ -256,42 +672,7 @@ class Laminate:
         Calculate transformed stiffness matrix Q_bar using precomputed squared and product trig values.
         Avoids recomputing trig functions and uses double-angle identities.
         """
-        # Use invariants for faster calculation
-        U1, U2, U3, U4, U5 = self.material.invariants
-
-        # Calculate double angles from pre-squared trig values
-        # Optimization: Pre-compute repetitive array multiplications to reduce allocation overhead
-        cos2 = c2 - s2
-        sin2 = cs * 2.0
-
-        cos4 = cos2*cos2
-        cos4 -= sin2*sin2
-
-        sin4 = cos2 * sin2
-        sin4 *= 2.0
-
-        U2_cos2 = cos2 * U2
-        U3_cos4 = cos4 * U3
-        half_U2_sin2 = sin2 * (0.5 * U2)
-        U3_sin4 = sin4 * U3
-
-        Q_bar_11 = U1 + U2_cos2 + U3_cos4
-        Q_bar_12 = U4 - U3_cos4
-        Q_bar_22 = U1 - U2_cos2 + U3_cos4
-        Q_bar_16 = half_U2_sin2 + U3_sin4
-        Q_bar_26 = half_U2_sin2 - U3_sin4
-        Q_bar_66 = U5 - U3_cos4
-
-        # Optimization: Returning a constructed array instead of allocating via np.empty
-        # and assigning row by row reduces redundant operations and array subset assignments
-        res = np.array([
-            Q_bar_11, Q_bar_12, Q_bar_16,
-            Q_bar_12, Q_bar_22, Q_bar_26,
-            Q_bar_16, Q_bar_26, Q_bar_66
-        ])
-
-        # Ensure 2D shape (9, 1) for scalar inputs to maintain backward compatibility
-        return res if res.ndim > 1 else res[:, np.newaxis]
+        return _Q_bar_from_invariants(self.material.invariants, c2, s2, cs)
 
     def properties(self):
         """Returns equivalent engineering constants."""
@@ -320,49 +701,8 @@ class Laminate:
         # Expanding the matrix operations manually for a00, a11, a22 avoids allocating
         # and populating intermediate 3x3xN transformation arrays entirely.
 
-        a = self.abd[:3, :3]
-        S11, S12, S16 = a[0, 0], a[0, 1], a[0, 2]
-        S21, S22, S26 = a[1, 0], a[1, 1], a[1, 2]
-        S61, S62, S66 = a[2, 0], a[2, 1], a[2, 2]
+        Ex, Ey, Gxy = _polar_moduli(self.abd[:3, :3], h, angles)
 
-        rads = np.radians(angles)
-        c = np.cos(rads)
-        # Using -angles implicitly as T_sigma(-theta) corresponds to stress transformation inverse
-        s = -np.sin(rads)
-
-        c2 = c * c
-        s2 = s * s
-        cs = c * s
-        c4 = c2 * c2
-        s4 = s2 * s2
-        c2s2 = c2 * s2
-        c2_s2 = c2 - s2
-
-        a00 = S11*c4 + S22*s4 + c2s2*(S12 + S21 + S66) - cs*c2*(S61 + S16) - cs*s2*(S62 + S26)
-        a11 = S11*s4 + S22*c4 + c2s2*(S12 + S21 + S66) + cs*s2*(S61 + S16) + cs*c2*(S62 + S26)
-        a22 = 4*c2s2*(S11 - S21 - S12 + S22) + 2*cs*c2_s2*(S61 - S62 + S16 - S26) + c2_s2*c2_s2*S66
-
-        # Optimization: Use np.divide instead of manual masking to reduce array loops and boolean array overhead
-        h_inv = 1.0 / h
-
-        Ex = np.zeros_like(a00)
-        Ey = np.zeros_like(a11)
-        Gxy = np.zeros_like(a22)
-
-        np.divide(h_inv, a00, out=Ex, where=a00!=0)
-        np.divide(h_inv, a11, out=Ey, where=a11!=0)
-        np.divide(h_inv, a22, out=Gxy, where=a22!=0)
-
-        # Optimization: Converting arrays to lists and zipping them in a list comprehension
-        # is significantly faster than looping over the arrays and calling float() on each element.
-        angles_list = angles.tolist()
-        Ex_list = Ex.tolist()
-        Ey_list = Ey.tolist()
-        Gxy_list = Gxy.tolist()
-
-        results = [
-            {"angle": a, "Ex": ex, "Ey": ey, "Gxy": gxy}
-            for a, ex, ey, gxy in zip(angles_list, Ex_list, Ey_list, Gxy_list)
-        ]
-
-        return PolarResult(results)
+        # Optimization: Keep the results as columns; the list of dicts for JSON is built lazily
+        # (via tolist(), much faster than per-element float()) and binary encoders use the arrays directly.
+        return PolarResult(columns={"angle": angles, "Ex": Ex, "Ey": Ey, "Gxy": Gxy})
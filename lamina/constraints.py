@@ -0,0 +1,256 @@
+import copy
+
+import numpy as np
+
+
+class ManufacturingRules:
+    """
+    Stacking-sequence design rules evaluated on whole populations at once.
+
+    Populations are integer arrays of ply angles in degrees with shape
+    (n_designs, n_plies). With symmetric=True the rows are half-stacks (as used
+    by GeneticAlgorithm) and the rules are applied to the mirrored full stack.
+    """
+    def __init__(self, balanced=True, max_contiguous=4, min_fraction=0.1,
+                 outer_45=True, symmetric=True):
+        """
+        Args:
+            balanced (bool): Require as many -theta as +theta plies for off-axis angles.
+            max_contiguous (int): Maximum number of adjacent identical plies (None disables).
+            min_fraction (float): Minimum fraction of 0, 90 and +-45 plies (10% rule, 0 disables).
+            outer_45 (bool): Require +-45 outer plies.
+            symmetric (bool): Rows are half-stacks of a symmetric laminate.
+        """
+        self.balanced = balanced
+        self.max_contiguous = max_contiguous
+        self.min_fraction = min_fraction
+        self.outer_45 = outer_45
+        self.symmetric = symmetric
+
+    def _full(self, pop):
+        if self.symmetric:
+            return np.concatenate([pop, pop[:, ::-1]], axis=1)
+        return pop
+
+    @staticmethod
+    def _run_lengths(full):
+        """Length of the run of identical plies ending at each position."""
+        n = full.shape[1]
+        idx = np.arange(n)
+        change = np.ones(full.shape, dtype=bool)
+        change[:, 1:] = full[:, 1:] != full[:, :-1]
+        # Index of the most recent run start, carried forward along each row
+        starts = np.where(change, idx, 0)
+        np.maximum.accumulate(starts, axis=1, out=starts)
+        return idx - starts + 1
+
+    def _family_counts(self, full):
+        """Counts of 0, 90 and +-45 plies per design."""
+        n0 = (full == 0).sum(axis=1)
+        n90 = (np.abs(full) == 90).sum(axis=1)
+        n45 = (np.abs(full) == 45).sum(axis=1)
+        return n0, n90, n45
+
+    def violations(self, population):
+        """
+        Evaluates every rule on a population.
+
+        Returns:
+            dict: rule name -> boolean array, True where the design violates the rule.
+        """
+        pop = np.asarray(population)
+        full = self._full(pop)
+        n_designs, n = full.shape
+        result = {}
+
+        if self.balanced:
+            off_axis = np.abs(full)
+            off_axis = (off_axis != 0) & (off_axis != 90)
+            # Signed count per off-axis magnitude: sum(sign) must vanish for each magnitude
+            unbalanced = np.zeros(n_designs, dtype=bool)
+            for theta in np.unique(np.abs(full[off_axis])):
+                diff = (full == theta).sum(axis=1) - (full == -theta).sum(axis=1)
+                unbalanced |= diff != 0
+            result['balanced'] = unbalanced
+
+        if self.max_contiguous:
+            result['max_contiguous'] = self._run_lengths(full).max(axis=1, initial=0) > self.max_contiguous
+
+        if self.min_fraction:
+            need = np.ceil(self.min_fraction * n - 1e-9)
+            n0, n90, n45 = self._family_counts(full)
+            result['min_fraction'] = (n0 < need) | (n90 < need) | (n45 < need)
+
+        if self.outer_45:
+            if n:
+                bad = np.abs(full[:, 0]) != 45
+                if not self.symmetric:
+                    bad |= np.abs(full[:, -1]) != 45
+            else:
+                bad = np.zeros(n_designs, dtype=bool)
+            result['outer_45'] = bad
+
+        return result
+
+    def check(self, population):
+        """
+        Returns:
+            np.ndarray: Boolean mask, True for designs satisfying every rule.
+        """
+        pop = np.asarray(population)
+        ok = np.ones(pop.shape[0], dtype=bool)
+        for bad in self.violations(pop).values():
+            ok &= ~bad
+        return ok
+
+    def check_stacks(self, stacks, symmetric=None, repair=False):
+        """
+        Applies the rules to stacks of different lengths (e.g. the items of a LaminateBatch).
+
+        Stacks are grouped by length and symmetry into rectangular populations, so each
+        group is checked (and repaired) in one vectorized pass.
+
+        Args:
+            stacks (list): Ply angle lists in degrees (half-stacks where symmetric).
+            symmetric (bool or list): Symmetry of every stack, shared or per stack
+                (defaults to self.symmetric).
+            repair (bool): Repair stacks before checking them. Repairs work on integer
+                angles, so stacks with fractional angles are only checked.
+
+        Returns:
+            tuple: (stacks, violations): the stacks as lists (repaired where requested) and,
+            for each, the names of the rules it still violates (empty when feasible).
+        """
+        n = len(stacks)
+        if symmetric is None:
+            symmetric = self.symmetric
+        symmetric = np.broadcast_to(np.asarray(symmetric, dtype=bool), (n,))
+        stacks = [list(stack) for stack in stacks]
+        violations = [[] for _ in range(n)]
+
+        groups = {}
+        for i, (stack, sym) in enumerate(zip(stacks, symmetric)):
+            groups.setdefault((len(stack), bool(sym)), []).append(i)
+
+        for (length, sym), rows in groups.items():
+            rules = copy.copy(self)
+            rules.symmetric = sym
+            pop = np.array([stacks[i] for i in rows], dtype=np.float64).reshape(len(rows), length)
+            if repair:
+                integral = np.flatnonzero((pop == np.round(pop)).all(axis=1))
+                if integral.size:
+                    repaired = rules.repair(pop[integral].astype(np.int64))
+                    pop[integral] = repaired
+                    for k, stack in zip(integral, repaired.tolist()):
+                        stacks[rows[k]] = stack
+            for name, bad in rules.violations(pop).items():
+                for k in np.flatnonzero(bad):
+                    violations[rows[k]].append(name)
+
+        return stacks, violations
+
+    def repair(self, population, max_passes=3):
+        """
+        Repairs a population in place of random resampling.
+
+        Applies the outer-ply, 10%, balance and contiguity repairs in turn. A repair can
+        undo an earlier one, so the sequence is repeated up to max_passes times on the
+        designs that are still infeasible. Use check() on the result to filter leftovers.
+
+        Returns:
+            np.ndarray: Repaired copy of the population.
+        """
+        pop = np.array(population, dtype=np.int64)
+        if pop.size == 0:
+            return pop
+
+        for _ in range(max_passes):
+            bad = ~self.check(pop)
+            if not bad.any():
+                break
+            sub = pop[bad]
+            if self.outer_45:
+                self._repair_outer(sub)
+            if self.min_fraction:
+                self._repair_fraction(sub)
+            if self.balanced:
+                self._repair_balance(sub)
+            if self.max_contiguous:
+                self._repair_contiguity(sub)
+            pop[bad] = sub
+
+        return pop
+
+    def _repair_outer(self, pop):
+        outer = pop[:, 0]
+        outer[np.abs(outer) != 45] = 45
+        if not self.symmetric:
+            inner = pop[:, -1]
+            inner[np.abs(inner) != 45] = -45
+
+    @staticmethod
+    def _rank_from_mid(mask):
+        """1-based rank of each masked ply counted from the last position (midplane)."""
+        return np.cumsum(mask[:, ::-1], axis=1)[:, ::-1]
+
+    def _repair_fraction(self, pop):
+        n = pop.shape[1] * (2 if self.symmetric else 1)
+        need = int(np.ceil(self.min_fraction * n - 1e-9))
+        # Work in half-stack counts for symmetric rows: every half ply counts twice
+        scale = 2 if self.symmetric else 1
+
+        for target in (0, 90, 45):
+            n0, n90, n45 = self._family_counts(self._full(pop))
+            counts = {0: n0, 90: n90, 45: n45}
+            deficit = -(-(need - counts[target]) // scale)
+            rows = deficit > 0
+            if not rows.any():
+                continue
+
+            # Take plies from the most abundant other family, innermost first, never the outer ply
+            others = [f for f in (0, 90, 45) if f != target]
+            donor = np.where(counts[others[0]] >= counts[others[1]], others[0], others[1])
+            donor_mask = np.abs(pop) == donor[:, np.newaxis]
+            donor_mask[:, 0] = False
+            rank = self._rank_from_mid(donor_mask)
+            replace = donor_mask & (rank <= deficit[:, np.newaxis]) & rows[:, np.newaxis]
+            if target == 45:
+                # Alternate +45/-45 when adding to the angle-ply family to keep balance
+                fill = np.where(rank % 2 == 1, 45, -45)
+                pop[replace] = fill[replace]
+            else:
+                pop[replace] = target
+
+    def _repair_balance(self, pop):
+        abs_pop = np.abs(pop)
+        off_axis = (abs_pop != 0) & (abs_pop != 90)
+        for theta in np.unique(abs_pop[off_axis]):
+            plus = pop == theta
+            minus = pop == -theta
+            diff = plus.sum(axis=1) - minus.sum(axis=1)
+
+            # Flip half of the surplus to the opposite sign, innermost plies first
+            flips = np.abs(diff) // 2
+            major = np.where((diff > 0)[:, np.newaxis], plus, minus)
+            rank = self._rank_from_mid(major)
+            flip = major & (rank <= flips[:, np.newaxis])
+            pop[flip] = -pop[flip]
+
+            # An odd surplus cannot be balanced by flipping; convert one ply to 0 or 90
+            odd = (diff % 2 == 1)[:, np.newaxis]
+            convert = major & (rank == flips[:, np.newaxis] + 1) & odd
+            n0 = (pop == 0).sum(axis=1, keepdims=True)
+            n90 = (abs_pop == 90).sum(axis=1, keepdims=True)
+            fill = np.broadcast_to(np.where(n0 <= n90, 0, 90), pop.shape)
+            pop[convert] = fill[convert]
+
+    def _repair_contiguity(self, pop):
+        n = pop.shape[1]
+        run = self._run_lengths(self._full(pop))
+        breaks = run % (self.max_contiguous + 1) == 0
+        if self.symmetric:
+            # Map breaks in the mirrored half back onto the stored half-stack
+            breaks = breaks[:, :n] | breaks[:, n:][:, ::-1]
+        # Replace with the sign-flipped angle (keeps the 10% family) or swap 0 <-> 90
+        alt = np.where((pop == 0) | (np.abs(pop) == 90), 90 - np.abs(pop), -pop)
+        pop[breaks] = alt[breaks]
@@ -1,28 +1,51 @@
 import numpy as np
-import matplotlib.pyplot as plt
+from lamina import metrics, plotting
 
 class Envelope:
-    def __init__(self, data):
-        self.data = data # list of (sigma_x, sigma_y)
+    def __init__(self, data=None, sx=None, sy=None):
+        """
+        Args:
+            data (list): List of (sigma_x, sigma_y) points.
+            sx, sy (np.ndarray): The same points as columns. When given instead of `data`,
+                the list is only built on first access.
+        """
+        self._data = data
+        self._sx = sx
+        self._sy = sy
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = list(zip(self._sx.tolist(), self._sy.tolist()))
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+        self._sx = self._sy = None
+
+    def columns(self):
+        """Returns the envelope as float64 columns {"sigma_x": ..., "sigma_y": ...}."""
+        if self._sx is None:
+            points = np.asarray(self._data, dtype=np.float64).reshape(-1, 2)
+            self._sx, self._sy = points[:, 0].copy(), points[:, 1].copy()
+        return {"sigma_x": self._sx, "sigma_y": self._sy}
+
+    def svg(self, title="Failure Envelope"):
+        """Renders the closed envelope as an SVG document (no matplotlib)."""
+        c = self.columns()
+        return plotting.envelope_svg(c["sigma_x"], c["sigma_y"], title)
 
     def plot(self, filename="failure_envelope.png"):
-        sx = [d[0] for d in self.data]
-        sy = [d[1] for d in self.data]
-
-        # Close the loop
-        if len(sx) > 0:
-            sx.append(sx[0])
-            sy.append(sy[0])
-
-        plt.figure()
-        plt.plot(sx, sy)
-        plt.xlabel("Sigma_x (Pa)")
-        plt.ylabel("Sigma_y (Pa)")
-        plt.title("Failure Envelope")
-        plt.grid(True)
-        plt.axis('equal')
-        plt.savefig(filename)
-        plt.close()
+        """
+        Writes the envelope plot to `filename`: SVG files are rendered directly, other
+        formats (PNG by default) go through matplotlib, which must then be installed.
+        """
+        if filename.lower().endswith(".svg"):
+            plotting.save_svg(self.svg(), filename)
+            return
+        c = self.columns()
+        plotting.envelope_matplotlib(c["sigma_x"], c["sigma_y"], filename)
 
     def plot_2(self):
         self.plot("failure_envelope.png")
@@ -112,7 +135,22 @@ class FailureCriterion:
         return sx_unit, sy_unit, ply_stresses
 
     @staticmethod
-    def tsai_wu(laminate, limits, num_points=72):
+    def unit_stresses(laminate, num_points=72):
+        """
+        Ply stresses for unit in-plane loads in num_points directions.
+
+        The result only depends on the laminate, so it can be computed once and passed as
+        `stresses` to several criteria with the same num_points.
+
+        Returns:
+            tuple: (sx_unit, sy_unit, s1_all, s2_all, t12_all) as from _get_stresses_vectorized.
+        """
+        # Optimization: np.arange and simple math is significantly faster than np.linspace for small arrays
+        angles = np.arange(num_points, dtype=np.float64) * (2 * np.pi / max(1, num_points - 1))
+        return FailureCriterion._get_stresses_vectorized(laminate, angles, laminate.total_thickness)
+
+    @staticmethod
+    def tsai_wu(laminate, limits, num_points=72, stresses=None):
         Xt = limits['xt']
         Xc = limits['xc']
         Yt = limits['yt']
@@ -126,11 +164,10 @@ class FailureCriterion:
         F66 = 1/(S**2)
         F12 = -0.5 * np.sqrt(F11 * F22)
 
-        # Optimization: np.arange and simple math is significantly faster than np.linspace for small arrays
-        angles = np.arange(num_points, dtype=np.float64) * (2 * np.pi / max(1, num_points - 1))
-        h = laminate.total_thickness
-
-        sx_unit, sy_unit, s1_all, s2_all, t12_all = FailureCriterion._get_stresses_vectorized(laminate, angles, h)
+        metrics.incr("failure_evaluations")
+        if stresses is None:
+            stresses = FailureCriterion.unit_stresses(laminate, num_points)
+        sx_unit, sy_unit, s1_all, s2_all, t12_all = stresses
 
         # Optimization: Evaluating multi-term equations via chained in-place operations avoids
         # intermediate array allocations and provides significant performance improvements
@@ -166,21 +203,20 @@ class FailureCriterion:
         final_sx = sx_unit[valid_points] * min_factor[valid_points]
         final_sy = sy_unit[valid_points] * min_factor[valid_points]
 
-        return Envelope(list(zip(final_sx, final_sy)))
+        return Envelope(sx=final_sx, sy=final_sy)
 
     @staticmethod
-    def tsai_hill(laminate, limits, num_points=72):
+    def tsai_hill(laminate, limits, num_points=72, stresses=None):
         Xt = limits['xt']
         Xc = limits['xc']
         Yt = limits['yt']
         Yc = limits['yc']
         S = limits.get('s', limits.get('S', Xt/2))
 
-        # Optimization: np.arange and simple math is significantly faster than np.linspace for small arrays
-        angles = np.arange(num_points, dtype=np.float64) * (2 * np.pi / max(1, num_points - 1))
-        h = laminate.total_thickness
-
-        sx_unit, sy_unit, s1_all, s2_all, t12_all = FailureCriterion._get_stresses_vectorized(laminate, angles, h)
+        metrics.incr("failure_evaluations")
+        if stresses is None:
+            stresses = FailureCriterion.unit_stresses(laminate, num_points)
+        sx_unit, sy_unit, s1_all, s2_all, t12_all = stresses
 
         X = np.where(s1_all >= 0, Xt, Xc)
         Y = np.where(s2_all >= 0, Yt, Yc)
@@ -206,21 +242,20 @@ class FailureCriterion:
         final_sx = sx_unit[valid_points] * min_factor[valid_points]
         final_sy = sy_unit[valid_points] * min_factor[valid_points]
 
-        return Envelope(list(zip(final_sx, final_sy)))
+        return Envelope(sx=final_sx, sy=final_sy)
 
     @staticmethod
-    def max_stress(laminate, limits, num_points=72):
+    def max_stress(laminate, limits, num_points=72, stresses=None):
         Xt = limits['xt']
         Xc = limits['xc']
         Yt = limits['yt']
         Yc = limits['yc']
         S = limits.get('s', limits.get('S', Xt/2))
 
-        # Optimization: np.arange and simple math is significantly faster than np.linspace for small arrays
-        angles = np.arange(num_points, dtype=np.float64) * (2 * np.pi / max(1, num_points - 1))
-        h = laminate.total_thickness
-
-        sx_unit, sy_unit, s1_all, s2_all, t12_all = FailureCriterion._get_stresses_vectorized(laminate, angles, h)
+        metrics.incr("failure_evaluations")
+        if stresses is None:
+            stresses = FailureCriterion.unit_stresses(laminate, num_points)
+        sx_unit, sy_unit, s1_all, s2_all, t12_all = stresses
 
         with np.errstate(divide='ignore', invalid='ignore'):
             # Optimization: Taking the absolute value in the denominator under np.errstate
@@ -237,4 +272,4 @@ class FailureCriterion:
         final_sx = sx_unit[valid_points] * min_factor[valid_points]
         final_sy = sy_unit[valid_points] * min_factor[valid_points]
 
-        return Envelope(list(zip(final_sx, final_sy)))
+        return Envelope(sx=final_sx, sy=final_sy)
@@ -1,9 +1,46 @@
+from collections import namedtuple
+from functools import lru_cache
 import numpy as np
 
+_Tables = namedtuple("_Tables", "Q invariants")
+
+@lru_cache(maxsize=1024)
+def _material_tables(E1, E2, G12, v12):
+    """
+    Reduced stiffness Q (read-only) and Tsai-Pagano invariants for one set of elastic
+    constants. Cached, so materials with equal constants share the same tables.
+    """
+    v21 = v12 * E2 / E1
+    denom = 1 - v12 * v21
+    Q11 = E1 / denom
+    Q22 = E2 / denom
+    Q12 = (v12 * E2) / denom
+    Q66 = G12
+    Q = np.array([
+        [Q11, Q12, 0],
+        [Q12, Q22, 0],
+        [0, 0, Q66]
+    ], dtype=np.float64)
+    Q.setflags(write=False)
+
+    Q11, Q12, Q22, Q66 = float(Q[0, 0]), float(Q[0, 1]), float(Q[1, 1]), float(Q[2, 2])
+    U1 = (3*Q11 + 3*Q22 + 2*Q12 + 4*Q66) / 8
+    U2 = (Q11 - Q22) / 2
+    U3 = (Q11 + Q22 - 2*Q12 - 4*Q66) / 8
+    U4 = (Q11 + Q22 + 6*Q12 - 4*Q66) / 8
+    U5 = (Q11 + Q22 - 2*Q12 + 4*Q66) / 8
+    return _Tables(Q, (U1, U2, U3, U4, U5))
+
 class Material:
     """
     Represents an Orthotropic Material.
+
+    Materials are immutable: create a new one to change a property. Q() and the
+    invariants are computed on first use and shared between materials with the same
+    elastic constants; pickles carry only the constants.
     """
+    __slots__ = ("E1", "E2", "G12", "v12", "v21", "rho", "name", "_tables")
+
     def __init__(self, E1, E2, G12, v12, rho=0, name="Material"):
         """
         Initialize the material.
@@ -16,65 +53,61 @@ class Material:
             rho (float): Density (kg/m^3)
             name (str): Name of the material
         """
-        self.E1 = E1
-        self.E2 = E2
-        self.G12 = G12
-        self.v12 = v12
+        init = object.__setattr__
+        init(self, "E1", E1)
+        init(self, "E2", E2)
+        init(self, "G12", G12)
+        init(self, "v12", v12)
         # Calculate minor Poisson's ratio v21
-        self.v21 = v12 * E2 / E1
-        self.rho = rho
-        self.name = name
-        self._invariants = None
+        init(self, "v21", v12 * E2 / E1)
+        init(self, "rho", rho)
+        init(self, "name", name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable; create a new material to change '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable; cannot delete '{name}'")
+
+    def __getstate__(self):
+        # Constants only: the shared tables are looked up again on first use
+        return (self.E1, self.E2, self.G12, self.v12, self.rho, self.name)
+
+    def __setstate__(self, state):
+        Material.__init__(self, *state)
+
+    def _get_tables(self):
+        tables = getattr(self, "_tables", None)
+        if tables is None:
+            tables = _material_tables(self.E1, self.E2, self.G12, self.v12)
+            object.__setattr__(self, "_tables", tables)
+        return tables
 
     @property
     def invariants(self):
         """
-        Calculate and cache the Tsai-Pagano invariants.
+        The Tsai-Pagano invariants (computed once per set of elastic constants).
 
         Returns:
             tuple: (U1, U2, U3, U4, U5)
         """
-        if self._invariants is None:
-            Q = self.Q()
-            Q11 = Q[0, 0]
-            Q12 = Q[0, 1]
-            Q22 = Q[1, 1]
-            Q66 = Q[2, 2]
-
-            U1 = (3*Q11 + 3*Q22 + 2*Q12 + 4*Q66) / 8
-            U2 = (Q11 - Q22) / 2
-            U3 = (Q11 + Q22 - 2*Q12 - 4*Q66) / 8
-            U4 = (Q11 + Q22 + 6*Q12 - 4*Q66) / 8
-            U5 = (Q11 + Q22 - 2*Q12 + 4*Q66) / 8
-            self._invariants = (U1, U2, U3, U4, U5)
-
-        return self._invariants
+        return self._get_tables().invariants
 
     def Q(self):
         """
         Calculate the reduced stiffness matrix Q.
 
         Returns:
-            np.ndarray: 3x3 reduced stiffness matrix.
+            np.ndarray: 3x3 reduced stiffness matrix (read-only, shared).
         """
-        if not hasattr(self, '_Q_cache'):
-            denom = 1 - self.v12 * self.v21
-            Q11 = self.E1 / denom
-            Q22 = self.E2 / denom
-            Q12 = (self.v12 * self.E2) / denom
-            Q66 = self.G12
-            self._Q_cache = np.array([
-                [Q11, Q12, 0],
-                [Q12, Q22, 0],
-                [0, 0, Q66]
-            ])
-            self._Q_cache.setflags(write=False)
-        return self._Q_cache
+        return self._get_tables().Q
 
 class CarbonEpoxy(Material):
     """
     Standard Carbon/Epoxy material properties.
     """
+    __slots__ = ()
+
     def __init__(self, E1=140e9, E2=10e9, G12=5e9, v12=0.3, rho=1600):
         super().__init__(E1, E2, G12, v12, rho, "Carbon/Epoxy")
 
@@ -82,5 +115,7 @@ class GlassEpoxy(Material):
     """
     Standard Glass/Epoxy material properties.
     """
+    __slots__ = ()
+
     def __init__(self, E1=43e9, E2=10e9, G12=4.5e9, v12=0.29, rho=2000):
         super().__init__(E1, E2, G12, v12, rho, "Glass/Epoxy")
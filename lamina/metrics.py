@@ -0,0 +1,24 @@
+import threading
+from collections import Counter
+
+# Process-wide operation counters, read by the API's /api/metrics endpoint.
+# Names: laminate_builds, abd_inversions, failure_evaluations.
+_lock = threading.Lock()
+counters = Counter()
+
+
+def incr(name, n=1):
+    with _lock:
+        counters[name] += n
+
+
+def snapshot():
+    """Returns a copy of all counters."""
+    with _lock:
+        return dict(counters)
+
+
+def merge(delta):
+    """Adds counts recorded elsewhere (e.g. in a worker process) to this process's counters."""
+    with _lock:
+        counters.update(delta)
@@ -1,17 +1,183 @@
+import math
 import random
 import numpy as np
-from lamina.clt import Laminate
+from lamina.clt import Laminate, SCALAR_PLY_LIMIT
 from lamina.buckling import BucklingAnalysis
 
+LOAD_KEYS = ('Nx', 'Ny', 'Nxy', 'Mx', 'My', 'Mxy')
+
+def load_matrix(load):
+    """
+    Converts a load dict, a list of load dicts or an array into an (n_cases, 6) array
+    of [Nx, Ny, Nxy, Mx, My, Mxy] rows.
+    """
+    if isinstance(load, dict):
+        load = [load]
+    if len(load) and isinstance(load[0], dict):
+        return np.array([[case.get(k, 0) for k in LOAD_KEYS] for case in load], dtype=np.float64)
+
+    loads = np.atleast_2d(np.asarray(load, dtype=np.float64))
+    if loads.ndim != 2 or loads.shape[1] != 6:
+        raise ValueError("Load matrix must have shape (n_cases, 6)")
+    return loads
+
+def _tsai_wu_coefficients(limits):
+    Xt = limits['xt']
+    Xc = limits['xc']
+    Yt = limits['yt']
+    Yc = limits['yc']
+    S = limits.get('s', limits.get('S', Xt/2))
+
+    F1 = 1/Xt - 1/Xc
+    F2 = 1/Yt - 1/Yc
+    F11 = 1/(Xt * Xc)
+    F22 = 1/(Yt * Yc)
+    F66 = 1/(S*S)
+    F12 = -0.5 * np.sqrt(F11 * F22)
+    return F1, F2, F11, F22, F66, F12
+
+def _tsai_wu_roots(A, B):
+    """Positive root f of A f^2 + B f - 1 = 0 (inf where no failure occurs)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        f_quad = 2 / (B + np.sqrt(B * B + 4 * A))
+        f_lin = np.where(B > 0, 1.0 / B, np.inf)
+    return np.where(A < 1e-10, f_lin, f_quad)
+
+def _load_case_factors(laminate, loads, limits, plies=None):
+    """
+    Tsai-Wu safety factor of every load case at the mid-plane of the selected plies.
+
+    Returns:
+        np.ndarray: (n_plies, n_cases) safety factors.
+    """
+    F1, F2, F11, F22, F66, F12 = _tsai_wu_coefficients(limits)
+
+    # strain_curvature: (6, n_cases) in one matrix product for all cases
+    strain_curvature = laminate.abd @ loads.T
+    eps0 = strain_curvature[:3]
+    kappa = strain_curvature[3:]
+
+    c2, s2, cs, z = laminate.c2, laminate.s2, laminate.cs, laminate.z_mids
+    if plies is not None:
+        c2, s2, cs, z = c2[plies], s2[plies], cs[plies], z[plies]
+    c2 = c2[:, np.newaxis]
+    s2 = s2[:, np.newaxis]
+    cs = cs[:, np.newaxis]
+    z = z[:, np.newaxis]
+
+    ex = eps0[0] + z * kappa[0]
+    ey = eps0[1] + z * kappa[1]
+    gxy = eps0[2] + z * kappa[2]
+
+    e1 = c2 * ex + s2 * ey + cs * gxy
+    e2 = ex + ey - e1
+    g12 = 2*cs * (ey - ex) + (c2 - s2) * gxy
+
+    Q = laminate.material.Q()
+    s1 = Q[0,0]*e1 + Q[0,1]*e2
+    s2_ = Q[0,1]*e1 + Q[1,1]*e2
+    t12 = Q[2,2]*g12
+
+    A = s1 * s1
+    A *= F11
+    A += F22 * (s2_ * s2_)
+    A += F66 * (t12 * t12)
+    A += (2 * F12) * (s1 * s2_)
+
+    B = F1 * s1
+    B += F2 * s2_
+
+    return _tsai_wu_roots(A, B)
+
+def _safety_factor_bound_constant(material, limits):
+    """
+    Constant c such that c / E is a lower bound on the Tsai-Wu safety factor of any
+    ply, where E bounds the strain norm sqrt(ex^2 + ey^2 + gxy^2 / 2) through the thickness.
+
+    The strain norm is invariant under in-plane rotation, so with e' = (e1, e2, g12/sqrt(2))
+    and sigma = M e', A <= alpha E^2 and |B| <= beta E follow from the spectral norms.
+    """
+    F1, F2, F11, F22, F66, F12 = _tsai_wu_coefficients(limits)
+    Q = material.Q()
+    M = np.array([
+        [Q[0,0], Q[0,1], 0],
+        [Q[0,1], Q[1,1], 0],
+        [0, 0, np.sqrt(2) * Q[2,2]]
+    ])
+    F = np.array([
+        [F11, F12, 0],
+        [F12, F22, 0],
+        [0, 0, F66]
+    ])
+    alpha = np.linalg.eigvalsh(M.T @ F @ M).max()
+    beta = np.linalg.norm(M.T @ np.array([F1, F2, 0]))
+    return 2 / (beta + np.sqrt(beta * beta + 4 * alpha))
+
+def load_case_safety_factors(laminate, load, limits):
+    """
+    Tsai-Wu safety factor for every load case.
+
+    Args:
+        laminate (Laminate): Laminate object.
+        load: Load dict, list of load dicts or (n_cases, 6) array of [Nx, Ny, Nxy, Mx, My, Mxy].
+        limits (dict): Strength limits.
+
+    Returns:
+        np.ndarray: (n_cases,) minimum safety factor over all plies for each case.
+    """
+    loads = load_matrix(load)
+    return _load_case_factors(laminate, loads, limits).min(axis=0)
+
+def governing_safety_factor(laminate, load, limits, prune=True):
+    """
+    Governing (minimum) Tsai-Wu safety factor over a set of load cases.
+
+    With prune=True, load cases that can never govern are skipped: each case gets a
+    cheap lower bound from the compliance-derived strain norm, and the outer plies give
+    an upper bound on the governing factor. Cases whose lower bound exceeds it are not
+    evaluated through the thickness.
+
+    Returns:
+        tuple: (safety factor, index of the governing load case)
+    """
+    loads = load_matrix(load)
+    n_cases = loads.shape[0]
+    candidates = np.arange(n_cases)
+
+    if prune and n_cases > 1:
+        strain_curvature = laminate.abd @ loads.T
+        z_max = np.abs(laminate.z_mids).max()
+        bound = np.abs(strain_curvature[:3]) + z_max * np.abs(strain_curvature[3:])
+        E = np.sqrt(bound[0]**2 + bound[1]**2 + 0.5 * bound[2]**2)
+        with np.errstate(divide='ignore'):
+            lower = _safety_factor_bound_constant(laminate.material, limits) / E
+
+        outer = [0, len(laminate.stack) - 1]
+        upper = _load_case_factors(laminate, loads, limits, plies=outer).min()
+        candidates = candidates[lower <= upper]
+
+    factors = _load_case_factors(laminate, loads[candidates], limits).min(axis=0)
+    best = int(factors.argmin())
+    return factors[best], int(candidates[best])
+
 def calculate_safety_factor(laminate, load, limits):
     """
     Calculates the minimum safety factor using Tsai-Wu criterion.
     Vectorized implementation for performance.
+
+    Load matrices, lists of load cases and loads with moments are dispatched to
+    governing_safety_factor.
     """
+    if not isinstance(load, dict) or load.get('Mx', 0) or load.get('My', 0) or load.get('Mxy', 0):
+        return governing_safety_factor(laminate, load, limits)[0]
+
     Nx = load.get('Nx', 0)
     Ny = load.get('Ny', 0)
     Nxy = load.get('Nxy', 0)
 
+    if isinstance(laminate, Laminate) and len(laminate.stack) <= SCALAR_PLY_LIMIT:
+        return _safety_factor_scalar(laminate, Nx, Ny, Nxy, limits)
+
     ABD_inv = laminate.abd
 
     # Optimization: Algebraic expansion of matrix multiplication avoids array allocation overhead
@@ -38,18 +204,7 @@ def calculate_safety_factor(laminate, load, limits):
         kap_y += ABD_inv[4,2]*Nxy
         kap_xy += ABD_inv[5,2]*Nxy
 
-    Xt = limits['xt']
-    Xc = limits['xc']
-    Yt = limits['yt']
-    Yc = limits['yc']
-    S = limits.get('s', limits.get('S', Xt/2))
-
-    F1 = 1/Xt - 1/Xc
-    F2 = 1/Yt - 1/Yc
-    F11 = 1/(Xt * Xc)
-    F22 = 1/(Yt * Yc)
-    F66 = 1/(S*S)
-    F12 = -0.5 * np.sqrt(F11 * F22)
+    F1, F2, F11, F22, F66, F12 = _tsai_wu_coefficients(limits)
 
     # Vectorized operations
     # Optimization: Use precomputed trig values from Laminate if available
@@ -122,58 +277,161 @@ def calculate_safety_factor(laminate, load, limits):
         delta /= A
         return delta.min()
 
-    # Revert A for the slow path to its original mathematical definition
+    # Slow path for edge cases where A ~ 0: revert A to its original mathematical definition
     A *= 0.25
-    sqrt_delta = np.sqrt(delta)
-
-    # Slow path with explicit context manager for edge cases where A ~ 0
-    with np.errstate(divide='ignore', invalid='ignore'):
-        f1_quad = (-B + sqrt_delta) / (2 * A)
-
-        mask = A < 1e-10
-        f_lin = np.empty_like(B)
-        np.divide(1.0, B, out=f_lin, where=B>0)
-        f_lin[B<=0] = np.inf
-
-        f_all = np.where(mask, f_lin, f1_quad)
+    return _tsai_wu_roots(A, B).min()
 
-    return f_all.min()
+def _safety_factor_scalar(laminate, Nx, Ny, Nxy, limits):
+    """
+    calculate_safety_factor for small laminates: a loop over plies with floats, which
+    beats the fixed cost of the vectorized path's NumPy temporaries at these sizes.
+    """
+    abd = laminate.abd.tolist()
+    ex0, ey0, gxy0, kx, ky, kxy = [row[0]*Nx + row[1]*Ny + row[2]*Nxy for row in abd]
+    F1, F2, F11, F22, F66, F12 = [float(f) for f in _tsai_wu_coefficients(limits)]
+    F12_2 = 2 * F12
+    Q = laminate.material.Q().tolist()
+    Q11, Q12, Q22, Q66 = Q[0][0], Q[0][1], Q[1][1], Q[2][2]
+
+    factor = math.inf
+    for c2, s2, cs, z in zip(laminate.c2.tolist(), laminate.s2.tolist(), laminate.cs.tolist(), laminate.z_mids.tolist()):
+        ex = ex0 + kx * z
+        ey = ey0 + ky * z
+        gxy = gxy0 + kxy * z
+
+        e1 = c2 * ex + s2 * ey + cs * gxy
+        e2 = ex + ey - e1
+        g12 = 2*cs * (ey - ex) + (c2 - s2) * gxy
+
+        s1 = Q11*e1 + Q12*e2
+        s2_ = Q12*e1 + Q22*e2
+        t12 = Q66*g12
+
+        A = F11 * (s1 * s1) + F22 * (s2_ * s2_) + F66 * (t12 * t12) + F12_2 * (s1 * s2_)
+        B = F1*s1 + F2*s2_
+        # Positive root of A f^2 + B f - 1 = 0, as in the vectorized path
+        if A >= 1e-10:
+            f = (math.sqrt(B * B + 4 * A) - B) / (2 * A)
+        elif B > 0:
+            f = 1.0 / B
+        else:
+            continue
+        if f < factor:
+            factor = f
+    return factor
+
+class _OptimizationStopped(Exception):
+    pass
 
 class GeneticAlgorithm:
-    def __init__(self, material, load, constraints, population_size=20, generations=10):
+    def __init__(self, material, load, constraints, population_size=20, generations=10, rules=None,
+                 surrogate=None, callback=None):
+        """
+        Args:
+            rules (ManufacturingRules): Optional stacking rules. Offspring are repaired
+                towards them and designs that still violate them are rejected before
+                any laminate is built.
+            surrogate (QuadraticSurrogate): Optional surrogate fitted online from exact
+                evaluations. Once trained, only the offspring it ranks highest are
+                evaluated exactly; see surrogate.stats() for its accuracy.
+            callback (callable): Optional callback(info) invoked after every generation with
+                the ply count, generation index, best score and best full stack so far.
+                Returning True stops the optimization (optimize() then returns None).
+        """
         self.material = material
-        self.load = load
+        # Multiple load cases are converted once to an (n_cases, 6) matrix
+        self.load = load if isinstance(load, dict) else load_matrix(load)
         self.constraints = constraints
         self.pop_size = population_size
         self.generations = generations
         self.valid_angles = [0, 45, -45, 90]
+        self.rules = rules
+        self.surrogate = surrogate
+        self.callback = callback
+        self.stopped = False
         self._eval_cache = {}
+        # Best half-stacks of every completed GA run, keyed by half ply count.
+        # Used to warm-start runs at neighbouring ply counts.
+        self._elites = {}
+        self.n_evaluations = 0
 
     def optimize(self, min_plies=4, max_plies=16):
-        # Try finding min weight
-        for n_plies in range(min_plies, max_plies + 1, 2):
-            half_n = n_plies // 2
-
-            # Run GA
-            solution = self._run_ga(half_n)
-
-            if solution:
-                return solution # Found minimal weight solution
-
-        return None
+        """
+        Finds the lightest feasible symmetric laminate between min_plies and max_plies.
+
+        Feasibility is assumed to be monotonic in the ply count, so instead of a
+        linear scan the candidate counts are bracketed by galloping (1, 2, 4, ...
+        steps) and then bisected. Each GA run is seeded from the best designs of
+        the nearest ply count already explored.
+
+        Returns:
+            list: Full symmetric stack, or None if no feasible design was found.
+        """
+        try:
+            return self._search_ply_counts(min_plies, max_plies)
+        except _OptimizationStopped:
+            self.stopped = True
+            return None
+
+    def _search_ply_counts(self, min_plies, max_plies):
+        counts = list(range(min_plies, max_plies + 1, 2))
+        if not counts:
+            return None
+
+        solutions = {}
+
+        def feasible(idx):
+            if idx not in solutions:
+                solutions[idx] = self._run_ga(counts[idx] // 2)
+            return solutions[idx] is not None
+
+        # Galloping search: find the first probed count with a feasible design
+        lo = -1 # Largest index known to be infeasible
+        hi = None # Smallest index known to be feasible
+        idx, step = 0, 1
+        while idx < len(counts):
+            if feasible(idx):
+                hi = idx
+                break
+            lo = idx
+            idx += step
+            step *= 2
+
+        if hi is None:
+            # Galloping may have overshot the end without probing the thickest laminate
+            last = len(counts) - 1
+            if lo != last and feasible(last):
+                hi = last
+            else:
+                # The GA is stochastic, so a skipped count may still succeed where the probed
+                # ones did not: fall back to scanning the remaining counts in order
+                hi = next((i for i in range(len(counts)) if i not in solutions and feasible(i)), None)
+                if hi is None:
+                    return None
+                lo = max((i for i in solutions if i < hi and solutions[i] is None), default=-1)
+
+        # Bisection between the last infeasible and the first feasible count
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if feasible(mid):
+                hi = mid
+            else:
+                lo = mid
+
+        return solutions[hi]
 
     def _run_ga(self, n_plies):
-        population = [self._random_stack(n_plies) for _ in range(self.pop_size)]
+        population = self._seed_population(n_plies)
 
         # Keep track of best ever found in this run
         best_ever_stack = None
         best_ever_score = -float('inf')
 
         for gen in range(self.generations):
-            fitness_scores = []
-            for stack in population:
-                score = self._evaluate(stack)
-                fitness_scores.append((score, stack))
+            population, feasible = self._apply_rules(population)
+
+            scores = self._score_population(population, feasible)
+            fitness_scores = list(zip(scores, population))
 
             fitness_scores.sort(key=lambda x: x[0], reverse=True)
 
@@ -181,6 +439,14 @@ class GeneticAlgorithm:
                 best_ever_score = fitness_scores[0][0]
                 best_ever_stack = fitness_scores[0][1]
 
+            if self.callback is not None and self.callback({
+                "plies": 2 * n_plies,
+                "generation": gen,
+                "best_score": float(best_ever_score),
+                "best_stack": best_ever_stack + best_ever_stack[::-1],
+            }):
+                raise _OptimizationStopped()
+
             # Elitism
             parents = fitness_scores[:max(2, self.pop_size//2)]
             next_gen = [p[1] for p in parents]
@@ -194,10 +460,83 @@ class GeneticAlgorithm:
 
             population = next_gen
 
+        self._elites[n_plies] = [p[1] for p in parents]
+
         if best_ever_score > 0:
             return best_ever_stack + best_ever_stack[::-1] # Return full symmetric stack
         return None
 
+    def _score_population(self, population, feasible):
+        """
+        Scores a population, pre-screening unseen designs with the surrogate if one is set.
+
+        Designs rejected by the surrogate are not evaluated and score -inf for this generation.
+        """
+        scores = [-1.0] * len(population)
+        unseen = []
+        for i, (stack, ok) in enumerate(zip(population, feasible)):
+            if not ok:
+                continue
+            if self.surrogate is None or tuple(stack) in self._eval_cache:
+                scores[i] = self._evaluate(stack)
+            else:
+                unseen.append(i)
+
+        if unseen:
+            stacks = [population[i] for i in unseen]
+            selected = self.surrogate.select(stacks)
+            exact_stacks = []
+            exact_scores = []
+            for i, stack, keep in zip(unseen, stacks, selected):
+                if keep:
+                    scores[i] = self._evaluate(stack)
+                    exact_stacks.append(stack)
+                    exact_scores.append(scores[i])
+                else:
+                    scores[i] = -float('inf')
+            self.surrogate.observe(exact_stacks, exact_scores)
+
+        return scores
+
+    def _apply_rules(self, population):
+        """
+        Repairs a population against the manufacturing rules in one vectorized pass.
+
+        Returns:
+            tuple: (population, feasible) where feasible flags designs that pass all rules.
+        """
+        if self.rules is None or not population or not population[0]:
+            return population, [True] * len(population)
+        repaired = self.rules.repair(np.array(population))
+        return repaired.tolist(), self.rules.check(repaired).tolist()
+
+    def _seed_population(self, n):
+        """
+        Builds the initial population for a run with n half-plies.
+
+        Up to half of the population is warm-started from the elites of the
+        nearest ply count already explored (ties prefer the thicker laminate),
+        resized by inserting or removing random plies. The rest is random to
+        keep diversity.
+        """
+        population = []
+        if self._elites:
+            nearest = min(self._elites, key=lambda k: (abs(k - n), -k))
+            for stack in self._elites[nearest][:self.pop_size // 2]:
+                population.append(self._resize_stack(stack, n))
+
+        while len(population) < self.pop_size:
+            population.append(self._random_stack(n))
+        return population
+
+    def _resize_stack(self, stack, n):
+        stack = list(stack)
+        while len(stack) < n:
+            stack.insert(random.randint(0, len(stack)), random.choice(self.valid_angles))
+        while len(stack) > n:
+            del stack[random.randrange(len(stack))]
+        return stack
+
     def _random_stack(self, n):
         return [random.choice(self.valid_angles) for _ in range(n)]
 
@@ -217,6 +556,7 @@ class GeneticAlgorithm:
         if cache_key in self._eval_cache:
             return self._eval_cache[cache_key]
 
+        self.n_evaluations += 1
         full_stack = half_stack + half_stack[::-1]
         lam = Laminate(self.material, full_stack, symmetry=False)
 
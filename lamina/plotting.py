@@ -0,0 +1,373 @@
+import hashlib
+import math
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+# Rendered SVGs keyed by a hash of their input arrays and options. Catalogues repeat
+# layups often, so identical plots are only rendered once.
+_CACHE_SIZE = 256
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+_STYLE = (
+    "text{font-family:sans-serif;font-size:11px;fill:#333}"
+    ".title{font-size:14px;text-anchor:middle}"
+    ".grid{fill:none;stroke:#ddd;stroke-width:1}"
+    ".axis{fill:none;stroke:#888;stroke-width:1}"
+    ".curve{fill:none;stroke:#1f77b4;stroke-width:1.5;stroke-linejoin:round}"
+)
+
+
+def _cached(kind, arrays, options, render):
+    digest = hashlib.sha256(kind.encode())
+    for arr in arrays:
+        arr = np.ascontiguousarray(arr, dtype=np.float64)
+        digest.update(str(arr.shape).encode())
+        digest.update(arr.tobytes())
+    digest.update(repr(sorted(options.items())).encode())
+    key = digest.hexdigest()
+
+    with _cache_lock:
+        svg = _cache.get(key)
+        if svg is not None:
+            _cache.move_to_end(key)
+            return svg
+    svg = render()
+    with _cache_lock:
+        _cache[key] = svg
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return svg
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def nice_ticks(lo, hi, count=5):
+    """
+    Round tick positions covering [lo, hi] with steps of 1, 2 or 5 times a power of ten.
+
+    Returns:
+        np.ndarray: Tick values, first <= lo and last >= hi.
+    """
+    if not hi > lo:
+        hi = lo + (abs(lo) or 1.0)
+    raw = (hi - lo) / count
+    magnitude = 10.0 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw)
+    start = math.floor(lo / step) * step
+    stop = math.ceil(hi / step) * step
+    return start + step * np.arange(round((stop - start) / step) + 1)
+
+
+def _unit(values, unit):
+    """Scales values into an SI-prefixed unit (Pa -> MPa, GPa) for axis labels."""
+    peak = float(np.max(np.abs(values))) if len(values) else 0.0
+    for factor, prefix in ((1e9, "G"), (1e6, "M"), (1e3, "k")):
+        if peak >= factor:
+            return factor, prefix + unit
+    return 1.0, unit
+
+
+def _label(value):
+    return f"{value:.6g}"
+
+
+def _path(x, y, close=False):
+    # Optimization: one vectorized formatting pass per coordinate array
+    xs = np.char.mod("%.2f", x)
+    ys = np.char.mod("%.2f", y)
+    points = [f"{a},{b}" for a, b in zip(xs.tolist(), ys.tolist())]
+    if not points:
+        return ""
+    return "M" + " L".join(points) + (" Z" if close else "")
+
+
+def _document(width, height, title, body):
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}">'
+        f"<style>{_STYLE}</style>"
+        f'<rect width="{width}" height="{height}" fill="#fff"/>'
+        f'<text class="title" x="{width / 2:g}" y="20">{escape(title)}</text>'
+        + "".join(body)
+        + "</svg>"
+    )
+
+
+def polar_svg(angles, values, title="Stiffness Polar Plot", unit="Pa", size=400):
+    """
+    Renders a polar line plot (e.g. Ex against the loading angle) as an SVG document.
+
+    Args:
+        angles (array): Angles in degrees.
+        values (array): Radial values, same length as angles.
+        title (str): Plot title.
+        unit (str): Unit of the values; labels use an SI prefix (GPa for moduli).
+        size (int): Width and height in pixels.
+
+    Returns:
+        str: The SVG document.
+    """
+    options = {"title": title, "unit": unit, "size": size}
+    return _cached("polar", (angles, values), options, lambda: _render_polar(angles, values, **options))
+
+
+def _render_polar(angles, values, title, unit, size):
+    values = np.asarray(values, dtype=np.float64)
+    rads = np.radians(np.asarray(angles, dtype=np.float64))
+    factor, unit = _unit(values, unit)
+    ticks = nice_ticks(0.0, float(values.max()) / factor if len(values) else 1.0, 4)[1:]
+
+    cx = cy = size / 2
+    cy += 12  # leave room for the title
+    radius = size / 2 - 40
+    scale = radius / ticks[-1]
+
+    body = []
+    for tick in ticks:
+        body.append(f'<circle class="grid" cx="{cx:g}" cy="{cy:g}" r="{tick * scale:.2f}"/>')
+        body.append(f'<text x="{cx + 3:g}" y="{cy - tick * scale - 3:.2f}">{_label(tick)}</text>')
+    for spoke in range(0, 360, 30):
+        t = math.radians(spoke)
+        x, y = cx + radius * math.cos(t), cy - radius * math.sin(t)
+        body.append(f'<path class="grid" d="M{cx:g},{cy:g} L{x:.2f},{y:.2f}"/>')
+        lx, ly = cx + (radius + 14) * math.cos(t), cy - (radius + 14) * math.sin(t)
+        body.append(f'<text x="{lx:.2f}" y="{ly + 4:.2f}" text-anchor="middle">{spoke}°</text>')
+
+    r = values / factor * scale
+    body.append(f'<path class="curve" d="{_path(cx + r * np.cos(rads), cy - r * np.sin(rads), close=True)}"/>')
+    body.append(f'<text x="{size - 6}" y="{size + 6}" text-anchor="end">{escape(unit)}</text>')
+    return _document(size, size + 12, title, body)
+
+
+def envelope_svg(sx, sy, title="Failure Envelope", unit="Pa", width=480, height=420):
+    """
+    Renders a closed sigma_x / sigma_y failure envelope with equal axis scales as SVG.
+
+    Args:
+        sx, sy (array): Envelope points (Pa).
+        title (str): Plot title.
+        unit (str): Unit of the stresses; labels use an SI prefix (MPa for strengths).
+        width, height (int): Size in pixels.
+
+    Returns:
+        str: The SVG document.
+    """
+    options = {"title": title, "unit": unit, "width": width, "height": height}
+    return _cached("envelope", (sx, sy), options, lambda: _render_envelope(sx, sy, **options))
+
+
+def _render_envelope(sx, sy, title, unit, width, height):
+    sx = np.asarray(sx, dtype=np.float64)
+    sy = np.asarray(sy, dtype=np.float64)
+    factor, unit = _unit(np.concatenate([sx, sy]), unit)
+    sx, sy = sx / factor, sy / factor
+
+    left, right, top, bottom = 60, 20, 32, 44
+    plot_w, plot_h = width - left - right, height - top - bottom
+    xticks = nice_ticks(float(sx.min()), float(sx.max())) if len(sx) else nice_ticks(-1.0, 1.0)
+    yticks = nice_ticks(float(sy.min()), float(sy.max())) if len(sy) else nice_ticks(-1.0, 1.0)
+
+    # Equal scales on both axes, like axis('equal'); the shorter range is centred
+    scale = min(plot_w / (xticks[-1] - xticks[0]), plot_h / (yticks[-1] - yticks[0]))
+    x0 = left + (plot_w - (xticks[-1] - xticks[0]) * scale) / 2
+    y0 = top + (plot_h + (yticks[-1] - yticks[0]) * scale) / 2
+
+    def px(x):
+        return x0 + (x - xticks[0]) * scale
+
+    def py(y):
+        return y0 - (y - yticks[0]) * scale
+
+    x_lo, x_hi, y_lo, y_hi = px(xticks[0]), px(xticks[-1]), py(yticks[0]), py(yticks[-1])
+    body = []
+    for tick in xticks:
+        x = px(tick)
+        body.append(f'<path class="grid" d="M{x:.2f},{y_lo:.2f} L{x:.2f},{y_hi:.2f}"/>')
+        body.append(f'<text x="{x:.2f}" y="{y_lo + 14:.2f}" text-anchor="middle">{_label(tick)}</text>')
+    for tick in yticks:
+        y = py(tick)
+        body.append(f'<path class="grid" d="M{x_lo:.2f},{y:.2f} L{x_hi:.2f},{y:.2f}"/>')
+        body.append(f'<text x="{x_lo - 4:.2f}" y="{y + 4:.2f}" text-anchor="end">{_label(tick)}</text>')
+    if xticks[0] <= 0 <= xticks[-1]:
+        body.append(f'<path class="axis" d="M{px(0):.2f},{y_lo:.2f} L{px(0):.2f},{y_hi:.2f}"/>')
+    if yticks[0] <= 0 <= yticks[-1]:
+        body.append(f'<path class="axis" d="M{x_lo:.2f},{py(0):.2f} L{x_hi:.2f},{py(0):.2f}"/>')
+
+    body.append(f'<path class="curve" d="{_path(px(sx), py(sy), close=True)}"/>')
+    label = escape(unit)
+    body.append(f'<text x="{(x_lo + x_hi) / 2:.2f}" y="{height - 8}" text-anchor="middle">Sigma_x ({label})</text>')
+    body.append(
+        f'<text transform="translate(14,{(y_lo + y_hi) / 2:.2f}) rotate(-90)" text-anchor="middle">Sigma_y ({label})</text>'
+    )
+    return _document(width, height, title, body)
+
+
+def save_svg(svg, filename):
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(svg)
+
+
+def _matplotlib():
+    # matplotlib is imported on first use only: it is an optional dependency
+    try:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+    except ImportError as exc:
+        raise ImportError("matplotlib is required for raster plots; use an .svg filename instead") from exc
+    return Figure, FigureCanvasAgg
+
+
+class FigureRenderer:
+    """
+    Draws polar and envelope plots on two matplotlib figures created once and reused.
+
+    Figures, axes and line artists are built in the constructor; each plot only replaces
+    the line data, rescales and saves. The figures use their own Agg canvas rather than
+    pyplot, so nothing is shared between renderers: use one per thread (see renderer()).
+    """
+    def __init__(self):
+        Figure, FigureCanvasAgg = _matplotlib()
+
+        self._polar_fig = Figure()
+        FigureCanvasAgg(self._polar_fig)
+        self._polar_ax = self._polar_fig.add_subplot(111, projection='polar')
+        self._polar_line, = self._polar_ax.plot([], [])
+
+        self._envelope_fig = Figure()
+        FigureCanvasAgg(self._envelope_fig)
+        ax = self._envelope_ax = self._envelope_fig.add_subplot(111)
+        self._envelope_line, = ax.plot([], [])
+        ax.set_xlabel("Sigma_x (Pa)")
+        ax.set_ylabel("Sigma_y (Pa)")
+        ax.grid(True)
+        # Same as axis('equal'), re-applied to the new data limits on every draw
+        ax.set_aspect('equal', adjustable='datalim')
+
+    def polar(self, angles, values, filename, title="Stiffness Polar Plot (Ex)"):
+        self._polar_line.set_data(np.radians(angles), values)
+        self._polar_ax.relim()
+        self._polar_ax.autoscale_view()
+        self._polar_ax.set_title(title)
+        self._polar_fig.savefig(filename)
+
+    def envelope(self, sx, sy, filename, title="Failure Envelope"):
+        # Close the loop
+        self._envelope_line.set_data(np.append(sx, sx[:1]), np.append(sy, sy[:1]))
+        self._envelope_ax.relim()
+        self._envelope_ax.autoscale_view()
+        self._envelope_ax.set_title(title)
+        self._envelope_fig.savefig(filename)
+
+
+_local = threading.local()
+
+
+def renderer():
+    """The calling thread's FigureRenderer, created on first use."""
+    instance = getattr(_local, "renderer", None)
+    if instance is None:
+        instance = _local.renderer = FigureRenderer()
+    return instance
+
+
+def polar_matplotlib(angles, values, filename, title="Stiffness Polar Plot (Ex)"):
+    renderer().polar(angles, values, filename, title)
+
+
+def envelope_matplotlib(sx, sy, filename, title="Failure Envelope"):
+    renderer().envelope(sx, sy, filename, title)
+
+
+def _render(job):
+    kind, filename, x, y, title = job
+    if filename.endswith(".svg"):
+        svg = polar_svg(x, y, title) if kind == "polar" else envelope_svg(x, y, title)
+        save_svg(svg, filename)
+    elif kind == "polar":
+        polar_matplotlib(x, y, filename, title)
+    else:
+        envelope_matplotlib(x, y, filename, title)
+    return filename
+
+
+def _render_chunk(jobs):
+    """Worker task: renders a list of jobs with the worker's own FigureRenderer."""
+    return [_render(job) for job in jobs]
+
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9._-]")
+
+
+def _safe_name(name):
+    # Names become file names inside the output directory: no separators, no dot files
+    return _UNSAFE.sub("_", str(name)).lstrip(".") or "_"
+
+
+def render_catalogue(laminates, directory, limits=None, kinds=("polar", "envelope"),
+                     fmt="png", names=None, workers=None, chunksize=8):
+    """
+    Writes polar and/or Tsai-Wu envelope plots for many laminates.
+
+    Results are computed in this process (cheap next to drawing); drawing is spread over
+    a process pool in which each worker reuses one set of figures.
+    Files are named "<name>_<kind>.<fmt>", where names default to "laminate_0000",
+    "laminate_0001", ..., so reruns overwrite the same files.
+
+    Args:
+        laminates (list): Laminate objects.
+        directory (str): Output directory, created if needed.
+        limits (dict): Strength limits; required for envelopes.
+        kinds (tuple): "polar" and/or "envelope".
+        fmt (str): "png" (or any matplotlib format) or "svg" (no matplotlib needed).
+        names (list): One name per laminate.
+        workers (int): Worker processes; None for os.cpu_count(), 0 or 1 to draw in-process.
+        chunksize (int): Plots sent to a worker at a time.
+
+    Returns:
+        list: Paths of the written files, in input order.
+    """
+    from lamina.failure import FailureCriterion
+
+    if names is None:
+        names = [f"laminate_{i:04d}" for i in range(len(laminates))]
+    elif len(names) != len(laminates):
+        raise ValueError("Need one name per laminate")
+    safe = [_safe_name(name) for name in names]
+    if len(set(safe)) != len(safe):
+        raise ValueError("Plot names must be unique")
+    if "envelope" in kinds and limits is None:
+        raise ValueError("Limits are required for envelopes")
+
+    os.makedirs(directory, exist_ok=True)
+    jobs = []
+    for lam, name in zip(laminates, safe):
+        for kind in kinds:
+            filename = os.path.join(directory, f"{name}_{kind}.{fmt}")
+            if kind == "polar":
+                c = lam.polar_stiffness().columns()
+                jobs.append(("polar", filename, c["angle"], c["Ex"], "Stiffness Polar Plot (Ex)"))
+            elif kind == "envelope":
+                c = FailureCriterion.tsai_wu(lam, limits).columns()
+                jobs.append(("envelope", filename, c["sigma_x"], c["sigma_y"], "Failure Envelope"))
+            else:
+                raise ValueError(f"Unknown plot kind: {kind}")
+
+    chunks = [jobs[i:i + chunksize] for i in range(0, len(jobs), chunksize)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(chunks))
+    if workers <= 1:
+        return [path for chunk in chunks for path in _render_chunk(chunk)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [path for paths in pool.map(_render_chunk, chunks) for path in paths]
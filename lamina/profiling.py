@@ -0,0 +1,232 @@
+"""
+Opt-in profiling of lamina's hot paths.
+
+Nothing is instrumented until a profiler is active: enabling swaps the listed methods
+for timing wrappers on their classes/modules, and disabling puts the originals back,
+so the disabled cost is zero.
+
+    from lamina.profiling import profile
+
+    with profile() as prof:
+        ga.optimize()
+    print(prof.table())
+    prof.write_chrome_trace("ga.json")  # open in chrome://tracing or Perfetto
+
+Setting LAMINA_PROFILE=1 profiles the whole process and prints the table to stderr at
+exit; LAMINA_PROFILE=<file>.json also writes a Chrome trace there.
+
+Only calls that go through the class or module attribute are seen (e.g. not functions
+imported by name before profiling started). Child processes inherit the variable and
+report separately, writing their traces to <file>.<pid>.json.
+"""
+import atexit
+import functools
+import importlib
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+# (module, owner attribute or None for module-level functions, attribute, kind)
+# kind: "method", "static", "function", or "property:<cache attribute>" for lazy properties
+TARGETS = [
+    ("lamina.clt", "Laminate", "update", "method"),
+    ("lamina.clt", "Laminate", "abd", "property:_abd"),
+    ("lamina.clt", "Laminate", "K_all", "property:_K_all"),
+    ("lamina.clt", "Laminate", "K_all_z", "property:_K_all_z"),
+    ("lamina.clt", "Laminate", "polar_stiffness", "method"),
+    ("lamina.failure", "FailureCriterion", "_get_stresses_vectorized", "static"),
+    ("lamina.failure", "FailureCriterion", "tsai_wu", "static"),
+    ("lamina.failure", "FailureCriterion", "tsai_hill", "static"),
+    ("lamina.failure", "FailureCriterion", "max_stress", "static"),
+    ("lamina.buckling", "BucklingAnalysis", "critical_load", "static"),
+    ("lamina.optimization", None, "calculate_safety_factor", "function"),
+    ("lamina.optimization", "GeneticAlgorithm", "_evaluate", "evaluate"),
+]
+
+_lock = threading.Lock()
+_active = () # running Profilers, replaced (never mutated) so wrappers can read it unlocked
+_originals = {} # (owner, attribute) -> original class/module attribute
+_local = threading.local()
+
+
+class Profiler:
+    """Call counts, cumulative and self time per instrumented function, plus trace events."""
+    def __init__(self, trace=True):
+        """
+        Args:
+            trace (bool): Keep one event per call for write_chrome_trace(). Disable for
+                long runs where only the summary table is needed.
+        """
+        self.trace = trace
+        self.stats = {} # name -> [calls, total seconds, self seconds]
+        self.events = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _record(self, name, start, elapsed, child):
+        with self._lock:
+            entry = self.stats.get(name)
+            if entry is None:
+                entry = self.stats[name] = [0, 0.0, 0.0]
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] += elapsed - child
+            if self.trace:
+                self.events.append({
+                    "name": name, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                    "ts": (start - self._origin) * 1e6, "dur": elapsed * 1e6,
+                })
+
+    def summary(self):
+        """
+        Returns:
+            list: {"name", "calls", "total", "self", "mean"} dicts (seconds), slowest total first.
+        """
+        with self._lock:
+            items = [(name, list(entry)) for name, entry in self.stats.items()]
+        rows = [
+            {"name": name, "calls": calls, "total": total, "self": own, "mean": total / calls}
+            for name, (calls, total, own) in items
+        ]
+        return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+    def table(self):
+        lines = [f"{'function':44s} {'calls':>9s} {'total ms':>10s} {'self ms':>10s} {'mean us':>10s}"]
+        for row in self.summary():
+            lines.append(
+                f"{row['name']:44s} {row['calls']:9d} {row['total'] * 1e3:10.2f} "
+                f"{row['self'] * 1e3:10.2f} {row['mean'] * 1e6:10.1f}"
+            )
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        """Trace Event Format document (chrome://tracing, Perfetto)."""
+        with self._lock:
+            return {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, filename):
+        with open(filename, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+def _timed(name, fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        # Children add their elapsed time to the parent's frame, for self time
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            child = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            for profiler in _active:
+                profiler._record(name, start, elapsed, child)
+    return wrapper
+
+
+def _wrap(label, original, kind):
+    if kind == "static":
+        return staticmethod(_timed(label, original.__func__))
+    if kind.startswith("property:"):
+        cache = kind.split(":", 1)[1]
+        compute = _timed(label, original.fget)
+        hit = _timed(label + " (cached)", original.fget)
+
+        # Cached reads are recorded apart so they don't dilute the cost of computing
+        def fget(self):
+            if getattr(self, cache, None) is None:
+                return compute(self)
+            return hit(self)
+        return property(fget, original.fset, original.fdel, original.__doc__)
+    if kind == "evaluate":
+        compute = _timed(label, original)
+        hit = _timed(label + " (cache hit)", original)
+
+        @functools.wraps(original)
+        def evaluate(self, half_stack):
+            if tuple(half_stack) in self._eval_cache:
+                return hit(self, half_stack)
+            return compute(self, half_stack)
+        return evaluate
+    return _timed(label, original)
+
+
+def _instrument():
+    for module_name, owner_name, attribute, kind in TARGETS:
+        module = importlib.import_module(module_name)
+        owner = getattr(module, owner_name) if owner_name else module
+        original = owner.__dict__.get(attribute) if owner_name else getattr(module, attribute, None)
+        if original is None:
+            continue
+        label = f"{owner_name}.{attribute}" if owner_name else attribute
+        _originals[(owner, attribute)] = original
+        setattr(owner, attribute, _wrap(label, original, kind))
+
+
+def _restore():
+    for (owner, attribute), original in _originals.items():
+        setattr(owner, attribute, original)
+    _originals.clear()
+
+
+def start(profiler=None):
+    """Activates a profiler (a new one by default), instrumenting lamina on first use."""
+    global _active
+    profiler = profiler or Profiler()
+    with _lock:
+        if not _active:
+            _instrument()
+        _active = _active + (profiler,)
+    return profiler
+
+
+def stop(profiler):
+    global _active
+    with _lock:
+        _active = tuple(p for p in _active if p is not profiler)
+        if not _active:
+            _restore()
+    return profiler
+
+
+class profile:
+    """Context manager profiling lamina calls made inside its block."""
+    def __init__(self, trace=True):
+        self.profiler = Profiler(trace)
+
+    def __enter__(self):
+        return start(self.profiler)
+
+    def __exit__(self, *exc):
+        stop(self.profiler)
+        return False
+
+
+def _profile_process(setting):
+    profiler = start(Profiler(trace=setting.endswith(".json")))
+    filename = setting
+    if multiprocessing.parent_process() is not None:
+        # Worker processes (e.g. the API's compute pool) must not overwrite the parent's trace
+        filename = f"{setting[:-5]}.{os.getpid()}.json"
+
+    def report():
+        print(f"lamina profile (pid {os.getpid()})", file=sys.stderr)
+        print(profiler.table(), file=sys.stderr)
+        if profiler.trace:
+            profiler.write_chrome_trace(filename)
+    atexit.register(report)
+    return profiler
+
+
+_setting = os.environ.get("LAMINA_PROFILE", "")
+if _setting and _setting != "0":
+    _profile_process(_setting)
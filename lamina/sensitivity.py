@@ -0,0 +1,217 @@
+import numpy as np
+from lamina.buckling import BucklingAnalysis
+from lamina.optimization import load_matrix, _tsai_wu_coefficients, _load_case_factors
+
+DEG = np.pi / 180
+
+
+def _Q_bar_derivative(laminate):
+    """
+    Derivative of the flattened Q_bar of every ply with respect to its angle (per degree).
+
+    Returns:
+        np.ndarray: (9, n_plies) array in the same layout as Laminate._get_Q_bar_from_trig.
+    """
+    U1, U2, U3, U4, U5 = laminate.material.invariants
+    cos2 = laminate.c2 - laminate.s2
+    sin2 = 2 * laminate.cs
+    cos4 = cos2 * cos2 - sin2 * sin2
+    sin4 = 2 * sin2 * cos2
+
+    d11 = -2*U2*sin2 - 4*U3*sin4
+    d22 = 2*U2*sin2 - 4*U3*sin4
+    d12 = 4*U3*sin4
+    d16 = U2*cos2 + 4*U3*cos4
+    d26 = U2*cos2 - 4*U3*cos4
+
+    res = np.array([
+        d11, d12, d16,
+        d12, d22, d26,
+        d16, d26, d12
+    ])
+    res *= DEG
+    return res
+
+
+def _interface_derivative(w):
+    """
+    Derivative of sum_i w_i(z_i) with respect to each ply thickness, given the interface
+    weights w (9, n_plies + 1). Interface z_i moves by -1/2 + [i >= j] when ply j thickens.
+    """
+    tail = np.cumsum(w[:, ::-1], axis=1)[:, ::-1]
+    return tail[:, 1:] - 0.5 * tail[:, :1]
+
+
+def abd_sensitivity(laminate):
+    """
+    Analytic derivatives of A, B and D with respect to the angle (per degree) and the
+    thickness of every ply in laminate.stack (the full, mirrored stack for symmetric
+    laminates; sum mirrored pairs for derivatives of the raw stack).
+
+    Returns:
+        dict: 'A', 'B', 'D' (3, 3) values and 'dA_dtheta', 'dB_dtheta', 'dD_dtheta',
+        'dA_dt', 'dB_dt', 'dD_dt' (n_plies, 3, 3) derivatives.
+    """
+    Q_bars = laminate._get_Q_bar_from_trig(laminate.c2, laminate.s2, laminate.cs)
+    dQ_bars = _Q_bar_derivative(laminate)
+
+    z = laminate.z_coords
+    zk = z[1:]
+    zk_1 = z[:-1]
+    h = zk - zk_1
+    sum_z = zk + zk_1
+    h2 = h * sum_z
+    h3 = h * (sum_z * sum_z - zk * zk_1)
+    n = len(h)
+
+    # Angle derivatives only involve the rotated ply itself
+    dA_dtheta = (dQ_bars * h).T.reshape(n, 3, 3)
+    dB_dtheta = (dQ_bars * (0.5 * h2)).T.reshape(n, 3, 3)
+    dD_dtheta = (dQ_bars * (h3 / 3)).T.reshape(n, 3, 3)
+
+    # Thickness derivatives: rewrite B and D as sums over interfaces with
+    # delta_Q_i = Q_bar(ply below interface i) - Q_bar(ply above it)
+    padded = np.zeros((9, n + 2))
+    padded[:, 1:-1] = Q_bars
+    delta_Q = padded[:, :-1] - padded[:, 1:]
+
+    dA_dt = Q_bars.T.reshape(n, 3, 3)
+    dB_dt = _interface_derivative(delta_Q * z).T.reshape(n, 3, 3)
+    dD_dt = _interface_derivative(delta_Q * (z * z)).T.reshape(n, 3, 3)
+
+    return {
+        "A": laminate.A,
+        "B": laminate.B,
+        "D": laminate.D,
+        "dA_dtheta": dA_dtheta,
+        "dB_dtheta": dB_dtheta,
+        "dD_dtheta": dD_dtheta,
+        "dA_dt": dA_dt,
+        "dB_dt": dB_dt,
+        "dD_dt": dD_dt,
+    }
+
+
+def _abd_blocks(dA, dB, dD):
+    n = dA.shape[0]
+    dABD = np.empty((n, 6, 6))
+    dABD[:, :3, :3] = dA
+    dABD[:, :3, 3:] = dB
+    dABD[:, 3:, :3] = dB
+    dABD[:, 3:, 3:] = dD
+    return dABD
+
+
+def safety_factor_sensitivity(laminate, load, limits, sens=None):
+    """
+    Tsai-Wu safety factor (as in calculate_safety_factor) and its derivatives with respect
+    to ply angles (per degree) and ply thicknesses.
+
+    The factor is the minimum over plies and load cases; the derivative is that of the
+    governing ply and case, which is exact wherever the minimum is unique.
+
+    Args:
+        laminate (Laminate): Laminate object.
+        load: Load dict, list of load dicts or (n_cases, 6) load matrix.
+        limits (dict): Strength limits.
+        sens (dict): Optional precomputed abd_sensitivity(laminate).
+
+    Returns:
+        dict: 'value', 'ply', 'case', 'd_theta' (n_plies,), 'd_thickness' (n_plies,).
+    """
+    loads = load_matrix(load)
+    n = len(laminate.stack)
+
+    factors = _load_case_factors(laminate, loads, limits)
+    ply, case = np.unravel_index(np.argmin(factors), factors.shape)
+    f = factors[ply, case]
+    result = {"value": f, "ply": int(ply), "case": int(case),
+              "d_theta": np.zeros(n), "d_thickness": np.zeros(n)}
+    if not np.isfinite(f):
+        return result
+
+    F1, F2, F11, F22, F66, F12 = _tsai_wu_coefficients(limits)
+    F = np.array([[F11, F12, 0], [F12, F22, 0], [0, 0, F66]])
+    Fv = np.array([F1, F2, 0])
+    Q = laminate.material.Q()
+
+    # Stresses at the governing ply
+    sc = laminate.abd @ loads[case]
+    z = laminate.z_mids[ply]
+    eps = sc[:3] + z * sc[3:]
+    c2, s2, cs = laminate.c2[ply], laminate.s2[ply], laminate.cs[ply]
+    T = np.array([
+        [c2, s2, cs],
+        [s2, c2, -cs],
+        [-2*cs, 2*cs, c2 - s2]
+    ])
+    e = T @ eps
+    sigma = Q @ e
+    A = sigma @ F @ sigma
+    B = Fv @ sigma
+
+    # Implicit differentiation of A f^2 + B f = 1 down to the global mid-plane strains
+    g_sigma = -(f * f * 2 * (F @ sigma) + f * Fv) / (2 * A * f + B)
+    g_e = Q.T @ g_sigma
+    g_eps = T.T @ g_e
+    g_sc = np.concatenate([g_eps, z * g_eps])
+
+    # d(abd) = -abd dABD abd, so d(sc) . g_sc = -lam . (dABD sc)
+    lam = laminate.abd.T @ g_sc
+
+    if sens is None:
+        sens = abd_sensitivity(laminate)
+    dABD_theta = _abd_blocks(sens["dA_dtheta"], sens["dB_dtheta"], sens["dD_dtheta"])
+    dABD_t = _abd_blocks(sens["dA_dt"], sens["dB_dt"], sens["dD_dt"])
+
+    d_theta = -(dABD_theta @ sc) @ lam
+    d_thickness = -(dABD_t @ sc) @ lam
+
+    # Rotation of the governing ply itself
+    cos2 = c2 - s2
+    sin2 = 2 * cs
+    dT = np.array([
+        [-sin2, sin2, cos2],
+        [sin2, -sin2, -cos2],
+        [-2*cos2, 2*cos2, -2*sin2]
+    ]) * DEG
+    d_theta[ply] += g_e @ (dT @ eps)
+
+    # Shift of the governing ply's mid-plane
+    dz = np.full(n, -0.5)
+    dz[:ply] += 1.0
+    dz[ply] += 0.5
+    d_thickness += dz * (g_eps @ sc[3:])
+
+    result["d_theta"] = d_theta
+    result["d_thickness"] = d_thickness
+    return result
+
+
+def buckling_sensitivity(laminate, a, b, m_max=5, sens=None):
+    """
+    Critical buckling load (as in BucklingAnalysis.critical_load) and its derivatives with
+    respect to ply angles (per degree) and ply thicknesses, for the governing mode.
+
+    Returns:
+        dict: 'value', 'mode', 'd_theta' (n_plies,), 'd_thickness' (n_plies,).
+    """
+    N_cr, m = BucklingAnalysis.critical_load(laminate, a, b, m_max)
+    if sens is None:
+        sens = abd_sensitivity(laminate)
+
+    pi_sq_b_sq = 9.869604401089358 / (b * b)
+    mb_a = m * b / a
+    # dN/dD for D11, D12, D22, D66
+    w = np.zeros((3, 3))
+    w[0, 0] = pi_sq_b_sq * mb_a * mb_a
+    w[0, 1] = pi_sq_b_sq * 2
+    w[1, 1] = pi_sq_b_sq / (mb_a * mb_a)
+    w[2, 2] = pi_sq_b_sq * 4
+
+    return {
+        "value": N_cr,
+        "mode": m,
+        "d_theta": np.einsum('kij,ij->k', sens["dD_dtheta"], w),
+        "d_thickness": np.einsum('kij,ij->k', sens["dD_dt"], w),
+    }
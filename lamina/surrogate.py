@@ -0,0 +1,159 @@
+from collections import deque
+
+import numpy as np
+
+
+def lamination_parameters(stacks, symmetric=False):
+    """
+    Computes in-plane and bending lamination parameters for a population of stacks.
+
+    Args:
+        stacks (array-like): (n_designs, n_plies) ply angles in degrees.
+        symmetric (bool): If True, rows are half-stacks and are mirrored first.
+
+    Returns:
+        np.ndarray: (n_designs, 8) array of [V1A, V2A, V3A, V4A, V1D, V2D, V3D, V4D].
+    """
+    stacks = np.atleast_2d(np.asarray(stacks, dtype=np.float64))
+    if symmetric:
+        stacks = np.concatenate([stacks, stacks[:, ::-1]], axis=1)
+    n = stacks.shape[1]
+
+    theta = np.radians(stacks)
+    trig = np.stack([np.cos(2*theta), np.sin(2*theta), np.cos(4*theta), np.sin(4*theta)])
+
+    # Normalized ply interfaces z/h in [-1/2, 1/2]; bending weights sum to one
+    z = np.arange(n + 1, dtype=np.float64) / n - 0.5
+    w_d = 4 * (z[1:]**3 - z[:-1]**3)
+
+    V_A = trig.mean(axis=2)
+    V_D = trig @ w_d
+    return np.concatenate([V_A, V_D]).T
+
+
+class QuadraticSurrogate:
+    """
+    Online quadratic response surface on lamination parameters and ply count.
+
+    Used by GeneticAlgorithm to rank offspring so that only the most promising
+    fraction is sent to exact evaluation.
+    """
+    def __init__(self, fraction=0.25, min_samples=30, ridge=1e-6, max_samples=2000, symmetric=True):
+        """
+        Args:
+            fraction (float): Fraction of unseen offspring sent to exact evaluation.
+            min_samples (int): Exact evaluations required before screening starts.
+            ridge (float): Tikhonov regularization of the least-squares fit.
+            max_samples (int): Only the most recent samples (and validated predictions)
+                are kept, so memory stays bounded over long runs.
+            symmetric (bool): Stacks are half-stacks of symmetric laminates.
+        """
+        self.fraction = fraction
+        self.min_samples = min_samples
+        self.ridge = ridge
+        self.max_samples = max_samples
+        self.symmetric = symmetric
+
+        # Feature rows and scores of the most recent exact evaluations
+        self._X = deque(maxlen=max_samples)
+        self._y = deque(maxlen=max_samples)
+        self._coef = None
+        self._pending = {} # stack -> prediction awaiting exact evaluation
+        self._pred = deque(maxlen=max_samples)
+        self._actual = deque(maxlen=max_samples)
+        self.n_exact = 0
+        self.n_skipped = 0
+
+    def _features(self, stacks):
+        stacks = np.atleast_2d(np.asarray(stacks, dtype=np.float64))
+        n_plies = stacks.shape[1] * (2 if self.symmetric else 1)
+        lp = lamination_parameters(stacks, self.symmetric)
+        return np.hstack([lp, np.full((lp.shape[0], 1), n_plies / 100.0)])
+
+    @staticmethod
+    def _design(X):
+        """Constant, linear and upper-triangular quadratic terms."""
+        iu, ju = np.triu_indices(X.shape[1])
+        return np.hstack([np.ones((X.shape[0], 1)), X, X[:, iu] * X[:, ju]])
+
+    @property
+    def ready(self):
+        return len(self._y) >= self.min_samples
+
+    def _fit(self):
+        X = np.array(self._X)
+        y = np.array(self._y)
+        Phi = self._design(X)
+        lhs = Phi.T @ Phi
+        lhs[np.diag_indices_from(lhs)] += self.ridge * len(y)
+        self._coef = np.linalg.solve(lhs, Phi.T @ y)
+
+    def predict(self, stacks):
+        """
+        Returns:
+            np.ndarray: Predicted fitness of each stack.
+        """
+        if self._coef is None:
+            self._fit()
+        return self._design(self._features(stacks)) @ self._coef
+
+    def observe(self, stacks, scores):
+        """Adds exactly evaluated designs to the training set."""
+        if not len(stacks):
+            return
+        self._X.extend(self._features(stacks))
+        self._y.extend(scores)
+        self._coef = None
+        self.n_exact += len(scores)
+
+        for stack, score in zip(stacks, scores):
+            pred = self._pending.pop(tuple(stack), None)
+            if pred is not None:
+                self._pred.append(pred)
+                self._actual.append(score)
+
+    def select(self, stacks):
+        """
+        Ranks candidate stacks and picks those worth an exact evaluation.
+
+        Returns:
+            np.ndarray: Boolean mask, True for stacks to evaluate exactly.
+        """
+        n = len(stacks)
+        if n == 0 or not self.ready:
+            return np.ones(n, dtype=bool)
+
+        pred = self.predict(stacks)
+        n_keep = max(1, int(np.ceil(self.fraction * n)))
+        mask = np.zeros(n, dtype=bool)
+        mask[np.argsort(-pred)[:n_keep]] = True
+
+        for i in np.flatnonzero(mask):
+            self._pending[tuple(stacks[i])] = pred[i]
+        self.n_skipped += n - n_keep
+        return mask
+
+    def stats(self):
+        """
+        Surrogate accuracy on the most recent `max_samples` designs that were predicted
+        before being evaluated exactly.
+
+        Returns:
+            dict: Exact/skipped evaluation counts, mean absolute error and Spearman rank correlation.
+        """
+        pred = np.asarray(self._pred)
+        actual = np.asarray(self._actual)
+        mae = float(np.abs(pred - actual).mean()) if len(pred) else None
+        spearman = None
+        if len(pred) > 2:
+            rp = pred.argsort().argsort()
+            ra = actual.argsort().argsort()
+            if rp.std() > 0 and ra.std() > 0:
+                spearman = float(np.corrcoef(rp, ra)[0, 1])
+        return {
+            "exact_evaluations": self.n_exact,
+            "skipped_evaluations": self.n_skipped,
+            "validated_predictions": len(pred),
+            "mae": mae,
+            "spearman": spearman,
+        }
@@ -169,8 +169,12 @@ async function copyToClipboard(btn) {
     }
 }
 
-function validateInputs() {
-    const invalidInput = document.querySelector('input:invalid, select:invalid, [aria-invalid="true"]');
+// Strength inputs only matter for the failure envelope
+const LIMIT_INPUTS = ['Xt', 'Xc', 'Yt', 'Yc', 'S'];
+
+function validateInputs(includeLimits = true) {
+    const invalidInput = Array.from(document.querySelectorAll('input:invalid, select:invalid, [aria-invalid="true"]'))
+        .find(el => includeLimits || !LIMIT_INPUTS.includes(el.id));
     if (invalidInput) {
         if (typeof invalidInput.reportValidity === 'function' && invalidInput.matches(':invalid')) {
             invalidInput.reportValidity();
@@ -182,23 +186,55 @@ function validateInputs() {
     return true;
 }
 
+// Last response per endpoint and payload; the server answers 304 when the ETag still matches
+const responseCache = new Map();
+
+async function postCached(url, payload) {
+    const body = JSON.stringify(payload);
+    const key = url + '\n' + body;
+    const cached = responseCache.get(key);
+    const headers = {'Content-Type': 'application/json'};
+    if (cached) {
+        headers['If-None-Match'] = cached.etag;
+    }
+
+    const response = await fetch(url, { method: 'POST', headers, body });
+    if (response.status === 304 && cached) {
+        return cached.result;
+    }
+    if (!response.ok) {
+        await handleApiError(response);
+    }
+
+    const result = await response.json();
+    const etag = response.headers.get('ETag');
+    if (etag) {
+        // Keep the cache small: the designer only ever revisits recent layups
+        if (responseCache.size >= 50) {
+            responseCache.delete(responseCache.keys().next().value);
+        }
+        responseCache.set(key, { etag, result });
+    }
+    return result;
+}
+
+// Each panel asks /api/analyze for the outputs it renders only; strength limits are
+// sent (and required) only when the failure envelope is requested
+async function analyzeLaminate(outputs) {
+    const payload = { laminate: await getLaminateData(), outputs };
+    if (outputs.includes('envelopes')) {
+        payload.limits = await getLimits();
+        payload.criteria = ['tsai_wu'];
+    }
+    return postCached('/api/analyze', payload);
+}
+
 async function calculate(btn) {
     if (btn.getAttribute('aria-disabled') === 'true') return;
-    if (!validateInputs()) return;
+    if (!validateInputs(false)) return;
     setLoading(btn, true);
     try {
-        const data = await getLaminateData();
-        const response = await fetch('/api/calculate', {
-            method: 'POST',
-            headers: {'Content-Type': 'application/json'},
-            body: JSON.stringify(data)
-        });
-
-        if (!response.ok) {
-            await handleApiError(response);
-        }
-
-        const result = await response.json();
+        const result = await analyzeLaminate(['abd', 'properties']);
 
         const constsOut = document.getElementById('constants-output');
         constsOut.innerHTML = formatEngineeringConstants(result.properties);
@@ -230,21 +266,10 @@ async function calculate(btn) {
 
 async function plotPolar(btn) {
     if (btn.getAttribute('aria-disabled') === 'true') return;
-    if (!validateInputs()) return;
+    if (!validateInputs(false)) return;
     setLoading(btn, true);
     try {
-        const data = await getLaminateData();
-        const response = await fetch('/api/polar', {
-            method: 'POST',
-            headers: {'Content-Type': 'application/json'},
-            body: JSON.stringify(data)
-        });
-
-        if (!response.ok) {
-            await handleApiError(response);
-        }
-
-        const result = await response.json();
+        const result = (await analyzeLaminate(['polar'])).polar;
         document.getElementById('polar-plot').classList.remove('empty-state');
         // drawPolar is global from polar_plot.js
         if (typeof drawPolar === 'function') {
@@ -266,19 +291,7 @@ async function plotEnvelope(btn) {
     if (!validateInputs()) return;
     setLoading(btn, true);
     try {
-        const lamData = await getLaminateData();
-        const limits = await getLimits();
-        const response = await fetch('/api/failure', {
-            method: 'POST',
-            headers: {'Content-Type': 'application/json'},
-            body: JSON.stringify({laminate: lamData, limits})
-        });
-
-        if (!response.ok) {
-            await handleApiError(response);
-        }
-
-        const result = await response.json();
+        const result = (await analyzeLaminate(['envelopes'])).envelopes.tsai_wu;
         document.getElementById('envelope-plot').classList.remove('empty-state');
         // drawEnvelope is global from failure_envelope.js
         if (typeof drawEnvelope === 'function') {
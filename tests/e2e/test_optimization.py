@@ -34,3 +34,39 @@ def test_stacking_optimization():
 
     print(f"Best stack: {best_stack}, SF: {sf}")
     assert sf >= 1.2
+
+
+def test_ply_count_search_brackets_minimum():
+    import random
+    random.seed(0)
+
+    mat = CarbonEpoxy()
+    load = {'Nx': 3000e3, 'Ny': 0, 'Nxy': 0}
+    constraints = {
+        'safety_factor': 1.2,
+        'limits': {'xt': 1500e6, 'xc': 1200e6, 'yt': 50e6, 'yc': 250e6, 's': 70e6}
+    }
+
+    ga = GeneticAlgorithm(mat, load, constraints, population_size=10, generations=5)
+    best_stack = ga.optimize(min_plies=4, max_plies=100)
+
+    assert best_stack is not None
+    lam = Laminate(mat, best_stack, symmetry=False)
+    assert calculate_safety_factor(lam, load, constraints['limits']) >= 1.2
+
+    # Galloping + bisection probes far fewer ply counts than the 49 of a linear scan
+    assert len(ga._elites) < 15
+
+def test_resize_stack_warm_start():
+    mat = CarbonEpoxy()
+    ga = GeneticAlgorithm(mat, {'Nx': 1e3}, {}, population_size=4, generations=1)
+
+    assert len(ga._resize_stack([0, 45, -45, 90], 7)) == 7
+    shrunk = ga._resize_stack([0, 45, -45, 90], 2)
+    assert len(shrunk) == 2
+    assert all(a in [0, 45, -45, 90] for a in shrunk)
+
+    ga._elites[4] = [[0, 0, 0, 0]] * 2
+    population = ga._seed_population(5)
+    assert len(population) == 4
+    assert all(len(stack) == 5 for stack in population)
@@ -0,0 +1,77 @@
+import numpy as np
+from unittest import mock
+from fastapi.testclient import TestClient
+from api.index import app
+from api.cache import result_cache
+from lamina.clt import Laminate
+from lamina.materials import CarbonEpoxy
+from lamina.failure import FailureCriterion
+
+client = TestClient(app)
+
+LAMINATE = {
+    "material": {"E1": 140e9, "E2": 10e9, "G12": 5e9, "v12": 0.3, "name": "Carbon/Epoxy"},
+    "stack": [0, 45, -45, 90],
+    "symmetry": True,
+    "thickness": 0.125e-3,
+}
+LIMITS = {"xt": 1500e6, "xc": 1200e6, "yt": 50e6, "yc": 250e6, "s": 70e6}
+
+def test_analyze_matches_single_endpoints():
+    response = client.post("/api/analyze", json={
+        "laminate": LAMINATE,
+        "limits": LIMITS,
+        "plate": {"a": 0.5, "b": 0.3},
+        "outputs": ["abd", "properties", "polar", "envelopes", "buckling"],
+        "criteria": ["tsai_wu", "tsai_hill", "max_stress"],
+    })
+    assert response.status_code == 200
+    result = response.json()
+    assert "ETag" in response.headers
+
+    calc = client.post("/api/calculate", json=LAMINATE).json()
+    assert result["ABD"] == calc["ABD"]
+    assert result["properties"] == calc["properties"]
+    assert result["polar"] == client.post("/api/polar", json=LAMINATE).json()
+    failure = client.post("/api/failure", json={"laminate": LAMINATE, "limits": LIMITS}).json()
+    assert result["envelopes"]["tsai_wu"] == failure
+    assert set(result["envelopes"]) == {"tsai_wu", "tsai_hill", "max_stress"}
+    assert result["buckling"]["N_cr"] > 0
+    assert result["buckling"]["mode"] >= 1
+
+def test_analyze_returns_only_requested_outputs():
+    response = client.post("/api/analyze", json={"laminate": LAMINATE, "outputs": ["properties"]})
+    assert response.status_code == 200
+    assert list(response.json()) == ["properties"]
+
+def test_analyze_builds_one_laminate_and_shares_stresses():
+    result_cache.clear()
+    with mock.patch("api.index.Laminate", wraps=Laminate) as build, \
+         mock.patch.object(FailureCriterion, "unit_stresses", wraps=FailureCriterion.unit_stresses) as stresses:
+        response = client.post("/api/analyze", json={
+            "laminate": LAMINATE,
+            "limits": LIMITS,
+            "outputs": ["abd", "polar", "envelopes"],
+            "criteria": ["tsai_wu", "max_stress"],
+        })
+    assert response.status_code == 200
+    assert build.call_count == 1
+    assert stresses.call_count == 1
+
+def test_shared_stresses_match_per_criterion():
+    lam = Laminate(CarbonEpoxy(), [0, 45, -45, 90], symmetry=True)
+    stresses = FailureCriterion.unit_stresses(lam)
+    for criterion in (FailureCriterion.tsai_wu, FailureCriterion.tsai_hill, FailureCriterion.max_stress):
+        np.testing.assert_array_equal(
+            criterion(lam, LIMITS, stresses=stresses).data, criterion(lam, LIMITS).data
+        )
+
+def test_analyze_requires_inputs_for_outputs():
+    response = client.post("/api/analyze", json={"laminate": LAMINATE, "outputs": ["envelopes"]})
+    assert response.status_code == 422
+    response = client.post("/api/analyze", json={"laminate": LAMINATE, "outputs": ["buckling"]})
+    assert response.status_code == 422
+    response = client.post("/api/analyze", json={
+        "laminate": LAMINATE, "outputs": ["buckling"], "plate": {"a": -1, "b": 0.3},
+    })
+    assert response.status_code == 422
@@ -78,8 +78,10 @@ def test_security_headers_calculate():
     assert "form-action 'self'" in csp
     assert "upgrade-insecure-requests" in csp
 
+    # Pure computation endpoints are revalidated with ETags instead of being no-store
     assert "Cache-Control" in headers
-    assert headers["Cache-Control"] == "no-store, no-cache, must-revalidate, max-age=0"
+    assert headers["Cache-Control"] == "private, no-cache"
+    assert "ETag" in headers
 
 def test_payload_size_limit():
     """
@@ -130,6 +132,9 @@ def test_security_headers_on_500():
     """
     Test that a 500 error response still includes security headers.
     """
+    from api.cache import result_cache
+    result_cache.clear()
+
     with mock.patch("api.index.create_laminate", side_effect=Exception("Test Exception")):
         payload = {
             "material": {
@@ -197,3 +202,31 @@ def test_loc_key_truncation_dos():
         for item in loc:
             if isinstance(item, str):
                 assert len(item) <= 53  # 50 chars + "..."
+
+def test_security_headers_on_streaming_and_rate_limited_responses():
+    """
+    Test that the pure ASGI middleware stamps headers on streamed bodies and 429 responses.
+    """
+    from fastapi import FastAPI
+    from fastapi.responses import StreamingResponse
+    from fastapi.testclient import TestClient
+    from api.middleware import SecurityHeadersMiddleware, RateLimitMiddleware
+
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, limit=1, window=60)
+    app.add_middleware(SecurityHeadersMiddleware)
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a", b"b", b"c"]), media_type="text/plain")
+
+    test_client = TestClient(app)
+    response = test_client.get("/stream")
+    assert response.status_code == 200
+    assert response.text == "abc"
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert response.headers["Cache-Control"] == "no-store, no-cache, must-revalidate, max-age=0"
+
+    response = test_client.get("/stream")
+    assert response.status_code == 429
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
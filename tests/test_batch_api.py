@@ -0,0 +1,125 @@
+import numpy as np
+from fastapi.testclient import TestClient
+from api.index import app
+
+client = TestClient(app)
+
+MATERIAL = {"E1": 140e9, "E2": 10e9, "G12": 5e9, "v12": 0.3, "name": "Carbon/Epoxy"}
+LIMITS = {"xt": 1500e6, "xc": 1200e6, "yt": 50e6, "yc": 250e6, "s": 70e6}
+
+def test_batch_matches_single_endpoints():
+    items = [
+        {"stack": [0, 45, -45, 90], "symmetry": True},
+        {"stack": [30, -30], "thickness": 0.2e-3},
+    ]
+    response = client.post("/api/batch", json={
+        "material": MATERIAL,
+        "limits": LIMITS,
+        "items": items,
+        "outputs": ["abd", "properties", "polar", "failure"],
+    })
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == 2
+
+    for item, result in zip(items, results):
+        laminate = dict(item, material=MATERIAL)
+        calc = client.post("/api/calculate", json=laminate).json()
+        np.testing.assert_allclose(result["ABD"], calc["ABD"], atol=1e-9 * np.abs(calc["ABD"]).max())
+        np.testing.assert_allclose(list(result["properties"].values()), list(calc["properties"].values()))
+
+        polar = client.post("/api/polar", json=laminate).json()
+        np.testing.assert_allclose([d["Ex"] for d in result["polar"]], [d["Ex"] for d in polar])
+
+        failure = client.post("/api/failure", json={"laminate": laminate, "limits": LIMITS}).json()
+        np.testing.assert_allclose(result["failure"], failure)
+
+def test_batch_per_item_errors():
+    response = client.post("/api/batch", json={
+        "material": MATERIAL,
+        "items": [
+            {"stack": [0, 90]},
+            {"stack": []},
+            {"stack": [0], "thickness": -1},
+            "not an item",
+            {"stack": [0], "material": dict(MATERIAL, E1=-1)},
+            {"stack": [45], "material": dict(MATERIAL, E1=50e9)},
+        ],
+    })
+    assert response.status_code == 200
+    results = response.json()["results"]
+
+    assert "ABD" in results[0] and "properties" in results[0]
+    for bad in results[1:5]:
+        assert "error" in bad
+        for error in bad["error"]:
+            assert "input" not in error
+            assert error["loc"][0] == "items"
+    assert "Stack cannot be empty" in str(results[1]["error"])
+    assert results[1]["error"][0]["loc"][1] == 1
+    assert "ABD" in results[5]
+
+def test_batch_missing_material_and_limits():
+    response = client.post("/api/batch", json={
+        "items": [{"stack": [0, 90]}, {"stack": [0], "material": MATERIAL}],
+        "outputs": ["failure"],
+    })
+    results = response.json()["results"]
+    assert results[0]["error"][0]["loc"] == ["items", 0, "material"]
+    assert results[1]["error"][0]["loc"] == ["items", 1, "limits"]
+
+def test_batch_size_limits():
+    response = client.post("/api/batch", json={"material": MATERIAL, "items": []})
+    assert response.status_code == 422
+
+    response = client.post("/api/batch", json={"material": MATERIAL, "items": [{"stack": [0]}] * 501})
+    assert response.status_code == 422
+    assert "Too many items" in response.text
+
+def test_batch_many_items_chunked():
+    items = [{"stack": [0, 45, -45, 90] * 25, "symmetry": True}] * 30
+    response = client.post("/api/batch", json={"material": MATERIAL, "limits": LIMITS, "items": items, "outputs": ["failure"]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == 30
+    assert results[0] == results[-1]
+
+def test_batch_trusted_ply_ceiling():
+    from unittest import mock
+    items = [{"stack": [0, 90] * 150}]
+    payload = {"material": MATERIAL, "items": items, "outputs": ["abd"]}
+
+    response = client.post("/api/batch", json=payload)
+    assert response.status_code == 200
+    assert "Stack too large (max 200 plies)" in response.json()["results"][0]["error"][0]["msg"]
+
+    with mock.patch.dict("os.environ", {"LAMINA_BATCH_TOKEN": "secret"}):
+        response = client.post("/api/batch", json=payload, headers={"Authorization": "Bearer wrong"})
+        assert "error" in response.json()["results"][0]
+
+        response = client.post("/api/batch", json=payload, headers={"Authorization": "Bearer secret"})
+        assert "ABD" in response.json()["results"][0]
+
+    # The public endpoints keep the default ceiling
+    response = client.post("/api/calculate", json={"material": MATERIAL, "stack": [0, 90] * 150})
+    assert response.status_code == 422
+
+def test_batch_manufacturing_rules():
+    items = [{"stack": [45, -45, 0, 90], "symmetry": True}, {"stack": [0, 45, -45, 90], "symmetry": True}]
+    response = client.post("/api/batch", json={"material": MATERIAL, "items": items, "rules": {}, "outputs": ["abd"]})
+    results = response.json()["results"]
+    assert "ABD" in results[0]
+    assert results[1]["error"][0]["loc"] == ["items", 1, "stack"]
+    assert results[1]["error"][0]["msg"] == "Violates manufacturing rules: outer_45"
+
+    response = client.post("/api/batch", json={
+        "material": MATERIAL, "items": items, "rules": {"repair": True}, "outputs": ["abd"],
+    })
+    results = response.json()["results"]
+    assert results[0]["stack"] == [45, -45, 0, 90]
+    assert abs(results[1]["stack"][0]) == 45
+    calc = client.post("/api/calculate", json={"material": MATERIAL, "stack": results[1]["stack"], "symmetry": True}).json()
+    np.testing.assert_allclose(results[1]["ABD"], calc["ABD"], atol=1e-9 * np.abs(calc["ABD"]).max())
+
+    response = client.post("/api/batch", json={"material": MATERIAL, "items": items, "rules": {"min_fraction": 0.5}})
+    assert response.status_code == 422
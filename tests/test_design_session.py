@@ -0,0 +1,130 @@
+import json
+import numpy as np
+import pytest
+from unittest import mock
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from api.index import app
+from api.executor import ComputeExecutor
+from api.sessions import DesignSession, SessionRegistry
+from lamina.clt import Laminate
+from lamina.materials import CarbonEpoxy
+
+client = TestClient(app)
+
+LAMINATE = {
+    "material": {"E1": 140e9, "E2": 10e9, "G12": 5e9, "v12": 0.3, "name": "Carbon/Epoxy"},
+    "stack": [0, 45, -45, 90],
+    "symmetry": True,
+    "thickness": 0.125e-3,
+}
+LIMITS = {"xt": 1500e6, "xc": 1200e6, "yt": 50e6, "yc": 250e6, "s": 70e6}
+
+def test_set_angles_matches_rebuild():
+    mat = CarbonEpoxy()
+    lam = Laminate(mat, [0, 45, -45, 90, 30], symmetry=True)
+    lam.abd, lam.K_all # populate lazy caches
+    lam.set_angles([1, 8], [60, 60])
+
+    ref = Laminate(mat, [0, 60, -45, 90, 30], symmetry=True)
+    assert lam.stack == ref.stack
+    scale = np.abs(ref.ABD).max()
+    np.testing.assert_allclose(lam.ABD, ref.ABD, atol=1e-12 * scale)
+    np.testing.assert_allclose(lam.abd, ref.abd, rtol=1e-9, atol=1e-12 * np.abs(ref.abd).max())
+    np.testing.assert_allclose(lam.K_all, ref.K_all)
+
+def test_session_incremental_edits_match_fresh_laminate():
+    session = DesignSession(CarbonEpoxy(), [0, 45, -45, 90], symmetry=True, limits=LIMITS)
+    session.changes()
+    for index, angle in [(1, 30), (3, 0), (0, -60), (1, 45)]:
+        session.set_ply(index, angle)
+    session.insert_ply(2, 15)
+    session.remove_ply(0)
+    session.set_ply(-1, 75)
+
+    fresh = DesignSession(CarbonEpoxy(), session.stack, symmetry=True, limits=LIMITS)
+    expected = fresh.changes()
+    session._sent.clear()
+    actual = session.changes()
+    np.testing.assert_allclose(actual["abd"], expected["abd"], atol=1e-9 * np.abs(expected["abd"]).max())
+    for key, value in expected["properties"].items():
+        assert actual["properties"][key] == pytest.approx(value, rel=1e-9)
+    np.testing.assert_allclose(np.array(actual["envelope"]), np.array(expected["envelope"]), rtol=1e-6)
+
+def test_session_only_reports_changed_outputs():
+    session = DesignSession(CarbonEpoxy(), [0, 90], limits=LIMITS)
+    assert set(session.changes()) == {"abd", "properties", "polar", "envelope"}
+    assert session.changes() == {}
+
+    # Same angle: nothing changes
+    session.set_ply(0, 0)
+    assert session.changes() == {}
+
+    # Limits only affect the envelope
+    session.set_limits(dict(LIMITS, yt=40e6))
+    assert list(session.changes()) == ["envelope"]
+
+def test_session_limits():
+    session = DesignSession(CarbonEpoxy(), [0], max_plies=2)
+    session.insert_ply(None, 90)
+    with pytest.raises(ValueError, match="Stack too large"):
+        session.insert_ply(None, 45)
+    with pytest.raises(ValueError, match="out of range"):
+        session.set_ply(5, 0)
+    session.remove_ply(0)
+    with pytest.raises(ValueError, match="cannot be empty"):
+        session.remove_ply(0)
+
+def test_websocket_session_flow():
+    with client.websocket_connect("/api/session") as ws:
+        ws.send_text(json.dumps({"op": "set_ply", "index": 0, "angle": 10}))
+        assert "init" in ws.receive_json()["error"]
+
+        ws.send_text(json.dumps({"op": "init", "laminate": LAMINATE, "limits": LIMITS, "outputs": ["abd", "properties"]}))
+        reply = ws.receive_json()
+        assert reply["seq"] == 2
+        assert reply["state"]["plies"] == 8
+        calc = client.post("/api/calculate", json=LAMINATE).json()
+        assert set(reply["changed"]) == {"abd", "properties"}
+        np.testing.assert_allclose(reply["changed"]["abd"], calc["ABD"])
+
+        ws.send_text(json.dumps({"op": "set_ply", "index": 1, "angle": 30}))
+        reply = ws.receive_json()
+        calc = client.post("/api/calculate", json=dict(LAMINATE, stack=[0, 30, -45, 90])).json()
+        np.testing.assert_allclose(reply["changed"]["abd"], calc["ABD"], atol=1e-9 * np.abs(calc["ABD"]).max())
+
+        ws.send_text(json.dumps({"op": "set_ply", "index": 0, "angle": "nan"}))
+        reply = ws.receive_json()
+        assert reply["error"][0]["msg"].endswith("Must be a finite number")
+        assert "input" not in reply["error"][0]
+
+def test_websocket_session_capacity_and_idle_timeout():
+    with mock.patch("api.index.sessions", SessionRegistry(max_sessions=0)):
+        with client.websocket_connect("/api/session") as ws:
+            with pytest.raises(WebSocketDisconnect) as exc:
+                ws.receive_text()
+            assert exc.value.code == 1013
+
+    with mock.patch("api.index.sessions", SessionRegistry(idle_timeout=0.05)) as registry:
+        with client.websocket_connect("/api/session") as ws:
+            with pytest.raises(WebSocketDisconnect) as exc:
+                ws.receive_text()
+            assert exc.value.code == 1000
+        assert registry.active == 0
+
+def test_websocket_session_message_rate_and_admission():
+    init = json.dumps({"op": "init", "laminate": LAMINATE, "outputs": ["abd"]})
+    with mock.patch("api.index.sessions", SessionRegistry(message_limit=2, message_window=60)):
+        with client.websocket_connect("/api/session") as ws:
+            for _ in range(2):
+                ws.send_text(init)
+                assert "changed" in ws.receive_json()
+            ws.send_text(init)
+            assert ws.receive_json() == {"seq": 3, "error": "Too many messages", "retry_after": 60}
+
+    saturated = ComputeExecutor(max_workers=1, max_pending=0, threshold=1, retry_after=7)
+    with mock.patch("api.index.executor", saturated):
+        with client.websocket_connect("/api/session") as ws:
+            ws.send_text(init)
+            assert ws.receive_json() == {"seq": 1, "error": "Server is busy", "retry_after": 7}
+    assert saturated.stats()["rejected"] == 1
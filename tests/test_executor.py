@@ -0,0 +1,89 @@
+import pytest
+from unittest import mock
+from fastapi.testclient import TestClient
+from api.index import app, compute_failure, FailureRequest, laminate_cost, analyze_cost, AnalyzeRequest
+from api.executor import ComputeExecutor, Overloaded
+from api.cache import result_cache
+
+client = TestClient(app)
+
+LAMINATE = {
+    "material": {"E1": 140e9, "E2": 10e9, "G12": 5e9, "v12": 0.3, "name": "Carbon/Epoxy"},
+    "stack": [0, 45, -45, 90],
+    "symmetry": True,
+    "thickness": 0.125e-3,
+}
+LIMITS = {"xt": 1500e6, "xc": 1200e6, "yt": 50e6, "yc": 250e6, "s": 70e6}
+
+def test_cost_estimates_scale_with_plies_and_points():
+    req = AnalyzeRequest.model_validate({"laminate": LAMINATE, "limits": LIMITS, "outputs": ["envelopes"]})
+    assert laminate_cost(req.laminate) == 8
+    assert analyze_cost(req) == 8 * (1 + 72)
+
+    req = AnalyzeRequest.model_validate({
+        "laminate": LAMINATE, "limits": LIMITS, "outputs": ["envelopes"],
+        "criteria": ["tsai_wu", "max_stress"],
+    })
+    assert analyze_cost(req) == 8 * (1 + 2 * 72)
+
+def test_cheap_calls_run_inline():
+    pool = ComputeExecutor(max_workers=1, threshold=100)
+    assert pool.run(10, sum, [1, 2, 3]) == 6
+    assert pool.stats()["inline"] == 1
+    assert pool._executor is None
+
+def test_saturated_pool_rejects_immediately():
+    pool = ComputeExecutor(max_workers=1, max_pending=0, threshold=0, retry_after=7)
+    with pytest.raises(Overloaded) as exc:
+        pool.run(1, sum, [1])
+    assert exc.value.retry_after == 7
+    assert pool.stats()["rejected"] == 1
+    assert pool._executor is None
+
+def test_offloaded_result_matches_inline():
+    req = FailureRequest.model_validate({"laminate": LAMINATE, "limits": LIMITS})
+    pool = ComputeExecutor(max_workers=1, threshold=0)
+    try:
+        assert pool.run(laminate_cost(req.laminate, 72), compute_failure, req).data == compute_failure(req).data
+        assert pool.stats()["offloaded"] == 1
+    finally:
+        pool.shutdown()
+
+def test_overloaded_returns_503_with_retry_after():
+    result_cache.clear()
+    busy = ComputeExecutor(max_workers=1, max_pending=0, threshold=0, retry_after=3)
+    with mock.patch("api.index.executor", busy):
+        response = client.post("/api/failure", json={"laminate": LAMINATE, "limits": LIMITS})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+    assert response.json() == {"detail": "Server is busy"}
+    assert "X-Content-Type-Options" in response.headers
+
+def test_ndjson_batch_stream_is_admitted_like_offloaded_work():
+    body = {"material": LAMINATE["material"], "items": [{"stack": [0, 45, -45, 90]}] * 3, "outputs": ["properties"]}
+    headers = {"Accept": "application/x-ndjson"}
+
+    busy = ComputeExecutor(max_workers=1, max_pending=0, threshold=0, retry_after=3)
+    with mock.patch("api.index.executor", busy):
+        response = client.post("/api/batch", json=body, headers=headers)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+
+    pool = ComputeExecutor(max_workers=1, max_pending=1, threshold=0)
+    with mock.patch("api.index.executor", pool):
+        response = client.post("/api/batch", json=body, headers=headers)
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 3
+    # The stream held the only slot while it ran and released it at the end
+    assert pool.stats()["streamed"] == 1
+    assert pool.stats()["pending"] == 0
+    assert pool._executor is None
+
+def test_pool_restarts_register_one_exit_handler():
+    pool = ComputeExecutor(max_workers=1)
+    with mock.patch("api.executor.ProcessPoolExecutor"), mock.patch("api.executor.atexit") as exit_hooks:
+        pool.start()
+        # What run() does after a BrokenProcessPool
+        pool._executor = None
+        pool.start()
+    exit_hooks.register.assert_called_once_with(pool.shutdown)
@@ -0,0 +1,84 @@
+from fastapi.testclient import TestClient
+from fastapi import FastAPI
+from api.index import app
+from api.metrics import Histogram, MetricsMiddleware, RATE_LIMITED, metrics_allowed
+from api.middleware import RateLimitMiddleware
+from lamina import metrics as lamina_metrics
+
+client = TestClient(app)
+
+LAMINATE = {
+    "material": {"E1": 140e9, "E2": 10e9, "G12": 5e9, "v12": 0.3, "name": "Carbon/Epoxy"},
+    "stack": [0, 45, -45, 90],
+    "symmetry": True,
+    "thickness": 0.125e-3,
+}
+LIMITS = {"xt": 1500e6, "xc": 1200e6, "yt": 50e6, "yc": 250e6, "s": 70e6}
+
+def _scrape(monkeypatch):
+    monkeypatch.setenv("LAMINA_METRICS_TOKEN", "secret")
+    response = client.get("/api/metrics", headers={"Authorization": "Bearer secret"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return response.text
+
+def _value(text, sample):
+    for line in text.splitlines():
+        if line.startswith(sample + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+def test_metrics_requires_token_or_loopback(monkeypatch):
+    monkeypatch.delenv("LAMINA_METRICS_TOKEN", raising=False)
+    # TestClient connects as "testclient", which is not a loopback address
+    assert client.get("/api/metrics").status_code == 404
+    assert metrics_allowed({"client": ("127.0.0.1", 1234)}, "")
+    assert metrics_allowed({"client": ("::1", 1234)}, "")
+
+    monkeypatch.setenv("LAMINA_METRICS_TOKEN", "secret")
+    assert client.get("/api/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 404
+    assert not metrics_allowed({"client": ("127.0.0.1", 1234)}, "")
+
+def test_route_and_compute_metrics(monkeypatch):
+    before = _scrape(monkeypatch)
+    builds = lamina_metrics.snapshot().get("laminate_builds", 0)
+
+    payload = dict(LAMINATE, stack=[0, 90, 0, 90, 30])
+    client.post("/api/failure", json={"laminate": payload, "limits": LIMITS})
+    after = _scrape(monkeypatch)
+
+    route = 'method="POST",route="/api/failure"'
+    assert _value(after, f'lamina_http_request_duration_seconds_count{{{route}}}') == \
+        _value(before, f'lamina_http_request_duration_seconds_count{{{route}}}') + 1
+    assert _value(after, f'lamina_http_requests_total{{{route},status="200"}}') >= 1
+    assert _value(after, 'lamina_http_request_size_bytes_count{route="/api/failure"}') >= 1
+    assert _value(after, "lamina_failure_evaluations_total") > _value(before, "lamina_failure_evaluations_total")
+    assert _value(after, "lamina_abd_inversions_total") > _value(before, "lamina_abd_inversions_total")
+    assert lamina_metrics.snapshot()["laminate_builds"] == builds + 1
+    assert "lamina_result_cache_misses_total" in after
+
+def test_rate_limited_requests_are_counted():
+    limited = FastAPI()
+    limited.add_middleware(RateLimitMiddleware, limit=1, window=60)
+    limited.add_middleware(MetricsMiddleware)
+
+    @limited.get("/")
+    def read_root():
+        return {"message": "ok"}
+
+    rejected = RATE_LIMITED.value()
+    test_client = TestClient(limited)
+    test_client.get("/")
+    assert test_client.get("/").status_code == 429
+    assert RATE_LIMITED.value() == rejected + 1
+
+def test_histogram_buckets_are_cumulative():
+    hist = Histogram("h", "help", (1, 10), ("route",))
+    for value in (0.5, 5, 5, 50):
+        hist.observe(value, "/x")
+    lines = hist.render()
+    assert 'h_bucket{route="/x",le="1.0"} 1' in lines
+    assert 'h_bucket{route="/x",le="10.0"} 3' in lines
+    assert 'h_bucket{route="/x",le="+Inf"} 4' in lines
+    assert 'h_count{route="/x"} 4' in lines
+    assert 'h_sum{route="/x"} 60.5' in lines
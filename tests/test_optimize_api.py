@@ -0,0 +1,111 @@
+import json
+import time
+from fastapi.testclient import TestClient
+from api.index import app
+from api.jobs import JobManager
+
+client = TestClient(app)
+
+PAYLOAD = {
+    "material": {"E1": 140e9, "E2": 10e9, "G12": 5e9, "v12": 0.3},
+    "loads": [{"Nx": 1000e3}, {"Nxy": 100e3}],
+    "limits": {"xt": 1500e6, "xc": 1200e6, "yt": 50e6, "yc": 250e6, "s": 70e6},
+    "safety_factor": 1.2,
+    "min_plies": 4,
+    "max_plies": 40,
+    "population_size": 10,
+    "generations": 5,
+    "seed": 0,
+}
+
+def _wait(job_id, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = client.get(f"/api/optimize/{job_id}").json()
+        if status["status"] in ("completed", "failed", "cancelled"):
+            return status
+        time.sleep(0.1)
+    raise AssertionError("Job did not finish")
+
+def test_optimize_job_lifecycle():
+    response = client.post("/api/optimize", json=PAYLOAD)
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    status = _wait(job_id)
+    assert status["status"] == "completed"
+    assert status["result"]["safety_factor"] >= 1.2
+    assert len(status["result"]["stack"]) == status["result"]["plies"]
+    assert status["progress"]["type"] == "generation"
+
+    # The event stream replays the whole history and terminates for finished jobs
+    with client.stream("GET", f"/api/optimize/{job_id}/events") as stream:
+        assert stream.headers["content-type"].startswith("text/event-stream")
+        body = "".join(stream.iter_text())
+    assert "event: started" in body
+    assert "event: generation" in body
+    assert body.rstrip().endswith('data: {"type": "completed"}')
+
+    # Resume after the last seen event
+    with client.stream("GET", f"/api/optimize/{job_id}/events", headers={"Last-Event-ID": "0"}) as stream:
+        resumed = "".join(stream.iter_text())
+    assert "event: started" not in resumed
+
+def test_optimize_cancel():
+    payload = dict(PAYLOAD, generations=200, population_size=200, max_plies=200, safety_factor=100)
+    job_id = client.post("/api/optimize", json=payload).json()["job_id"]
+    assert client.delete(f"/api/optimize/{job_id}").status_code == 200
+    assert _wait(job_id)["status"] == "cancelled"
+
+def test_optimize_unknown_job():
+    assert client.get("/api/optimize/unknown").status_code == 404
+    assert client.get("/api/optimize/unknown/events").status_code == 404
+    assert client.delete("/api/optimize/unknown").status_code == 404
+
+def test_optimize_validation():
+    assert client.post("/api/optimize", json=dict(PAYLOAD, min_plies=20, max_plies=10)).status_code == 422
+    assert client.post("/api/optimize", json=dict(PAYLOAD, generations=10000)).status_code == 422
+    assert client.post("/api/optimize", json=dict(PAYLOAD, loads=[])).status_code == 422
+
+def test_job_manager_rejects_when_saturated():
+    manager = JobManager(max_workers=1, max_pending=0)
+    assert manager.submit({}) is None
+
+def test_job_manager_frees_slot_of_unpolled_job():
+    manager = JobManager(max_workers=1, max_pending=1)
+    params = {
+        "material": PAYLOAD["material"],
+        "loads": PAYLOAD["loads"],
+        "constraints": {"safety_factor": 1.2, "limits": PAYLOAD["limits"]},
+        "min_plies": 4, "max_plies": 8, "population_size": 4, "generations": 1, "seed": 0,
+    }
+    try:
+        first = manager.submit(params)
+        assert first is not None
+        manager._jobs[first]["future"].result(timeout=60)
+        # Nobody called status(): the finished job must not hold the only slot
+        assert manager.submit(params) is not None
+        assert manager.status(first)["status"] == "completed"
+    finally:
+        manager.shutdown()
+
+def test_optimize_unloaded_case_reports_null_safety_factor():
+    payload = dict(PAYLOAD, loads=[{}], max_plies=8, generations=2)
+    job_id = client.post("/api/optimize", json=payload).json()["job_id"]
+    status = _wait(job_id)
+    assert status["status"] == "completed"
+    assert status["result"]["safety_factor"] is None
+
+    with client.stream("GET", f"/api/optimize/{job_id}/events") as stream:
+        body = "".join(stream.iter_text())
+    assert "Infinity" not in body
+    for line in body.splitlines():
+        if line.startswith("data: "):
+            json.loads(line[len("data: "):])
+
+def test_job_manager_shutdown_is_idempotent():
+    manager = JobManager(max_workers=1, max_pending=1)
+    assert manager.submit({}) is not None
+    manager.shutdown()
+    manager.shutdown()
+    assert manager._jobs == {}
@@ -1,6 +1,8 @@
 from fastapi.testclient import TestClient
 from fastapi import FastAPI
 from api.middleware import RateLimitMiddleware
+from api.ratelimit import MemoryBackend, SQLiteBackend
+import asyncio
 import time
 
 def test_rate_limit_middleware():
@@ -30,3 +32,99 @@ def test_rate_limit_middleware():
     # Should pass again
     response = client.get("/")
     assert response.status_code == 200
+
+def test_rate_limit_per_route_and_headers():
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, limit=100, window=60, routes={"/heavy": (2, 60)})
+
+    @app.get("/heavy")
+    def heavy():
+        return {"message": "ok"}
+
+    @app.get("/")
+    def read_root():
+        return {"message": "ok"}
+
+    client = TestClient(app)
+    assert client.get("/heavy").status_code == 200
+    assert client.get("/heavy").status_code == 200
+
+    response = client.get("/heavy")
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "30"
+
+    # Other routes draw from their own bucket
+    assert client.get("/").status_code == 200
+
+def test_rate_limit_exempt_token():
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, limit=1, window=60, exempt_token="load-test")
+
+    @app.get("/")
+    def read_root():
+        return {"message": "ok"}
+
+    client = TestClient(app)
+    assert client.get("/").status_code == 200
+    assert client.get("/").status_code == 429
+    assert client.get("/", headers={"X-Lamina-Exempt": "wrong"}).status_code == 429
+    for _ in range(3):
+        assert client.get("/", headers={"X-Lamina-Exempt": "load-test"}).status_code == 200
+
+def test_memory_backend_bounded_and_expires():
+    backend = MemoryBackend(max_keys=100)
+    for i in range(1000):
+        assert backend.hit(f"client-{i}", 5, 10.0, now=float(i) * 0.001)
+    assert len(backend) == 100
+
+    # Idle buckets are dropped once a full window has passed
+    backend.hit("late", 5, 10.0, now=100.0)
+    assert len(backend) == 1
+
+def test_memory_backend_token_refill():
+    backend = MemoryBackend()
+    assert all(backend.hit("ip", 2, 1.0, now=0.0) for _ in range(2))
+    assert not backend.hit("ip", 2, 1.0, now=0.0)
+    # Half a window refills one token
+    assert backend.hit("ip", 2, 1.0, now=0.5)
+    assert not backend.hit("ip", 2, 1.0, now=0.5)
+
+def test_sqlite_backend_shared_between_instances(tmp_path):
+    path = str(tmp_path / "limits.db")
+    first = SQLiteBackend(path, max_keys=10, purge_every=5)
+    second = SQLiteBackend(path, max_keys=10, purge_every=5)
+
+    assert first.hit("ip", 2, 60.0, now=0.0)
+    assert second.hit("ip", 2, 60.0, now=0.0)
+    # Both instances draw from the same bucket
+    assert not first.hit("ip", 2, 60.0, now=0.0)
+    assert not second.hit("ip", 2, 60.0, now=0.0)
+
+    for i in range(20):
+        first.hit(f"client-{i}", 2, 60.0, now=1.0 + i)
+    count = first._connect().execute("SELECT COUNT(*) FROM buckets").fetchone()[0]
+    assert count <= 10 + first.purge_every
+
+def test_blocking_backend_runs_off_event_loop(tmp_path):
+    on_loop = []
+
+    class RecordingBackend(SQLiteBackend):
+        def hit(self, key, limit, window, now):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            return super().hit(key, limit, window, now)
+
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, limit=2, window=60.0,
+                       backend=RecordingBackend(str(tmp_path / "limits.db")))
+
+    @app.get("/")
+    def read_root():
+        return {"message": "ok"}
+
+    client = TestClient(app)
+    assert [client.get("/").status_code for _ in range(3)] == [200, 200, 429]
+    assert on_loop == [False, False, False]
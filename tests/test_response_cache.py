@@ -0,0 +1,77 @@
+from fastapi.testclient import TestClient
+from api.index import app
+from api.cache import ResultCache, etag_matches, result_cache
+
+client = TestClient(app)
+
+LAMINATE = {
+    "material": {"E1": 140e9, "E2": 10e9, "G12": 5e9, "v12": 0.3, "name": "Carbon/Epoxy"},
+    "stack": [0, 45, -45, 90],
+    "symmetry": True,
+    "thickness": 0.125e-3,
+}
+LIMITS = {"xt": 1500e6, "xc": 1200e6, "yt": 50e6, "yc": 250e6, "s": 70e6}
+
+def test_repeated_requests_hit_cache_with_stable_etag():
+    result_cache.clear()
+    first = client.post("/api/polar", json=LAMINATE)
+    hits = result_cache.stats()["hits"]
+
+    # Equivalent payload (ints instead of floats) maps to the same canonical key
+    equivalent = dict(LAMINATE, stack=[0.0, 45.0, -45.0, 90.0])
+    second = client.post("/api/polar", json=equivalent)
+
+    assert first.status_code == second.status_code == 200
+    assert first.headers["ETag"] == second.headers["ETag"]
+    assert first.content == second.content
+    assert result_cache.stats()["hits"] == hits + 1
+
+def test_if_none_match_returns_304():
+    for path, payload in (
+        ("/api/calculate", LAMINATE),
+        ("/api/polar", LAMINATE),
+        ("/api/failure", {"laminate": LAMINATE, "limits": LIMITS}),
+    ):
+        response = client.post(path, json=payload)
+        etag = response.headers["ETag"]
+
+        not_modified = client.post(path, json=payload, headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["ETag"] == etag
+        assert not_modified.headers["X-Content-Type-Options"] == "nosniff"
+
+        other = client.post(path, json=dict(payload), headers={"If-None-Match": '"other"'})
+        assert other.status_code == 200
+
+def test_different_payloads_have_different_etags():
+    a = client.post("/api/calculate", json=LAMINATE)
+    b = client.post("/api/calculate", json=dict(LAMINATE, stack=[0, 90]))
+    assert a.headers["ETag"] != b.headers["ETag"]
+
+def test_non_cacheable_routes_keep_no_store():
+    response = client.get("/")
+    assert response.headers["Cache-Control"] == "no-store, no-cache, must-revalidate, max-age=0"
+
+def test_result_cache_bounds():
+    cache = ResultCache(max_entries=2, max_bytes=800)
+    cache.put("a", b"x" * 50)
+    cache.put("b", b"x" * 50)
+    cache.get("a")
+    cache.put("c", b"x" * 50)
+    # Least recently used entry is evicted
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+    # Oversized bodies are returned but not stored
+    etag, body = cache.put("big", b"x" * 200)
+    assert body == b"x" * 200
+    assert cache.get("big") is None
+    assert cache.stats()["bytes"] <= 800
+
+def test_etag_matching():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches('*', '"abc"')
+    assert not etag_matches('"abcd"', '"abc"')
+    assert not etag_matches('', '"abc"')
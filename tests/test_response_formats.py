@@ -0,0 +1,95 @@
+import io
+import json
+import numpy as np
+from fastapi.testclient import TestClient
+from api.index import app
+from api.formats import negotiate, encode_columns, JSON, NPY, RAW, NDJSON
+
+client = TestClient(app)
+
+LAMINATE = {
+    "material": {"E1": 140e9, "E2": 10e9, "G12": 5e9, "v12": 0.3, "name": "Carbon/Epoxy"},
+    "stack": [0, 45, -45, 90],
+    "symmetry": True,
+    "thickness": 0.125e-3,
+}
+LIMITS = {"xt": 1500e6, "xc": 1200e6, "yt": 50e6, "yc": 250e6, "s": 70e6}
+
+def test_negotiate():
+    offered = [JSON, NPY, RAW]
+    assert negotiate("", offered) == JSON
+    assert negotiate("*/*", offered) == JSON
+    assert negotiate("application/x-npy", offered) == NPY
+    assert negotiate("application/json;q=0.5, application/octet-stream", offered) == RAW
+    # Specific ranges override wildcards, including q=0 exclusions
+    assert negotiate("*/*;q=0.1, application/x-npy;q=0.8", offered) == NPY
+    assert negotiate("application/*, application/json;q=0", offered) == NPY
+    assert negotiate("text/html", offered) is None
+
+def test_polar_binary_formats_match_json():
+    data = client.post("/api/polar", json=LAMINATE).json()
+    expected = np.array([[d[k] for d in data] for k in ("angle", "Ex", "Ey", "Gxy")])
+
+    npy = client.post("/api/polar", json=LAMINATE, headers={"Accept": "application/x-npy"})
+    assert npy.status_code == 200
+    assert npy.headers["content-type"] == "application/x-npy"
+    assert npy.headers["x-lamina-columns"] == "angle,Ex,Ey,Gxy"
+    assert "Accept" in npy.headers["vary"]
+    np.testing.assert_array_equal(np.load(io.BytesIO(npy.content)), expected)
+
+    raw = client.post("/api/polar", json=LAMINATE, headers={"Accept": "application/octet-stream"})
+    assert raw.headers["x-lamina-dtype"] == "<f8"
+    np.testing.assert_array_equal(np.frombuffer(raw.content, dtype="<f8").reshape(4, -1), expected)
+
+    # Each representation is cached and revalidated under its own ETag
+    assert len({npy.headers["ETag"], raw.headers["ETag"]}) == 2
+    revalidated = client.post("/api/polar", json=LAMINATE, headers={
+        "Accept": "application/x-npy", "If-None-Match": npy.headers["ETag"],
+    })
+    assert revalidated.status_code == 304
+
+def test_failure_raw_envelope_matches_json():
+    payload = {"laminate": LAMINATE, "limits": LIMITS}
+    data = client.post("/api/failure", json=payload).json()
+    raw = client.post("/api/failure", json=payload, headers={"Accept": "application/octet-stream"})
+
+    columns = np.frombuffer(raw.content, dtype="<f8").reshape(2, -1)
+    np.testing.assert_array_equal(columns.T, np.array(data))
+
+def test_svg_plots():
+    for route, payload in (("/api/polar", LAMINATE), ("/api/failure", {"laminate": LAMINATE, "limits": LIMITS})):
+        response = client.post(route, json=payload, headers={"Accept": "image/svg+xml"})
+        assert response.status_code == 200
+        assert response.headers["Content-Type"] == "image/svg+xml"
+        assert response.headers["Vary"] == "Accept"
+        assert response.text.startswith("<svg")
+
+        again = client.post(route, json=payload, headers={"Accept": "image/*", "If-None-Match": response.headers["ETag"]})
+        assert again.status_code == 304
+
+    # JSON stays the default
+    assert client.post("/api/polar", json=LAMINATE, headers={"Accept": "*/*"}).headers["Content-Type"] == "application/json"
+
+def test_unacceptable_format_returns_406():
+    response = client.post("/api/polar", json=LAMINATE, headers={"Accept": "text/html"})
+    assert response.status_code == 406
+
+def test_encode_columns_raw_layout():
+    columns = {"a": np.arange(3.0), "b": np.ones(3)}
+    raw = encode_columns(columns, RAW)
+    assert raw == np.concatenate([columns["a"], columns["b"]]).astype("<f8").tobytes()
+
+def test_batch_ndjson_stream():
+    items = [{"stack": [0, 90]}, {"stack": []}, {"stack": [45, -45], "symmetry": True}]
+    body = {"material": LAMINATE["material"], "items": items, "outputs": ["properties"]}
+
+    expected = client.post("/api/batch", json=body).json()["results"]
+    response = client.post("/api/batch", json=body, headers={"Accept": NDJSON})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(NDJSON)
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["index"] for line in lines) == [0, 1, 2]
+    for line in lines:
+        index = line.pop("index")
+        assert line == expected[index]
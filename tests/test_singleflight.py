@@ -0,0 +1,77 @@
+import threading
+import time
+import pytest
+from unittest import mock
+from api.singleflight import SingleFlight
+from api.cache import cached_response, result_cache
+
+def _run_concurrently(n, target):
+    barrier = threading.Barrier(n)
+    results = [None] * n
+    errors = [None] * n
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = target()
+        except Exception as exc:
+            errors[i] = exc
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+def test_concurrent_calls_share_one_computation():
+    flight = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return object()
+
+    results, errors = _run_concurrently(8, lambda: flight.do("key", slow))
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert errors == [None] * 8
+    assert flight.leaders == 1 and flight.followers == 7
+    assert flight.in_flight() == 0
+
+def test_followers_receive_leader_exception():
+    flight = SingleFlight()
+
+    def failing():
+        time.sleep(0.1)
+        raise ValueError("boom")
+
+    _, errors = _run_concurrently(4, lambda: flight.do("key", failing))
+    assert all(isinstance(e, ValueError) for e in errors)
+
+    # The key is released so later calls recompute
+    assert flight.do("key", lambda: 42) == 42
+
+def test_cached_response_coalesces_identical_requests():
+    from api.index import LaminateModel, compute_polar
+
+    result_cache.clear()
+    model = LaminateModel.model_validate({
+        "material": {"E1": 140e9, "E2": 10e9, "G12": 5e9, "v12": 0.3},
+        "stack": [0, 45, -45, 90] * 50,
+    })
+    request = mock.Mock(headers={})
+    calls = []
+
+    def slow_compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return compute_polar(model).data
+
+    results, errors = _run_concurrently(6, lambda: cached_response(request, "polar", model, slow_compute))
+
+    assert errors == [None] * 6
+    assert len(calls) == 1
+    assert len({r.body for r in results}) == 1
@@ -0,0 +1,101 @@
+import gzip
+import os
+import re
+import subprocess
+import sys
+from fastapi.testclient import TestClient
+from api.index import app
+from api.metrics import render_metrics
+from api.assets import AssetIndex, IMMUTABLE_POLICY, asset_response
+
+client = TestClient(app)
+
+DEFAULT_POLICY = "no-store, no-cache, must-revalidate, max-age=0"
+
+def hashed_reference(html, name):
+    stem, ext = os.path.splitext(name)
+    return re.search(r'"(%s\.[0-9a-f]{10}%s)"' % (re.escape(stem), re.escape(ext)), html).group(1)
+
+def test_index_references_hashed_assets():
+    response = client.get("/")
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == DEFAULT_POLICY
+    assert response.headers["X-Frame-Options"] == "DENY"
+
+    path = hashed_reference(response.text, "main.js")
+    with open("public/main.js", "rb") as f:
+        source = f.read()
+
+    hashed = client.get("/" + path)
+    assert hashed.status_code == 200
+    assert hashed.content == source
+    assert hashed.headers["Cache-Control"] == IMMUTABLE_POLICY
+    assert hashed.headers["Content-Type"].startswith("text/javascript")
+
+    # The plain name stays available but must be revalidated
+    plain = client.get("/main.js")
+    assert plain.content == source
+    assert plain.headers["Cache-Control"] == "no-cache"
+    assert plain.headers["ETag"] == hashed.headers["ETag"]
+
+def test_conditional_request_returns_304():
+    first = client.get("/style.css")
+    response = client.get("/style.css", headers={"If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == first.headers["ETag"]
+    assert "X-Content-Type-Options" in response.headers
+
+def test_precompressed_variants(tmp_path):
+    (tmp_path / "app.js").write_text("console.log('lamina');\n" * 200)
+    (tmp_path / "notes.txt").write_text("not served")
+    index = AssetIndex.from_directory(tmp_path)
+    assert "/notes.txt" not in index.assets
+
+    from fastapi import FastAPI, Request
+    test_app = FastAPI()
+
+    @test_app.get("/{filename}")
+    def serve(request: Request, filename: str):
+        return asset_response(index.get("/" + filename), request.headers)
+
+    test_client = TestClient(test_app)
+
+    response = test_client.get("/app.js", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert int(response.headers["Content-Length"]) < 1000
+    assert response.text == "console.log('lamina');\n" * 200
+
+    response = test_client.get("/app.js", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "Content-Encoding" not in response.headers
+    assert response.content == (tmp_path / "app.js").read_bytes()
+    assert gzip.decompress(index.get("/app.js").variants["gzip"]) == response.content
+
+    # Each representation has its own ETag; a cached identity body does not validate the gzip one
+    identity_etag = response.headers["ETag"]
+    gzip_etag = test_client.get("/app.js", headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+    assert gzip_etag == identity_etag[:-1] + '-gzip"'
+    response = test_client.get("/app.js", headers={"Accept-Encoding": "gzip", "If-None-Match": identity_etag})
+    assert response.status_code == 200 and response.headers["ETag"] == gzip_etag
+    response = test_client.get("/app.js", headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag})
+    assert response.status_code == 304
+
+def test_unindexed_files_fall_through():
+    response = client.get("/missing.js")
+    assert response.status_code == 404
+    response = client.post("/main.js")
+    assert response.status_code == 405
+
+def test_assets_are_served_by_routes():
+    response = client.head("/style.css")
+    assert response.status_code == 200 and response.content == b""
+    assert int(response.headers["Content-Length"]) > 0
+    assert client.head("/").status_code == 200
+    # Routed like any other request, so metrics label it with the route template
+    assert 'route="/{filename}",status="200"' in render_metrics()
+
+def test_asset_index_is_not_built_on_import():
+    # Compute workers import api.index; only the serving process indexes public/
+    code = "import api.index as index; assert index._static_assets is None"
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(__file__)) or ".")
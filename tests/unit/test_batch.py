@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from lamina.materials import CarbonEpoxy, GlassEpoxy
+from lamina.clt import Laminate
+from lamina.failure import FailureCriterion
+from lamina.batch import LaminateBatch
+from lamina.constraints import ManufacturingRules
+
+LIMITS = {'xt': 1500e6, 'xc': 1200e6, 'yt': 50e6, 'yc': 250e6, 's': 70e6}
+
+def test_batch_matches_individual_laminates():
+    mats = [CarbonEpoxy(), GlassEpoxy(), CarbonEpoxy()]
+    stacks = [[0, 45, -45, 90], [30, -30], [0]]
+    thickness = [0.125e-3, 0.2e-3, 0.1e-3]
+    symmetry = [True, False, False]
+    limits = [LIMITS, dict(LIMITS, xt=900e6), LIMITS]
+
+    batch = LaminateBatch(mats, stacks, thickness, symmetry)
+    props = batch.properties()
+    polars = batch.polar_stiffness(step=15)
+    envelopes = batch.tsai_wu(limits, num_points=36)
+
+    for i in range(3):
+        lam = Laminate(mats[i], stacks[i], thickness[i], symmetry[i])
+        np.testing.assert_allclose(batch.ABD[i], lam.ABD, atol=1e-9 * np.abs(lam.ABD).max())
+        np.testing.assert_allclose(list(props[i].values()), list(lam.properties().values()))
+
+        expected = lam.polar_stiffness(step=15).data
+        assert [d['angle'] for d in polars[i]] == [d['angle'] for d in expected]
+        np.testing.assert_allclose([d['Ex'] for d in polars[i]], [d['Ex'] for d in expected])
+
+        env = FailureCriterion.tsai_wu(lam, limits[i], num_points=36).data
+        np.testing.assert_allclose(envelopes[i], env)
+
+def test_batch_shared_material():
+    batch = LaminateBatch(CarbonEpoxy(), [[0, 90], [45]], symmetry=True)
+    assert batch.ABD.shape == (2, 6, 6)
+    assert list(batch.n_plies) == [4, 2]
+
+def test_batch_rejects_empty_stack():
+    with pytest.raises(ValueError):
+        LaminateBatch(CarbonEpoxy(), [[0], []])
+
+def test_batch_applies_manufacturing_rules():
+    stacks = [[45, -45, 0, 90], [0, 45, -45, 90]]
+    batch = LaminateBatch(CarbonEpoxy(), stacks, symmetry=True, rules=ManufacturingRules())
+    assert batch.violations == [[], ['outer_45']]
+
+    repaired = LaminateBatch(CarbonEpoxy(), stacks, symmetry=True, rules=ManufacturingRules(), repair=True)
+    assert repaired.violations == [[], []]
+    reference = Laminate(CarbonEpoxy(), repaired.stacks[1])
+    np.testing.assert_allclose(repaired.ABD[1], reference.ABD, atol=1e-9 * np.abs(reference.ABD).max())
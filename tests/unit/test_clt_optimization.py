@@ -1,8 +1,10 @@
 
 import numpy as np
 import pytest
+from lamina import clt, optimization
 from lamina.clt import _get_transformation_matrices, _apply_transformation, _transform_stiffness, Laminate
 from lamina.materials import Material
+from lamina.optimization import calculate_safety_factor
 
 def test_transformation_matrices_consistency():
     """Verify _get_transformation_matrices and _apply_transformation match _transform_stiffness"""
@@ -40,3 +42,49 @@ def test_polar_stiffness_calls():
     res = lam.polar_stiffness(step=45)
     assert len(res.data) > 0
     assert 'Ex' in res.data[0]
+
+LIMITS = {'xt': 1500e6, 'xc': 1200e6, 'yt': 50e6, 'yc': 250e6, 's': 70e6}
+
+SMALL_STACKS = [
+    ([0], False),
+    ([0, 45, -45, 90], True),
+    ([30, -30, 30, 0, 90], False),
+    ([15.5, -72.25, 45, 45, 0, 90, -45, 60], False),
+    ([0, 90] * 8, False),
+]
+
+@pytest.mark.parametrize("stack,symmetry", SMALL_STACKS)
+def test_scalar_update_matches_vectorized(stack, symmetry):
+    """The small-laminate kernel produces the same attributes as the vectorized one"""
+    mat = Material(E1=140e9, E2=10e9, G12=5e9, v12=0.3)
+    lam = Laminate(mat, stack=stack, symmetry=symmetry)
+    assert len(lam.stack) <= clt.SCALAR_PLY_LIMIT
+
+    scalar = {name: np.array(getattr(lam, name)) for name in ("z_coords", "z_mids", "rads", "c", "s", "c2", "s2", "cs", "A", "B", "D", "ABD")}
+    lam._update_vectorized()
+    for name, value in scalar.items():
+        expected = getattr(lam, name)
+        np.testing.assert_allclose(value, expected, rtol=1e-12, atol=1e-12 * np.abs(expected).max(), err_msg=name)
+
+@pytest.mark.parametrize("stack,symmetry", SMALL_STACKS)
+def test_scalar_safety_factor_matches_vectorized(stack, symmetry, monkeypatch):
+    mat = Material(E1=140e9, E2=10e9, G12=5e9, v12=0.3)
+    loads = [{'Nx': 1e5}, {'Nx': -2e5, 'Ny': 3e4, 'Nxy': 1e4}, {'Nxy': 5e4}, {}]
+    lam = Laminate(mat, stack=stack, symmetry=symmetry)
+    scalar = [calculate_safety_factor(lam, load, LIMITS) for load in loads]
+
+    monkeypatch.setattr(clt, "SCALAR_PLY_LIMIT", 0)
+    monkeypatch.setattr(optimization, "SCALAR_PLY_LIMIT", 0)
+    lam = Laminate(mat, stack=stack, symmetry=symmetry)
+    vectorized = [calculate_safety_factor(lam, load, LIMITS) for load in loads]
+
+    np.testing.assert_allclose(scalar, vectorized, rtol=1e-10)
+    assert scalar[-1] == np.inf
+
+def test_scalar_update_supports_set_angles():
+    mat = Material(E1=140e9, E2=10e9, G12=5e9, v12=0.3)
+    lam = Laminate(mat, stack=[0, 45, -45, 90])
+    lam.set_angles([1, 2], [30, -30])
+    expected = Laminate(mat, stack=[0, 30, -30, 90])
+    np.testing.assert_allclose(lam.ABD, expected.ABD, rtol=1e-12, atol=1e-12 * np.abs(expected.ABD).max())
+    np.testing.assert_allclose(lam.c2, expected.c2)
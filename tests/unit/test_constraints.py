@@ -0,0 +1,70 @@
+import random
+import numpy as np
+from lamina.constraints import ManufacturingRules
+from lamina.materials import CarbonEpoxy
+from lamina.optimization import GeneticAlgorithm
+
+def test_rule_violations():
+    rules = ManufacturingRules(max_contiguous=2)
+    pop = np.array([
+        [45, -45, 0, 90],   # valid
+        [0, 45, -45, 90],   # outer ply is 0
+        [45, 45, 0, 90],    # unbalanced
+        [45, -45, 0, 0],    # no 90 plies, and 0 run of 4 across the midplane
+    ])
+    v = rules.violations(pop)
+
+    assert v['outer_45'].tolist() == [False, True, False, False]
+    assert v['balanced'].tolist() == [False, False, True, False]
+    assert v['min_fraction'].tolist() == [False, False, False, True]
+    assert v['max_contiguous'].tolist() == [False, False, False, True]
+    assert rules.check(pop).tolist() == [True, False, False, False]
+
+def test_non_symmetric_rules():
+    rules = ManufacturingRules(symmetric=False)
+    assert rules.check([[45, -45, 0, 90, 90, 0, -45, 45]]).tolist() == [True]
+    assert rules.check([[45, -45, 0, 90, 90, 0, -45, 0]]).tolist() == [False]
+
+def test_repair_makes_random_population_feasible():
+    rules = ManufacturingRules()
+    rng = np.random.default_rng(0)
+    pop = rng.choice([0, 45, -45, 90], size=(500, 8))
+
+    repaired = rules.repair(pop)
+
+    assert repaired.shape == pop.shape
+    assert np.isin(repaired, [0, 45, -45, 90]).all()
+    assert rules.check(repaired).mean() > 0.95
+    # Already feasible designs are left untouched
+    ok = rules.check(pop)
+    np.testing.assert_array_equal(repaired[ok], pop[ok])
+
+def test_ga_with_rules():
+    random.seed(1)
+    mat = CarbonEpoxy()
+    load = {'Nx': 1000e3, 'Ny': 0, 'Nxy': 0}
+    constraints = {
+        'safety_factor': 1.2,
+        'limits': {'xt': 1500e6, 'xc': 1200e6, 'yt': 50e6, 'yc': 250e6, 's': 70e6}
+    }
+    rules = ManufacturingRules()
+
+    ga = GeneticAlgorithm(mat, load, constraints, population_size=10, generations=5, rules=rules)
+    best_stack = ga.optimize(min_plies=8, max_plies=40)
+
+    assert best_stack is not None
+    half = best_stack[:len(best_stack) // 2]
+    assert rules.check([half]).all()
+
+def test_check_stacks_groups_ragged_stacks():
+    rules = ManufacturingRules(max_contiguous=2)
+    stacks = [[45, -45, 0, 90], [45, -45, 0, 90, 90, 0, -45, 0], [0, 45, -45, 90], [22.5, -22.5, 0, 90]]
+    checked, violations = rules.check_stacks(stacks, [True, False, True, True])
+    assert checked == stacks
+    assert violations == [[], ['balanced', 'outer_45'], ['outer_45'], ['min_fraction', 'outer_45']]
+
+    repaired, violations = rules.check_stacks(stacks, [True, False, True, True], repair=True)
+    assert violations[:3] == [[], [], []]
+    assert repaired[0] == stacks[0] and abs(repaired[2][0]) == 45
+    # Fractional angles are only checked
+    assert repaired[3] == stacks[3] and violations[3] == ['min_fraction', 'outer_45']
@@ -0,0 +1,81 @@
+import pickle
+import numpy as np
+import pytest
+from lamina import metrics
+from lamina.materials import CarbonEpoxy, Material
+from lamina.clt import Laminate
+
+def test_material_is_immutable():
+    mat = CarbonEpoxy()
+    with pytest.raises(AttributeError):
+        mat.E1 = 1e9
+    with pytest.raises(AttributeError):
+        mat.color = "black"
+    with pytest.raises(ValueError):
+        mat.Q()[0, 0] = 0.0
+
+def test_materials_share_tables():
+    a = Material(E1=140e9, E2=10e9, G12=5e9, v12=0.3)
+    b = CarbonEpoxy()
+    assert a.Q() is b.Q()
+    assert a.invariants is b.invariants
+    assert Material(E1=150e9, E2=10e9, G12=5e9, v12=0.3).Q()[0, 0] > a.Q()[0, 0]
+
+def test_material_pickle_round_trip():
+    mat = CarbonEpoxy(E1=150e9)
+    mat.Q()
+    copy = pickle.loads(pickle.dumps(mat))
+    assert type(copy) is CarbonEpoxy
+    assert (copy.E1, copy.name, copy.v21) == (mat.E1, mat.name, mat.v21)
+    np.testing.assert_array_equal(copy.Q(), mat.Q())
+
+def test_laminate_builds_on_first_access():
+    before = metrics.snapshot().get("laminate_builds", 0)
+    lam = Laminate(CarbonEpoxy(), [0, 45, -45, 90], symmetry=True)
+    assert lam.stack == (0, 45, -45, 90, 90, -45, 45, 0)
+    assert metrics.snapshot().get("laminate_builds", 0) == before
+
+    assert lam.ABD.shape == (6, 6)
+    assert hasattr(lam, "c2") and len(lam.z_mids) == 8
+    assert metrics.snapshot()["laminate_builds"] == before + 1
+    with pytest.raises(AttributeError):
+        lam.missing
+
+def test_laminate_is_immutable_by_default():
+    stack = [0, 45]
+    lam = Laminate(CarbonEpoxy(), stack)
+    stack[0] = 90
+    assert lam.stack == (0, 45)
+    for name in ("material", "stack", "raw_stack", "ply_thickness", "total_thickness"):
+        with pytest.raises(AttributeError):
+            setattr(lam, name, None)
+    for name in ("ABD", "A", "c2", "z_mids", "abd", "K_all"):
+        with pytest.raises(ValueError):
+            getattr(lam, name)[0] = 0.0
+
+    # set_angles is the explicit in-place edit
+    lam.set_angles([0], [30])
+    assert lam.stack == lam.raw_stack == (30, 45)
+    np.testing.assert_allclose(lam.ABD, Laminate(CarbonEpoxy(), [30, 45]).ABD, rtol=1e-12, atol=1e-3)
+
+def test_laminate_pickle_skips_derived_fields():
+    lam = Laminate(CarbonEpoxy(), [0, 45, -45, 90] * 2, symmetry=True)
+    lam.abd
+    lam.K_all_z
+    data = pickle.dumps(lam)
+    assert len(data) < len(pickle.dumps(lam.ABD))
+
+    copy = pickle.loads(data)
+    assert copy.stack == lam.stack and copy.raw_stack == lam.raw_stack
+    np.testing.assert_array_equal(copy.ABD, lam.ABD)
+    np.testing.assert_array_equal(copy.abd, lam.abd)
+
+def test_set_angles_keeps_raw_stack_in_sync():
+    lam = Laminate(CarbonEpoxy(), [0, 45, 90], symmetry=True)
+    lam.set_angles([1, 4], [30, 30])
+    assert lam.raw_stack == (0, 30, 90)
+    # Editing one side breaks the mirror: the full stack becomes the definition
+    lam.set_angles([0], [15])
+    assert lam.raw_stack == lam.stack == (15, 30, 90, 90, 30, 0)
+    copy = pickle.loads(pickle.dumps(lam))
+    assert copy.raw_stack == lam.raw_stack and copy.total_thickness == lam.total_thickness
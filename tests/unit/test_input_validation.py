@@ -65,3 +65,22 @@ def test_failure_limits_valid():
     response = client.post("/api/failure", json=payload)
     assert response.status_code == 200
     assert isinstance(response.json(), list)
+
+def test_stack_finiteness_check():
+    """
+    Test that the fast stack check rejects non-finite plies but not huge finite angles.
+    """
+    from pydantic import ValidationError
+    from api.index import LaminateModel
+    material = {"E1": 140e9, "E2": 10e9, "G12": 5e9, "v12": 0.3}
+
+    for bad in (float("nan"), float("inf"), float("-inf")):
+        with pytest.raises(ValidationError, match="Must be a finite number"):
+            LaminateModel.model_validate({"material": material, "stack": [0, 45, bad, 90]})
+
+    # Finite angles whose sum overflows are still accepted
+    lam = LaminateModel.model_validate({"material": material, "stack": [1e308, 1e308]})
+    assert lam.stack == [1e308, 1e308]
+
+    with pytest.raises(ValidationError, match="max 4 plies"):
+        LaminateModel.model_validate({"material": material, "stack": [0] * 5}, context={"max_plies": 4})
@@ -0,0 +1,62 @@
+import random
+import numpy as np
+import pytest
+from lamina.materials import CarbonEpoxy
+from lamina.clt import Laminate
+from lamina.optimization import (
+    GeneticAlgorithm, calculate_safety_factor, load_case_safety_factors,
+    governing_safety_factor, load_matrix
+)
+
+LIMITS = {'xt': 1500e6, 'xc': 1200e6, 'yt': 50e6, 'yc': 250e6, 's': 70e6}
+
+def _load_cases(n=40, seed=1):
+    rng = np.random.default_rng(seed)
+    scale = np.array([1e5, 3e4, 2e4, 20, 10, 5])
+    return rng.normal(size=(n, 6)) * scale * rng.uniform(0.05, 1, size=(n, 1))
+
+def test_load_matrix_conversion():
+    loads = load_matrix([{'Nx': 1.0}, {'Ny': 2.0, 'Mxy': 3.0}])
+    np.testing.assert_array_equal(loads, [[1, 0, 0, 0, 0, 0], [0, 2, 0, 0, 0, 3]])
+    assert load_matrix(np.zeros(6)).shape == (1, 6)
+    with pytest.raises(ValueError):
+        load_matrix(np.zeros((2, 3)))
+
+def test_in_plane_cases_match_single_load():
+    lam = Laminate(CarbonEpoxy(), [45, -45, 0, 90], symmetry=True)
+    loads = _load_cases()
+    loads[:, 3:] = 0
+
+    factors = load_case_safety_factors(lam, loads, LIMITS)
+    expected = [calculate_safety_factor(lam, dict(zip(('Nx', 'Ny', 'Nxy'), row[:3])), LIMITS) for row in loads]
+    np.testing.assert_allclose(factors, expected)
+
+def test_governing_case_with_pruning():
+    lam = Laminate(CarbonEpoxy(), [45, -45, 0, 90, 0, 0], symmetry=True)
+    loads = _load_cases()
+
+    exact = load_case_safety_factors(lam, loads, LIMITS)
+    sf, idx = governing_safety_factor(lam, loads, LIMITS)
+    sf_full, idx_full = governing_safety_factor(lam, loads, LIMITS, prune=False)
+
+    assert idx == idx_full == exact.argmin()
+    assert np.isclose(sf, exact.min())
+    assert np.isclose(sf_full, exact.min())
+
+def test_moments_in_load_dict_are_not_ignored():
+    lam = Laminate(CarbonEpoxy(), [0, 90], symmetry=True)
+    sf_membrane = calculate_safety_factor(lam, {'Nx': 1e5}, LIMITS)
+    sf_bending = calculate_safety_factor(lam, {'Nx': 1e5, 'Mx': 50}, LIMITS)
+    assert sf_bending < sf_membrane
+
+def test_ga_with_load_envelope():
+    random.seed(2)
+    loads = [{'Nx': 1000e3}, {'Ny': 200e3}, {'Nxy': 100e3}, {'Mx': 10}]
+    constraints = {'safety_factor': 1.2, 'limits': LIMITS}
+
+    ga = GeneticAlgorithm(CarbonEpoxy(), loads, constraints, population_size=10, generations=5)
+    best_stack = ga.optimize(min_plies=4, max_plies=60)
+
+    assert best_stack is not None
+    lam = Laminate(CarbonEpoxy(), best_stack)
+    assert load_case_safety_factors(lam, loads, LIMITS).min() >= 1.2
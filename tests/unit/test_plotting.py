@@ -0,0 +1,92 @@
+import os
+import xml.etree.ElementTree as ET
+import pytest
+import numpy as np
+from lamina import plotting
+from lamina.materials import CarbonEpoxy
+from lamina.clt import Laminate
+from lamina.failure import FailureCriterion
+
+SVG_NS = "{http://www.w3.org/2000/svg}"
+LIMITS = {'xt': 1500e6, 'xc': 1200e6, 'yt': 50e6, 'yc': 250e6, 's': 70e6}
+
+def curve_points(svg):
+    root = ET.fromstring(svg)
+    curve = next(p for p in root.iter(SVG_NS + "path") if p.get("class") == "curve")
+    coords = curve.get("d").strip("MZ ").split(" L")
+    return np.array([[float(v) for v in c.split(",")] for c in coords])
+
+def test_nice_ticks():
+    np.testing.assert_allclose(plotting.nice_ticks(0, 9.3, 4), [0, 5, 10])
+    ticks = plotting.nice_ticks(-13.2, 4.1)
+    assert ticks[0] <= -13.2 and ticks[-1] >= 4.1
+    steps = np.diff(ticks)
+    np.testing.assert_allclose(steps, steps[0])
+
+def test_polar_svg_is_valid_and_closed():
+    lam = Laminate(CarbonEpoxy(), [0, 90], symmetry=True)
+    polar = lam.polar_stiffness()
+    svg = polar.svg()
+    assert "Stiffness Polar Plot (Ex)" in svg
+    assert "GPa" in svg
+
+    points = curve_points(svg)
+    assert len(points) == len(polar.data)
+    # [0/90]s is as stiff at 0 as at 90 degrees: same distance from the centre
+    centre = points[[0, 9, 18, 27]].mean(axis=0)
+    radii = np.linalg.norm(points - centre, axis=1)
+    assert np.isclose(radii[0], radii[9], rtol=1e-3)
+
+def test_envelope_svg_has_equal_axis_scales():
+    lam = Laminate(CarbonEpoxy(), [0, 45, -45, 90], symmetry=True)
+    envelope = FailureCriterion.tsai_wu(lam, LIMITS)
+    points = curve_points(envelope.svg())
+    c = envelope.columns()
+    assert len(points) == len(c["sigma_x"])
+
+    # Screen coordinates are an affine map with the same scale on x and -y
+    sx = np.polyfit(c["sigma_x"], points[:, 0], 1)[0]
+    sy = np.polyfit(c["sigma_y"], points[:, 1], 1)[0]
+    assert np.isclose(sx, -sy, rtol=1e-3)
+
+def test_svg_cache_by_content():
+    plotting.clear_cache()
+    angles = np.arange(0, 360, 10)
+    values = np.full(36, 2e9)
+    first = plotting.polar_svg(angles, values)
+    assert plotting.polar_svg(angles, values.copy()) is first
+    assert plotting.polar_svg(angles, values * 2) is not first
+
+def test_plot_svg_file(tmp_path):
+    lam = Laminate(CarbonEpoxy(), [0, 45], symmetry=True)
+    path = tmp_path / "envelope.svg"
+    FailureCriterion.max_stress(lam, LIMITS).plot(str(path))
+    ET.parse(path)
+
+def test_reused_figures_match_fresh_ones(tmp_path):
+    pytest.importorskip("matplotlib")
+    first = Laminate(CarbonEpoxy(), [0, 0, 90], symmetry=True)
+    second = Laminate(CarbonEpoxy(), [45, -45], symmetry=True)
+
+    reused = plotting.FigureRenderer()
+    for lam in (first, second):
+        c = FailureCriterion.tsai_wu(lam, LIMITS).columns()
+        reused.envelope(c["sigma_x"], c["sigma_y"], str(tmp_path / "reused.png"))
+    plotting.FigureRenderer().envelope(c["sigma_x"], c["sigma_y"], str(tmp_path / "fresh.png"))
+    assert (tmp_path / "reused.png").read_bytes() == (tmp_path / "fresh.png").read_bytes()
+
+def test_render_catalogue_names(tmp_path):
+    lams = [Laminate(CarbonEpoxy(), [0, 90]), Laminate(CarbonEpoxy(), [45, -45])]
+    paths = plotting.render_catalogue(lams, str(tmp_path), limits=LIMITS, fmt="svg", names=["a", "../b"], workers=1)
+    assert [os.path.basename(p) for p in paths] == ["a_polar.svg", "a_envelope.svg", "_b_polar.svg", "_b_envelope.svg"]
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(p) for p in paths)
+
+    with pytest.raises(ValueError, match="Limits are required"):
+        plotting.render_catalogue(lams, str(tmp_path), fmt="svg")
+
+def test_render_catalogue_process_pool(tmp_path):
+    pytest.importorskip("matplotlib")
+    lams = [Laminate(CarbonEpoxy(), [0, 90 * (i % 2), 45], symmetry=True) for i in range(4)]
+    paths = plotting.render_catalogue(lams, str(tmp_path / "out"), kinds=("polar",), workers=2, chunksize=1)
+    assert paths == [str(tmp_path / "out" / f"laminate_{i:04d}_polar.png") for i in range(4)]
+    assert all(open(p, "rb").read(8) == b"\x89PNG\r\n\x1a\n" for p in paths)
@@ -0,0 +1,54 @@
+import json
+import random
+from lamina import profiling
+from lamina.materials import CarbonEpoxy
+from lamina.clt import Laminate
+from lamina.failure import FailureCriterion
+from lamina.optimization import GeneticAlgorithm
+
+LIMITS = {'xt': 1500e6, 'xc': 1200e6, 'yt': 50e6, 'yc': 250e6, 's': 70e6}
+
+def test_profile_records_and_restores():
+    original_abd = Laminate.__dict__["abd"]
+    original_tsai_wu = FailureCriterion.__dict__["tsai_wu"]
+
+    with profiling.profile() as prof:
+        lam = Laminate(CarbonEpoxy(), [0, 45, -45, 90])
+        lam.abd
+        lam.abd
+        FailureCriterion.tsai_wu(lam, LIMITS)
+
+    # Originals are back once no profiler is active
+    assert Laminate.__dict__["abd"] is original_abd
+    assert FailureCriterion.__dict__["tsai_wu"] is original_tsai_wu
+
+    stats = {row["name"]: row for row in prof.summary()}
+    assert stats["Laminate.update"]["calls"] == 1
+    assert stats["Laminate.abd"]["calls"] == 1
+    assert stats["Laminate.abd (cached)"]["calls"] >= 1
+    assert stats["FailureCriterion._get_stresses_vectorized"]["calls"] == 1
+    # tsai_wu's total includes the stress computation it calls; its self time does not
+    tsai_wu = stats["FailureCriterion.tsai_wu"]
+    assert tsai_wu["self"] < tsai_wu["total"]
+    assert "Laminate.update" in prof.table()
+
+    trace = prof.chrome_trace()
+    json.dumps(trace)
+    assert {event["name"] for event in trace["traceEvents"]} == set(stats)
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in trace["traceEvents"])
+
+    # Calls after the block are not recorded
+    Laminate(CarbonEpoxy(), [0]).ABD
+    assert prof.stats["Laminate.update"][0] == 1
+
+def test_profile_separates_ga_cache_hits():
+    random.seed(0)
+    ga = GeneticAlgorithm(CarbonEpoxy(), {'Nx': 1000e3}, {'safety_factor': 1.2, 'limits': LIMITS},
+                          population_size=6, generations=3)
+    with profiling.profile(trace=False) as prof:
+        ga.optimize(min_plies=4, max_plies=16)
+
+    stats = {row["name"]: row for row in prof.summary()}
+    assert stats["GeneticAlgorithm._evaluate"]["calls"] == ga.n_evaluations
+    assert stats["calculate_safety_factor"]["calls"] == ga.n_evaluations
+    assert prof.events == []
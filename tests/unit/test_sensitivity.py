@@ -0,0 +1,80 @@
+import numpy as np
+from lamina.materials import CarbonEpoxy
+from lamina.clt import Laminate
+from lamina.buckling import BucklingAnalysis
+from lamina.optimization import calculate_safety_factor
+from lamina.sensitivity import abd_sensitivity, safety_factor_sensitivity, buckling_sensitivity
+
+LIMITS = {'xt': 1500e6, 'xc': 1200e6, 'yt': 50e6, 'yc': 250e6, 's': 70e6}
+STACK = [30, -40, 0, 75, 15, -60]
+T0 = 0.125e-3
+
+class _PlyThicknessLaminate(Laminate):
+    """Laminate with individual ply thicknesses, for finite-difference checks."""
+    def __init__(self, material, stack, thicknesses):
+        self.thicknesses = np.asarray(thicknesses, dtype=np.float64)
+        super().__init__(material, stack, thickness=T0)
+        self.update()
+
+    def _calculate_total_thickness(self):
+        return self.thicknesses.sum()
+
+    def _calculate_z_coords(self):
+        t = getattr(self, 'thicknesses', np.full(len(self.stack), T0))
+        return np.concatenate([[0.0], np.cumsum(t)]) - t.sum() / 2
+
+def _build(angles=None, thicknesses=None):
+    angles = list(STACK) if angles is None else list(angles)
+    t = np.full(len(angles), T0) if thicknesses is None else thicknesses
+    return _PlyThicknessLaminate(CarbonEpoxy(), angles, t)
+
+def _fd(fn, x, step):
+    grads = []
+    for k in range(len(x)):
+        xp = np.array(x, dtype=np.float64); xp[k] += step
+        xm = np.array(x, dtype=np.float64); xm[k] -= step
+        grads.append((fn(xp) - fn(xm)) / (2 * step))
+    return np.array(grads)
+
+def test_abd_sensitivity_matches_finite_differences():
+    thick = T0 * np.linspace(0.8, 1.2, len(STACK))
+    sens = abd_sensitivity(_build(thicknesses=thick))
+
+    for key in ('A', 'B', 'D'):
+        fd_theta = _fd(lambda x: getattr(_build(x, thick), key), STACK, 1e-4)
+        np.testing.assert_allclose(sens['d%s_dtheta' % key], fd_theta, rtol=1e-5, atol=1e-6 * np.abs(fd_theta).max())
+
+        fd_t = _fd(lambda x: getattr(_build(thicknesses=x), key), thick, 1e-9)
+        np.testing.assert_allclose(sens['d%s_dt' % key], fd_t, rtol=1e-5, atol=1e-6 * np.abs(fd_t).max())
+
+def test_safety_factor_sensitivity_matches_finite_differences():
+    load = {'Nx': 200e3, 'Ny': -50e3, 'Nxy': 30e3, 'Mx': 5.0}
+    lam = _build()
+    sens = safety_factor_sensitivity(lam, load, LIMITS)
+
+    assert np.isclose(sens['value'], calculate_safety_factor(lam, load, LIMITS))
+    fd_theta = _fd(lambda x: calculate_safety_factor(_build(x), load, LIMITS), STACK, 1e-5)
+    np.testing.assert_allclose(sens['d_theta'], fd_theta, rtol=1e-4, atol=1e-6 * np.abs(fd_theta).max())
+
+    thick = np.full(len(STACK), T0)
+    fd_t = _fd(lambda x: calculate_safety_factor(_build(thicknesses=x), load, LIMITS), thick, 1e-10)
+    np.testing.assert_allclose(sens['d_thickness'], fd_t, rtol=1e-4, atol=1e-6 * np.abs(fd_t).max())
+
+def test_buckling_sensitivity_matches_finite_differences():
+    a, b = 0.6, 0.3
+    sens = buckling_sensitivity(_build(), a, b)
+
+    assert np.isclose(sens['value'], BucklingAnalysis.critical_load(_build(), a, b)[0])
+    fd_theta = _fd(lambda x: BucklingAnalysis.critical_load(_build(x), a, b)[0], STACK, 1e-5)
+    np.testing.assert_allclose(sens['d_theta'], fd_theta, rtol=1e-5)
+
+    thick = np.full(len(STACK), T0)
+    fd_t = _fd(lambda x: BucklingAnalysis.critical_load(_build(thicknesses=x), a, b)[0], thick, 1e-10)
+    np.testing.assert_allclose(sens['d_thickness'], fd_t, rtol=1e-5)
+
+def test_symmetric_laminate_sensitivity_shapes():
+    lam = Laminate(CarbonEpoxy(), [0, 45, -45, 90], symmetry=True)
+    sens = abd_sensitivity(lam)
+    assert sens['dD_dt'].shape == (8, 3, 3)
+    # Mirrored plies have identical D sensitivities to angle changes
+    np.testing.assert_allclose(sens['dD_dtheta'][0], sens['dD_dtheta'][-1])
@@ -0,0 +1,68 @@
+import random
+import numpy as np
+from lamina.materials import CarbonEpoxy
+from lamina.optimization import GeneticAlgorithm
+from lamina.surrogate import QuadraticSurrogate, lamination_parameters
+
+def test_lamination_parameters():
+    lp = lamination_parameters([[0, 0], [45, -45]], symmetric=True)
+    np.testing.assert_allclose(lp[0], [1, 0, 1, 0, 1, 0, 1, 0], atol=1e-12)
+    np.testing.assert_allclose(lp[1, [0, 1, 2]], [0, 0, -1], atol=1e-12)
+
+    # Bending parameters weight outer plies more than inner ones
+    lp = lamination_parameters([[0, 90, 90]], symmetric=True)
+    assert lp[0, 4] > lp[0, 0]
+
+def test_surrogate_fits_smooth_response():
+    rng = np.random.default_rng(0)
+    stacks = rng.choice([0, 45, -45, 90], size=(200, 6))
+    target = lamination_parameters(stacks, symmetric=True)[:, 0] ** 2
+
+    sur = QuadraticSurrogate(min_samples=50)
+    sur.observe(stacks[:150].tolist(), target[:150].tolist())
+    np.testing.assert_allclose(sur.predict(stacks[150:]), target[150:], atol=1e-3)
+
+def test_surrogate_keeps_most_recent_samples():
+    rng = np.random.default_rng(2)
+    stacks = rng.choice([0, 45, -45, 90], size=(300, 6))
+    target = lamination_parameters(stacks, symmetric=True)[:, 0] ** 2
+
+    sur = QuadraticSurrogate(min_samples=50, max_samples=100)
+    for start in range(0, 280, 20):
+        sur.observe(stacks[start:start + 20].tolist(), target[start:start + 20].tolist())
+    assert len(sur._X) == len(sur._y) == 100
+    assert sur.n_exact == 280
+    np.testing.assert_allclose(sur.predict(stacks[280:]), target[280:], atol=1e-3)
+
+def test_surrogate_selects_fraction():
+    rng = np.random.default_rng(1)
+    stacks = rng.choice([0, 45, -45, 90], size=(40, 4)).tolist()
+    sur = QuadraticSurrogate(fraction=0.25, min_samples=10)
+
+    # Not trained yet: everything goes to exact evaluation
+    assert sur.select(stacks).all()
+    sur.observe(stacks, [float(s[0]) for s in stacks])
+
+    mask = sur.select(stacks)
+    assert mask.sum() == 10
+    sur.observe([s for s, m in zip(stacks, mask) if m], [float(s[0]) for s, m in zip(stacks, mask) if m])
+    stats = sur.stats()
+    assert stats['skipped_evaluations'] == 30
+    assert stats['validated_predictions'] == 10
+
+def test_ga_with_surrogate_reduces_exact_evaluations():
+    limits = {'xt': 1500e6, 'xc': 1200e6, 'yt': 50e6, 'yc': 250e6, 's': 70e6}
+    load = {'Nx': 1000e3, 'Ny': 300e3, 'Nxy': 100e3}
+    constraints = {'safety_factor': 1.2, 'limits': limits}
+
+    random.seed(0)
+    plain = GeneticAlgorithm(CarbonEpoxy(), load, constraints, population_size=30, generations=15)
+    assert plain.optimize(4, 40) is not None
+
+    random.seed(0)
+    screened = GeneticAlgorithm(CarbonEpoxy(), load, constraints, population_size=30, generations=15,
+                                surrogate=QuadraticSurrogate())
+    assert screened.optimize(4, 40) is not None
+
+    assert screened.n_evaluations < plain.n_evaluations
+    assert screened.surrogate.stats()['skipped_evaluations'] > 0